@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark: letter-position index vs. full intersection scan
+
+Compares placements/second of generate_crossword (which pulls candidate
+anchors from the live letter index) against the original loop that called
+find_intersections for every placed word.
+
+Run from the backend directory:
+    python -m benchmarks.bench_intersection_index
+"""
+import random
+import time
+from typing import List
+
+from src.crossword_generator import CrosswordGenerator
+from src.llm_service import LLMService
+from src.models import Direction, LetterGrid, WordPlacement
+
+
+def legacy_generate(generator: CrosswordGenerator) -> List[WordPlacement]:
+    """The pre-index search loop, kept here as the 'before' reference"""
+    grid = LetterGrid(generator.grid_size, generator.grid_size)
+    word_placements = []
+
+    first_word = generator.words[0]
+    start_row = generator.grid_size // 2
+    start_col = (generator.grid_size - len(first_word)) // 2
+    if generator.place_word(grid, first_word, start_row, start_col, Direction.HORIZONTAL):
+        word_placements.append(WordPlacement(first_word, start_row, start_col, Direction.HORIZONTAL))
+
+    for word in generator.words[1:]:
+        placed = False
+        for placed_word in word_placements:
+            for word_idx, placed_idx in generator.find_intersections(word, placed_word.word):
+                row, col, direction = generator._anchor_position(placed_word, word_idx, placed_idx)
+                if generator.can_place_word(grid, word, row, col, direction, word_placements):
+                    if generator.place_word(grid, word, row, col, direction):
+                        word_placements.append(WordPlacement(word, row, col, direction))
+                        placed = True
+                        break
+            if placed:
+                break
+
+    return word_placements
+
+
+def corpora() -> List[List[str]]:
+    lists = [
+        [item['word'] for item in LLMService._get_mock_word_clues(topic)]
+        for topic in ('pixar', 'basketball', 'generic')
+    ]
+    rng = random.Random(1234)
+    for _ in range(5):
+        shuffled = list(lists[rng.randrange(len(lists))])
+        rng.shuffle(shuffled)
+        lists.append(shuffled)
+    return lists
+
+
+def run(label: str, build, words_lists: List[List[str]], repeat: int) -> float:
+    placements = 0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for words in words_lists:
+            placements += build(CrosswordGenerator(words))
+    elapsed = time.perf_counter() - start
+    rate = placements / elapsed
+    print(f"{label:<10} {placements:>6} placements in {elapsed:7.3f}s  ->  {rate:10.1f} placements/s")
+    return rate
+
+
+def main(repeat: int = 20) -> None:
+    words_lists = corpora()
+
+    # Both paths must agree before the numbers mean anything
+    for words in words_lists:
+        generator = CrosswordGenerator(words)
+        assert legacy_generate(generator) == generator.generate_crossword().word_placements
+
+    before = run("before", lambda g: len(legacy_generate(g)), words_lists, repeat)
+    after = run("after", lambda g: len(g.generate_crossword().word_placements), words_lists, repeat)
+    print(f"speedup    {after / before:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark suite for the generator hot paths
+
+Times find_intersections, can_place_word, _extract_perpendicular_words and
+end-to-end generate_crossword over fixed corpora: the mock topic lists from
+LLMService and seeded synthetic lists of 50, 200 and 1000 words. Each case
+reports latency percentiles, placements per second (end-to-end only) and the
+peak traced memory of one pass. Results are written as JSON, and two result
+files can be compared to flag regressions.
+
+Run from the backend directory:
+    python -m benchmarks.suite run --output results.json
+    python -m benchmarks.suite compare baseline.json results.json --threshold 0.10
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+from src.crossword_generator import CrosswordGenerator
+from src.llm_service import LLMService
+from src.models import Direction, LetterGrid
+
+# Rough English letter frequencies, so synthetic words cross about as often as real ones
+LETTER_WEIGHTS = {
+    'E': 12.7, 'T': 9.1, 'A': 8.2, 'O': 7.5, 'I': 7.0, 'N': 6.7, 'S': 6.3, 'H': 6.1, 'R': 6.0,
+    'D': 4.3, 'L': 4.0, 'C': 2.8, 'U': 2.8, 'M': 2.4, 'W': 2.4, 'F': 2.2, 'G': 2.0, 'Y': 2.0,
+    'P': 1.9, 'B': 1.5, 'V': 1.0, 'K': 0.8, 'J': 0.2, 'X': 0.2, 'Q': 0.1, 'Z': 0.1,
+}
+SYNTHETIC_SIZES = (50, 200, 1000)
+# Grid size per synthetic corpus, large enough for the search to keep finding anchors
+SYNTHETIC_GRID_SIZES = {50: 20, 200: 30, 1000: 50}
+SEED = 20240601
+
+
+def synthetic_words(count: int, seed: int = SEED) -> List[str]:
+    """count distinct pseudo-words of 3-10 letters drawn with LETTER_WEIGHTS"""
+    rng = random.Random(f"{seed}:{count}")
+    letters = list(LETTER_WEIGHTS)
+    weights = list(LETTER_WEIGHTS.values())
+    words: List[str] = []
+    seen = set()
+    while len(words) < count:
+        word = "".join(rng.choices(letters, weights, k=rng.randint(3, 10)))
+        if word not in seen:
+            seen.add(word)
+            words.append(word)
+    return words
+
+
+def corpora() -> Dict[str, Tuple[List[str], int]]:
+    """name -> (words, grid_size)"""
+    result = {}
+    with contextlib.redirect_stdout(io.StringIO()):  # The mock provider prints a warning per call
+        for topic in ('pixar', 'basketball', 'generic'):
+            result[f"mock-{topic}"] = ([item['word'] for item in LLMService._get_mock_word_clues(topic)], 15)
+    for size in SYNTHETIC_SIZES:
+        result[f"synthetic-{size}"] = (synthetic_words(size), SYNTHETIC_GRID_SIZES[size])
+    return result
+
+
+def measure(fn: Callable[[], int], samples: int, min_seconds: float) -> Dict[str, float]:
+    """Time fn() samples times (or until min_seconds have passed, whichever is later).
+    fn returns how many operations it performed; latencies are per operation."""
+    fn()  # Warm caches before timing
+    latencies = []
+    ops_total = 0
+    started = time.perf_counter()
+    while len(latencies) < samples or time.perf_counter() - started < min_seconds:
+        start = time.perf_counter_ns()
+        ops = fn()
+        elapsed = time.perf_counter_ns() - start
+        ops_total += ops
+        latencies.append(elapsed / max(ops, 1) / 1000)
+    total_seconds = time.perf_counter() - started
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    quantiles = statistics.quantiles(latencies, n=100, method='inclusive')
+    return {
+        "samples": len(latencies),
+        "ops": ops_total,
+        "mean_us": statistics.fmean(latencies),
+        "p50_us": quantiles[49],
+        "p90_us": quantiles[89],
+        "p99_us": quantiles[98],
+        "ops_per_s": ops_total / total_seconds,
+        "peak_bytes": peak,
+    }
+
+
+def candidate_positions(generator: CrosswordGenerator, crossword) -> List[Tuple[str, int, int, Direction]]:
+    """Every anchor of every word against the finished layout, in bounds"""
+    positions = []
+    for word in generator.words:
+        for placed in crossword.word_placements:
+            for word_idx, placed_idx in generator.find_intersections(word, placed.word):
+                row, col, direction = generator._anchor_position(placed, word_idx, placed_idx)
+                end_row = row + (len(word) - 1 if direction == Direction.VERTICAL else 0)
+                end_col = col + (len(word) - 1 if direction == Direction.HORIZONTAL else 0)
+                if 0 <= row and 0 <= col and end_row < generator.grid_size and end_col < generator.grid_size:
+                    positions.append((word, row, col, direction))
+    return positions
+
+
+def bench_corpus(name: str, words: List[str], grid_size: int, samples: int,
+                 min_seconds: float) -> Dict[str, Dict[str, float]]:
+    results = {}
+    rng = random.Random(f"{SEED}:{name}")
+    generator = CrosswordGenerator(words, grid_size=grid_size)
+    crossword = generator.generate_crossword()
+    grid: LetterGrid = generator.cross_checks.grid
+
+    pairs = [(rng.choice(words), rng.choice(words)) for _ in range(200)]
+    def intersections() -> int:
+        for word1, word2 in pairs:
+            generator.find_intersections(word1, word2)
+        return len(pairs)
+    results[f"find_intersections/{name}"] = measure(intersections, samples, min_seconds)
+
+    positions = candidate_positions(generator, crossword)
+    positions = rng.sample(positions, min(len(positions), 200))
+    placements = crossword.word_placements
+    def can_place() -> int:
+        for word, row, col, direction in positions:
+            generator.can_place_word(grid, word, row, col, direction, placements)
+        return len(positions)
+    results[f"can_place_word/{name}"] = measure(can_place, samples, min_seconds)
+
+    def perpendicular() -> int:
+        for word, row, col, direction in positions:
+            generator._extract_perpendicular_words(grid, word, row, col, direction)
+        return len(positions)
+    results[f"extract_perpendicular_words/{name}"] = measure(perpendicular, samples, min_seconds)
+
+    placed_counts = []
+    def end_to_end() -> int:
+        placed_counts.append(len(CrosswordGenerator(words, grid_size=grid_size).generate_crossword().word_placements))
+        return 1
+    result = measure(end_to_end, max(samples // 10, 5), min_seconds)
+    # One operation is a whole puzzle, so ops_per_s is puzzles per second
+    result["placements_per_s"] = result["ops_per_s"] * statistics.fmean(placed_counts)
+    results[f"generate_crossword/{name}"] = result
+    return results
+
+
+def run(samples: int = 50, min_seconds: float = 0.2, only: str = "") -> Dict:
+    results: Dict[str, Dict[str, float]] = {}
+    for name, (words, grid_size) in corpora().items():
+        if only and only not in name:
+            continue
+        print(f"benchmarking {name} ({len(words)} words, grid {grid_size})", file=sys.stderr)
+        results.update(bench_corpus(name, words, grid_size, samples, min_seconds))
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "samples": samples,
+            "seed": SEED,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: Dict, current: Dict, threshold: float) -> List[str]:
+    """Cases whose p50 latency grew, or placements per second dropped, by more than threshold"""
+    regressions = []
+    for case, base in sorted(baseline["results"].items()):
+        now = current["results"].get(case)
+        if now is None:
+            continue
+        ratio = now["p50_us"] / base["p50_us"] if base["p50_us"] else 1.0
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESSION"
+            regressions.append(case)
+        print(f"{case:<48} p50 {base['p50_us']:10.2f}us -> {now['p50_us']:10.2f}us  ({ratio:5.2f}x){flag}")
+        if "placements_per_s" in base and base["placements_per_s"]:
+            rate_ratio = now["placements_per_s"] / base["placements_per_s"]
+            if rate_ratio < 1 - threshold and case not in regressions:
+                regressions.append(case)
+                print(f"{'':<48} placements/s {base['placements_per_s']:.1f} -> {now['placements_per_s']:.1f}  REGRESSION")
+    return regressions
+
+
+def print_table(report: Dict) -> None:
+    for case, result in report["results"].items():
+        line = (f"{case:<48} p50 {result['p50_us']:10.2f}us  p90 {result['p90_us']:10.2f}us  "
+                f"p99 {result['p99_us']:10.2f}us  peak {result['peak_bytes'] / 1024:8.1f}KiB")
+        if "placements_per_s" in result:
+            line += f"  {result['placements_per_s']:10.1f} placements/s"
+        print(line)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="run the suite and optionally save JSON results")
+    run_parser.add_argument("--output", help="write results to this JSON file")
+    run_parser.add_argument("--samples", type=int, default=50)
+    run_parser.add_argument("--min-seconds", type=float, default=0.2)
+    run_parser.add_argument("--only", default="", help="only corpora whose name contains this text")
+    compare_parser = commands.add_parser("compare", help="flag regressions between two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.10,
+                                help="allowed slowdown as a fraction (default 0.10)")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        report = run(args.samples, args.min_seconds, args.only)
+        print_table(report)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(report, f, indent=2)
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    regressions = compare(baseline, current, args.threshold)
+    print(f"{len(regressions)} regression(s) above {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,138 @@
-from fastapi import FastAPI, HTTPException
+import time
+# Taken before the framework imports so the reported worker startup time includes them
+PROCESS_STARTED = time.perf_counter()
+
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List, Optional, Dict
+from pydantic import BaseModel, Field
+from typing import AsyncIterator, Awaitable, Callable, List, Literal, Optional, Dict, TypeVar
+import asyncio
 import json
+import os
 import uuid
-from src.crossword_generator import CrosswordGenerator
-from src.models import Direction
-from src.llm_service import LLMService
+from dataclasses import asdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from src.crossword_generator import DEFAULT_NODE_BUDGET, DEFAULT_TIME_BUDGET_MS
+from src.portfolio import DEFAULT_ATTEMPTS, create_attempt_pool
+from src.generation import (
+    BatchItemResult, GenerationOptions, GenerationResult, attach_clues, clean_words, generate_puzzle,
+    number_placements, run_batch_item
+)
+from src.models import Direction, LetterGrid, WordListAnalysis
+from src.result_cache import ResultCache
+from src.generation_pool import GenerationPool, PoolSaturated, Reservation
+from src.llm_service import LLMService, TopicStream
+from src.puzzle_pool import DEFAULT_REFILL_INTERVAL, PuzzlePool, WarmPuzzle
+from src.export import ipuz_document, ordered_window
+from src.wire_format import (
+    COMPACT_MEDIA_TYPE, DEFAULT_GZIP_MIN_BYTES, WireFormat, compact_crossword, dumps, encode_compact, negotiate
+)
+from src.clue_store import (
+    ClueStore, CLUES_EXPIRED, CLUES_OK, DEFAULT_EXPIRY_INTERVAL, create_clue_store, expire_periodically
+)
+
+IMPORT_SECONDS = time.perf_counter() - PROCESS_STARTED
+
+T = TypeVar("T")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Provider clients live for the whole process so LLM calls reuse pooled connections
+    await LLMService.startup()
+    clue_expiry = asyncio.ensure_future(expire_periodically(
+        clue_storage, float(os.getenv("CLUE_STORE_EXPIRY_INTERVAL", DEFAULT_EXPIRY_INTERVAL))
+    ))
+    puzzle_warmer = None
+    # With several workers only one of them warms, see PuzzlePool.claim_warmer
+    if puzzle_pool.topics and puzzle_pool.claim_warmer():
+        puzzle_warmer = asyncio.ensure_future(puzzle_pool.run(
+            lambda topic: build_topic_puzzle(topic, GenerationOptions()),
+            float(os.getenv("PUZZLE_POOL_REFILL_INTERVAL", DEFAULT_REFILL_INTERVAL))
+        ))
+    app.state.startup_seconds = time.perf_counter() - PROCESS_STARTED
+    print(f"✅ Worker {os.getpid()} ready in {app.state.startup_seconds:.2f}s (imports {IMPORT_SECONDS:.2f}s)")
+    try:
+        yield
+    finally:
+        clue_expiry.cancel()
+        if puzzle_warmer is not None:
+            puzzle_warmer.cancel()
+            puzzle_pool.release_warmer()
+        await LLMService.shutdown()
+        generation_pool.shutdown()
+        shutdown_process_executor()
+        clue_storage.close()
+        puzzle_pool.close()
+
+app = FastAPI(title="Crossword Generator API", version="1.0.0", lifespan=lifespan)
+
+# Clues by crossword_id, bounded and expiring; see clue_store.create_clue_store. Calls go
+# through asyncio.to_thread: a SQLite store can wait on another worker's write lock.
+clue_storage: ClueStore = create_clue_store()
+
+# Process pool for portfolio and batch generation, started on first use and shared across requests.
+# Made by create_attempt_pool so a portfolio's losing attempts stop once a winner is found.
+_process_executor: Optional[ProcessPoolExecutor] = None
+# Threads that wait on portfolio attempts when the generation pool runs in process mode
+_portfolio_coordinator: Optional[ThreadPoolExecutor] = None
+
+def get_process_executor() -> ProcessPoolExecutor:
+    global _process_executor
+    if _process_executor is None:
+        _process_executor = create_attempt_pool()
+    return _process_executor
+
+def get_portfolio_coordinator() -> ThreadPoolExecutor:
+    global _portfolio_coordinator
+    if _portfolio_coordinator is None:
+        _portfolio_coordinator = ThreadPoolExecutor(max_workers=generation_pool.workers,
+                                                    thread_name_prefix="portfolio")
+    return _portfolio_coordinator
 
-app = FastAPI(title="Crossword Generator API", version="1.0.0")
+def shutdown_process_executor() -> None:
+    global _process_executor, _portfolio_coordinator
+    if _process_executor is not None:
+        _process_executor.shutdown(wait=False, cancel_futures=True)
+        _process_executor = None
+    if _portfolio_coordinator is not None:
+        _portfolio_coordinator.shutdown(wait=False, cancel_futures=True)
+        _portfolio_coordinator = None
 
-# In-memory storage for clue data (could be replaced with Redis/database in production)
-clue_storage: Dict[str, Dict[str, str]] = {}
+async def with_process_executor(call: Callable[[ProcessPoolExecutor], Awaitable[T]]) -> T:
+    """Await call on the shared process pool. A crashed worker (OOM, segfault) breaks the
+    whole pool for good, so a broken pool is replaced and call retried once on the new one."""
+    global _process_executor
+    executor = get_process_executor()
+    try:
+        return await call(executor)
+    except BrokenProcessPool:
+        # Concurrent callers see the same broken pool; only the first replaces it
+        if _process_executor is executor:
+            shutdown_process_executor()
+        return await call(get_process_executor())
+
+MAX_BATCH_SIZE = 1000
+# Exports stream their results, so they may be far larger than a batch
+MAX_EXPORT_SIZE = 100000
+# Puzzles a batch or export generates at once (for an export: ahead of what the client has read).
+# Defaults to the shared process pool's size, one per core, so bulk throughput grows with cores.
+BULK_WINDOW = int(os.getenv("CROSSWORD_EXPORT_WINDOW") or os.cpu_count() or 1)
+
+# Serialized /generate-crossword responses keyed by canonical request, see ResultCache.from_env
+result_cache = ResultCache.from_env()
+
+# Bounded pool that runs /generate-crossword searches off the event loop, see GenerationPool.from_env
+generation_pool = GenerationPool.from_env()
+
+# Compact responses at least this large are gzipped for clients that accept it
+GZIP_MIN_BYTES = int(os.getenv("CROSSWORD_GZIP_MIN_BYTES", DEFAULT_GZIP_MIN_BYTES))
+
+# Ready-made puzzles for hot topics, refilled in the background; see PuzzlePool.from_env
+puzzle_pool = PuzzlePool.from_env()
 
 # Add CORS middleware to allow frontend requests
 app.add_middleware(
@@ -22,11 +143,47 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-class WordListRequest(BaseModel):
+class GenerationSettings(BaseModel):
+    """Engine options shared by every endpoint that lays out a crossword"""
+    # "backtracking" revisits earlier placements to fit every word, within node_budget
+    # "portfolio" runs `attempts` seeded word orderings across cores and keeps the best
+    # "sparse" places words on an unbounded canvas (optionally capped by max_width/max_height)
+    # and crops the grid to the used area, ignoring grid_size
+    # "anneal" spends time_budget_ms improving the greedy layout: more words, more crossings, smaller area
+    engine: Literal["greedy", "backtracking", "portfolio", "sparse", "anneal"] = "greedy"
+    grid_size: int = Field(default=15, ge=2, le=100)
+    node_budget: int = Field(default=DEFAULT_NODE_BUDGET, ge=1, le=100000)
+    attempts: int = Field(default=DEFAULT_ATTEMPTS, ge=1, le=64)
+    seed: int = 0
+    time_budget_ms: int = Field(default=DEFAULT_TIME_BUDGET_MS, ge=1, le=10000)
+    max_width: Optional[int] = Field(default=None, ge=2, le=500)
+    max_height: Optional[int] = Field(default=None, ge=2, le=500)
+    include_stats: bool = False  # Attach generator counters, phase timings and word diagnostics
+    # "connectivity" places the words that share letters with the most others first
+    placement_order: Literal["input", "connectivity"] = "input"
+    
+    def generation_options(self) -> GenerationOptions:
+        return GenerationOptions(**self.model_dump(include=set(GenerationSettings.model_fields)))
+
+class WordListRequest(GenerationSettings):
     words: List[str]
 
+class BatchWordListRequest(BaseModel):
+    items: List[WordListRequest] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+class ExportRequest(BaseModel):
+    items: List[WordListRequest] = Field(min_length=1, max_length=MAX_EXPORT_SIZE)
+    # "crossword" lines carry the /generate-crossword response, "ipuz" lines an ipuz document
+    document: Literal["crossword", "ipuz"] = "crossword"
+    title: Optional[str] = None  # ipuz title; "{index}" is replaced with the item index
+
 class TopicRequest(BaseModel):
     topic: str
+    # "bypass" ignores the topic cache, "refresh" asks the provider again and replaces the cached entry
+    cache: Literal["use", "bypass", "refresh"] = "use"
+
+class TopicCrosswordRequest(TopicRequest, GenerationSettings):
+    pass
 
 class TopicWordsResponse(BaseModel):
     words: List[str]
@@ -34,6 +191,54 @@ class TopicWordsResponse(BaseModel):
     success: bool
     message: str
     crossword_id: Optional[str] = None
+    cached: bool = False  # Served from the topic cache
+    coalesced: bool = False  # Shared the LLM call of a concurrent request for the same topic
+    provider: Optional[str] = None  # Provider and model that produced the words
+    model: Optional[str] = None
+
+class TopicCacheStatsResponse(BaseModel):
+    hits: int
+    misses: int
+    disk_hits: int
+    disk_errors: int
+    entries: int
+    by_provider: Dict[str, int]
+
+class TopicCoalescingStatsResponse(BaseModel):
+    calls: int
+    leaders: int  # Requests that made the provider call
+    coalesced: int  # Requests that shared another request's call
+    in_flight: int
+
+class PuzzlePoolStatsResponse(BaseModel):
+    topics: int
+    depth: int
+    ready: Dict[str, int]  # topic -> puzzles waiting
+    hits: int
+    misses: int
+    builds: int
+    failures: int
+    expired: int
+    warmer: bool  # This worker runs the refill task
+    shared: bool  # Ready puzzles are shared by every worker
+
+class ProviderStatsResponse(BaseModel):
+    provider: str
+    state: str  # Circuit breaker: closed, open or half_open
+    calls: int
+    successes: int
+    failures: int
+    cancelled: int
+    skipped: int
+    wins: int
+    p50_seconds: float
+    p95_seconds: float
+    p99_seconds: float
+
+class ProviderChainStatsResponse(BaseModel):
+    providers: List[ProviderStatsResponse]  # Empty when only mock data is configured
+    hedge_delay: float
+    hedges: int
 
 class ClueData(BaseModel):
     word: str
@@ -44,6 +249,15 @@ class CluesResponse(BaseModel):
     crossword_id: str
     success: bool
     message: str
+    status: Literal["ok", "expired"] = "ok"
+
+class ClueStoreStatsResponse(BaseModel):
+    entries: int
+    bytes: int
+    max_entries: int
+    max_bytes: int
+    expirations: int
+    evictions: int
 
 class WordPlacementResponse(BaseModel):
     word: str
@@ -51,6 +265,22 @@ class WordPlacementResponse(BaseModel):
     start_col: int
     direction: str
     number: int
+    clue: str = ""
+
+class GenerationStatsResponse(BaseModel):
+    anchors_tried: int
+    rejections: Dict[str, int]  # reason -> rejected candidate count
+    phase_seconds: Dict[str, float]
+    words_placed: int
+    words_dropped: int
+
+class WordListDiagnosticsResponse(BaseModel):
+    degrees: Dict[str, int]  # word -> number of other words it shares a letter with
+    isolated_words: List[str]
+    duplicate_words: List[str]
+    contained_words: List[List[str]]  # [inner, outer] pairs
+    oversized_words: List[str]
+    largest_component: int
 
 class CrosswordResponse(BaseModel):
     grid: List[List[Optional[str]]]
@@ -60,87 +290,243 @@ class CrosswordResponse(BaseModel):
     success: bool
     message: str
     crossword_id: Optional[str] = None
+    unplaced_words: List[str] = []
+    search_nodes: int = 0
+    stats: Optional[GenerationStatsResponse] = None
+    diagnostics: Optional[WordListDiagnosticsResponse] = None
+
+class TopicCrosswordResponse(CrosswordResponse):
+    topic: str
+    cached: bool = False  # Words and clues served from the topic cache
+    coalesced: bool = False
+    pooled: bool = False  # Taken ready-made from the warm puzzle pool
+    provider: Optional[str] = None
+    model: Optional[str] = None
+
+class ResultCacheStatsResponse(BaseModel):
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    disk_hits: int
+    disk_errors: int
+    entries: int
+    bytes: int
+    max_bytes: int
+
+class GenerationQueueStatsResponse(BaseModel):
+    mode: str
+    workers: int
+    max_queue: int
+    in_flight: int
+    queue_depth: int
+    reserved: int  # Slots held by running batches and exports
+    completed: int
+    rejected: int
+    mean_wait_seconds: float
+    p95_wait_seconds: float
+    mean_service_seconds: float
+
+class BatchItemResponse(BaseModel):
+    index: int
+    success: bool
+    error: Optional[str] = None  # Validation or generation failure for this item only
+    crossword: Optional[CrosswordResponse] = None
+
+class BatchCrosswordResponse(BaseModel):
+    results: List[BatchItemResponse]  # Same order as the request items
+    succeeded: int
+    failed: int
+
+def build_diagnostics(words: List[str], analysis: WordListAnalysis) -> WordListDiagnosticsResponse:
+    return WordListDiagnosticsResponse(
+        degrees=dict(zip(words, analysis.degrees)),
+        isolated_words=analysis.isolated_words,
+        duplicate_words=analysis.duplicate_words,
+        contained_words=[list(pair) for pair in analysis.contained_words],
+        oversized_words=analysis.oversized_words,
+        largest_component=analysis.largest_component
+    )
+
+async def run_generation(cleaned_words: List[str], options: GenerationOptions) -> GenerationResult:
+    """Run generate_puzzle on the generation pool; raises PoolSaturated when it is full.
+    Portfolio attempts always run in parallel on the shared process pool. In process mode
+    a generation worker cannot reach that pool, so a portfolio is coordinated from a thread
+    instead; it only waits on its attempts but still counts against the admission limit."""
+    if generation_pool.uses_processes and options.engine != "portfolio":
+        return await generation_pool.run(generate_puzzle, cleaned_words, options, None, 1)
+    coordinator = get_portfolio_coordinator() if generation_pool.uses_processes else None
+    return await with_process_executor(
+        lambda executor: generation_pool.run(generate_puzzle, cleaned_words, options, executor,
+                                             executor=coordinator)
+    )
+
+async def cache_call(method: Callable[..., T], *args) -> T:
+    """Call a result cache method, in a thread when it may wait on the shared disk store"""
+    if result_cache.persistent:
+        return await asyncio.to_thread(method, *args)
+    return method(*args)
+
+def reserve_bulk() -> Reservation:
+    """Hold generation pool slots for a batch or export's window, raising PoolSaturated when
+    the pool has no room for them. The job must release the reservation when it ends."""
+    return generation_pool.reserve(max(1, min(BULK_WINDOW, generation_pool.capacity)))
+
+async def run_bulk(items: List[WordListRequest], reservation: Reservation) -> AsyncIterator[BatchItemResult]:
+    """Generate batch or export items in order on the shared process pool, as many at a time as
+    the reservation holds slots, and release it when done. A bulk job never takes more than its
+    reserved slots, so interactive requests are shed, not starved."""
+    def job(index: int, item: WordListRequest) -> Callable[[], Awaitable[BatchItemResult]]:
+        async def generate() -> BatchItemResult:
+            try:
+                return await with_process_executor(lambda executor: generation_pool.run(
+                    run_batch_item, index, item.words, item.generation_options(),
+                    executor=executor, reserved=True
+                ))
+            except BrokenProcessPool:
+                return BatchItemResult(index, error="Generation worker crashed")
+        return generate
+    
+    jobs = (job(index, item) for index, item in enumerate(items))
+    try:
+        async for item in ordered_window(jobs, reservation.slots):
+            yield item
+    finally:
+        reservation.release()
+
+def wire_format(http_request: Request,
+                response_format: Optional[Literal["json", "compact"]] = Query(None, alias="format")) -> WireFormat:
+    """Crossword endpoints answer in the compact encoding (see src.wire_format) when asked
+    by ?format=compact or the Accept header; plain JSON stays the default"""
+    return negotiate(http_request.headers.get("accept"), http_request.headers.get("accept-encoding"),
+                     response_format)
+
+def compact_payload(response: CrosswordResponse, result: GenerationResult) -> dict:
+    """Compact encoding of a freshly built response, with the row strings taken straight from the letter grid"""
+    rows = result.crossword.grid.rows() if response.success else []
+    return compact_crossword(response.model_dump(exclude={"grid"}), rows)
+
+def compact_response(payload: dict, wire: WireFormat) -> Response:
+    body, headers = encode_compact(payload, wire.gzip, GZIP_MIN_BYTES)
+    return Response(content=body, media_type=COMPACT_MEDIA_TYPE, headers=headers)
+
+def pool_saturated_error(error: PoolSaturated) -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail=str(error),
+        headers={"Retry-After": str(error.retry_after)}
+    )
+
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def fail_fast_message(analysis: WordListAnalysis) -> str:
+    """Why generate_puzzle gave up before searching, from the word-list diagnostics"""
+    if analysis.largest_component < 2:
+        reason = "No two words share a letter, so none of them can cross."
+    elif analysis.oversized_words:
+        reason = (f"Too long for the grid: {', '.join(analysis.oversized_words)}. "
+                  "None of the words that fit share a letter, so none of them can cross.")
+    else:
+        reason = "No two words that fit the grid share a letter, so none of them can cross."
+    if analysis.duplicate_words:
+        reason += f" Repeated words: {', '.join(analysis.duplicate_words)}."
+    advice = ("Try a larger grid or shorter words." if analysis.oversized_words
+              else "Try different words with more overlapping letters.")
+    return f"Could not generate a valid crossword with the given words. {reason} {advice}"
+
+def build_crossword_response(result: GenerationResult) -> CrosswordResponse:
+    diagnostics = build_diagnostics(result.words, result.analysis) if result.analysis is not None else None
+    crossword = result.crossword
+    if crossword is None:
+        return CrosswordResponse(
+            grid=[],
+            width=0,
+            height=0,
+            word_placements=[],
+            success=False,
+            unplaced_words=result.words,
+            diagnostics=diagnostics,
+            message=fail_fast_message(result.analysis)
+        )
+    stats = GenerationStatsResponse(**asdict(crossword.stats)) if crossword.stats is not None else None
+    
+    # Check if crossword was successfully generated
+    if len(crossword.word_placements) < 2:
+        return CrosswordResponse(
+            grid=[],
+            width=0,
+            height=0,
+            word_placements=[],
+            success=False,
+            unplaced_words=crossword.unplaced_words,
+            search_nodes=crossword.search_nodes,
+            stats=stats,
+            diagnostics=diagnostics,
+            message=f"Could not generate a valid crossword with the given words. Only {len(crossword.word_placements)} words could be placed. Try different words with more overlapping letters."
+        )
+    
+    # Create response with numbered placements
+    position_numbers = number_placements(crossword.word_placements)
+    numbered_placements = []
+    for placement in crossword.word_placements:
+        pos_key = (placement.start_row, placement.start_col)
+        numbered_placements.append(WordPlacementResponse(
+            word=placement.word,
+            start_row=placement.start_row,
+            start_col=placement.start_col,
+            direction=placement.direction.value,
+            number=position_numbers[pos_key],
+            clue=placement.clue
+        ))
+    
+    return CrosswordResponse(
+        grid=crossword.grid.to_rows(),
+        width=crossword.width,
+        height=crossword.height,
+        word_placements=numbered_placements,
+        success=True,
+        message=f"Successfully generated crossword with {len(crossword.word_placements)} words",
+        unplaced_words=crossword.unplaced_words,
+        search_nodes=crossword.search_nodes,
+        stats=stats,
+        diagnostics=diagnostics
+    )
 
 @app.get("/")
 async def root():
     return {"message": "Crossword Generator API", "status": "running"}
 
 @app.post("/generate-crossword", response_model=CrosswordResponse)
-async def generate_crossword(request: WordListRequest):
+async def generate_crossword(request: WordListRequest, wire: WireFormat = Depends(wire_format)):
     try:
-        # Validate input
-        if not request.words or len(request.words) < 2:
-            raise HTTPException(
-                status_code=400, 
-                detail="Please provide at least 2 words"
-            )
-        
         # Clean and validate words
-        cleaned_words = []
-        for word in request.words:
-            cleaned_word = word.strip().upper()
-            if not cleaned_word.isalpha():
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Word '{word}' contains invalid characters. Only letters allowed."
-                )
-            if len(cleaned_word) < 2:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Word '{word}' is too short. Minimum 2 letters required."
-                )
-            cleaned_words.append(cleaned_word)
-        
-        # Generate crossword
-        generator = CrosswordGenerator(cleaned_words)
-        crossword = generator.generate_crossword()
-        
-        # Check if crossword was successfully generated
-        if len(crossword.word_placements) < 2:
-            return CrosswordResponse(
-                grid=[],
-                width=0,
-                height=0,
-                word_placements=[],
-                success=False,
-                message=f"Could not generate a valid crossword with the given words. Only {len(crossword.word_placements)} words could be placed. Try different words with more overlapping letters."
-            )
+        try:
+            cleaned_words = clean_words(request.words)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
-        # Assign numbers to word placements
-        numbered_placements = []
-        number = 1
-        
-        # Sort placements by row, then column to assign numbers consistently
-        sorted_placements = sorted(crossword.word_placements, 
-                                 key=lambda p: (p.start_row, p.start_col))
-        
-        # Assign numbers to starting positions
-        position_numbers = {}
-        for placement in sorted_placements:
-            pos_key = (placement.start_row, placement.start_col)
-            if pos_key not in position_numbers:
-                position_numbers[pos_key] = number
-                number += 1
-        
-        # Create response with numbered placements
-        for placement in crossword.word_placements:
-            pos_key = (placement.start_row, placement.start_col)
-            numbered_placements.append(WordPlacementResponse(
-                word=placement.word,
-                start_row=placement.start_row,
-                start_col=placement.start_col,
-                direction=placement.direction.value,
-                number=position_numbers[pos_key]
-            ))
+        # Serve repeated word lists from the cache, whatever their order or case. Stats are
+        # measurements of one run, so requests for them always generate afresh.
+        options = request.generation_options()
+        cache_key = ResultCache.make_key(cleaned_words, options)
+        cached = None if options.include_stats else await cache_call(result_cache.get, cache_key)
+        if cached is not None:
+            if wire.compact:
+                return compact_response(compact_crossword(json.loads(cached)), wire)
+            return CrosswordResponse.model_validate_json(cached)
         
-        return CrosswordResponse(
-            grid=crossword.grid,
-            width=crossword.width,
-            height=crossword.height,
-            word_placements=numbered_placements,
-            success=True,
-            message=f"Successfully generated crossword with {len(crossword.word_placements)} words"
-        )
+        # Generate crossword on the generation pool, shedding load when it is full
+        try:
+            result = await run_generation(cleaned_words, options)
+        except PoolSaturated as e:
+            raise pool_saturated_error(e)
+        response = build_crossword_response(result)
+        if not options.include_stats:
+            await cache_call(result_cache.put, cache_key, response.model_dump_json().encode())
+        if wire.compact:
+            return compact_response(compact_payload(response, result), wire)
+        return response
         
     except HTTPException:
         raise
@@ -150,6 +536,68 @@ async def generate_crossword(request: WordListRequest):
             detail=f"Internal server error: {str(e)}"
         )
 
+@app.get("/generate-crossword/cache", response_model=ResultCacheStatsResponse)
+async def get_result_cache_stats():
+    return ResultCacheStatsResponse(**asdict(result_cache.stats()))
+
+@app.get("/generate-crossword/queue", response_model=GenerationQueueStatsResponse)
+async def get_generation_queue_stats():
+    return GenerationQueueStatsResponse(**asdict(generation_pool.stats()))
+
+@app.post("/generate-crossword/batch", response_model=BatchCrosswordResponse)
+async def generate_crossword_batch(request: BatchWordListRequest, wire: WireFormat = Depends(wire_format)):
+    # Each item runs on the process pool; a failing item is reported in place, not raised
+    try:
+        reservation = reserve_bulk()
+    except PoolSaturated as e:
+        raise pool_saturated_error(e)
+    items = [item async for item in run_bulk(request.items, reservation)]
+    
+    results = []
+    for item in items:
+        crossword = build_crossword_response(item.result) if item.success else None
+        results.append(BatchItemResponse(index=item.index, success=item.success,
+                                         error=item.error, crossword=crossword))
+    succeeded = sum(1 for item in results if item.success)
+    response = BatchCrosswordResponse(results=results, succeeded=succeeded, failed=len(results) - succeeded)
+    if wire.compact:
+        payload = response.model_dump()
+        for item in payload["results"]:
+            if item["crossword"] is not None:
+                item["crossword"] = compact_crossword(item["crossword"])
+        return compact_response(payload, wire)
+    return response
+
+def export_line(item: BatchItemResult, request: ExportRequest) -> bytes:
+    """One NDJSON line: the item's crossword response or ipuz document, or why it failed"""
+    crossword = build_crossword_response(item.result) if item.success else None
+    if request.document == "crossword":
+        line = BatchItemResponse(index=item.index, success=item.success, error=item.error, crossword=crossword)
+    elif crossword is None or not crossword.success:
+        line = BatchItemResponse(index=item.index, success=False, error=item.error or crossword.message)
+    else:
+        title = request.title.replace("{index}", str(item.index)) if request.title else None
+        document = ipuz_document(item.result.crossword, title)
+        return dumps({"index": item.index, "success": True, "ipuz": document}) + b"\n"
+    return line.model_dump_json().encode() + b"\n"
+
+@app.post("/export/puzzles")
+async def export_puzzles(request: ExportRequest):
+    """Generate every item and stream the puzzles as NDJSON, one line per item in request order.
+    At most BULK_WINDOW puzzles are generated ahead of what the client has read."""
+    try:
+        reservation = reserve_bulk()
+    except PoolSaturated as e:
+        raise pool_saturated_error(e)
+    
+    async def lines():
+        async for item in run_bulk(request.items, reservation):
+            yield export_line(item, request)
+    
+    # The background task covers a stream that ends before its generator ever starts
+    return StreamingResponse(lines(), media_type="application/x-ndjson",
+                             background=BackgroundTask(reservation.release))
+
 @app.post("/generate-from-topic", response_model=TopicWordsResponse)
 async def generate_words_from_topic(request: TopicRequest):
     try:
@@ -163,7 +611,8 @@ async def generate_words_from_topic(request: TopicRequest):
         topic = request.topic.strip()
         
         # Generate words and clues using LLM service
-        word_clue_data = await LLMService.generate_words_and_clues_from_topic(topic)
+        topic_result = await LLMService.generate_topic_result(topic, cache_mode=request.cache)
+        word_clue_data = topic_result.word_clues
         
         # Extract words and create clue mapping
         words = [item['word'] for item in word_clue_data]
@@ -177,14 +626,18 @@ async def generate_words_from_topic(request: TopicRequest):
         crossword_id = str(uuid.uuid4())
         
         # Store clue data for later retrieval
-        clue_storage[crossword_id] = clue_mapping
+        await asyncio.to_thread(clue_storage.put, crossword_id, clue_mapping)
         
         response = TopicWordsResponse(
             words=words,
             topic=topic,
             success=True,
             message=f"Successfully generated {len(words)} words for topic '{topic}'",
-            crossword_id=crossword_id
+            crossword_id=crossword_id,
+            cached=topic_result.cached,
+            coalesced=topic_result.coalesced,
+            provider=topic_result.provider,
+            model=topic_result.model
         )
         
         # Log the API response being sent to frontend
@@ -199,16 +652,180 @@ async def generate_words_from_topic(request: TopicRequest):
             detail=f"Failed to generate words for topic: {str(e)}"
         )
 
+async def build_topic_puzzle(topic: str, options: GenerationOptions, cache_mode: str = "use") -> WarmPuzzle:
+    """Words and clues for a topic laid out into a puzzle, each placement carrying its clue"""
+    topic_result = await LLMService.generate_topic_result(topic, cache_mode=cache_mode)
+    # The LLM parser has already validated and uppercased the words; only drop what the grid cannot hold
+    clue_mapping = {
+        item['word']: item['clue'] for item in topic_result.word_clues if LetterGrid.can_store(item['word'])
+    }
+    result = await run_generation(list(clue_mapping), options)
+    if result.crossword is not None:
+        attach_clues(result.crossword, clue_mapping)
+    return WarmPuzzle(topic_result, result, clue_mapping)
+
+@app.post("/generate-crossword-from-topic", response_model=TopicCrosswordResponse)
+async def generate_crossword_from_topic(request: TopicCrosswordRequest, wire: WireFormat = Depends(wire_format)):
+    """Topic to finished puzzle in one call: words and clues from the LLM, laid out on
+    the server, with each placement carrying its clue"""
+    try:
+        topic = request.topic.strip()
+        if not topic:
+            raise HTTPException(
+                status_code=400,
+                detail="Please provide a topic"
+            )
+        
+        options = request.generation_options()
+        # The pool only holds puzzles built with the default settings from cached topics
+        puzzle = None
+        if request.cache == "use" and options == GenerationOptions():
+            puzzle = await puzzle_pool.atake(topic)
+        pooled = puzzle is not None
+        if puzzle is None:
+            try:
+                puzzle = await build_topic_puzzle(topic, options, cache_mode=request.cache)
+            except PoolSaturated as e:
+                raise pool_saturated_error(e)
+        
+        # Clues stay retrievable by id for clients that still use /clues/{crossword_id}
+        crossword_id = str(uuid.uuid4())
+        await asyncio.to_thread(clue_storage.put, crossword_id, puzzle.clues)
+        
+        response = build_crossword_response(puzzle.result)
+        topic_result = puzzle.topic_result
+        response = TopicCrosswordResponse(
+            **{**response.model_dump(), "crossword_id": crossword_id},
+            topic=topic,
+            cached=topic_result.cached,
+            coalesced=topic_result.coalesced,
+            pooled=pooled,
+            provider=topic_result.provider,
+            model=topic_result.model
+        )
+        if wire.compact:
+            return compact_response(compact_payload(response, puzzle.result), wire)
+        return response
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error generating crossword for topic '{request.topic}': {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to generate crossword for topic: {str(e)}"
+        )
+
+@app.get("/generate-crossword-from-topic/pool", response_model=PuzzlePoolStatsResponse)
+async def get_puzzle_pool_stats():
+    """Ready puzzles per hot topic and how often requests found one"""
+    stats = await asyncio.to_thread(puzzle_pool.stats) if puzzle_pool.shared else puzzle_pool.stats()
+    return PuzzlePoolStatsResponse(**asdict(stats))
+
+@app.get("/generate-from-topic/stream")
+async def stream_words_from_topic(
+    topic: str,
+    cache: Literal["use", "bypass", "refresh"] = "use",
+    crossword_after: int = Query(default=0, ge=0, le=30)
+):
+    """Server-sent events: a "word" event per word-clue pair as the LLM produces it, an
+    optional "crossword" event laid out from the first crossword_after words while the
+    rest are still streaming, and a final "done" event carrying the crossword_id."""
+    topic = topic.strip()
+    if not topic:
+        raise HTTPException(status_code=400, detail="Please provide a topic")
+    stream = TopicStream(topic, cache_mode=cache)
+    
+    async def preview(words: List[str]) -> Optional[dict]:
+        try:
+            result = await run_generation(clean_words(words), GenerationOptions())
+        except (PoolSaturated, ValueError):
+            return None  # The preview is best effort; the full word list still arrives
+        return build_crossword_response(result).model_dump()
+    
+    async def events():
+        word_clues = []
+        preview_task: Optional[asyncio.Task] = None
+        preview_done = False
+        try:
+            async for pair in stream:
+                word_clues.append(pair)
+                yield sse_event("word", pair)
+                if crossword_after and preview_task is None and len(word_clues) >= crossword_after:
+                    preview_task = asyncio.ensure_future(preview([item['word'] for item in word_clues]))
+                if preview_task is not None and preview_task.done() and not preview_done:
+                    preview_done = True
+                    if preview_task.result() is not None:
+                        yield sse_event("crossword", preview_task.result())
+            
+            if preview_task is not None and not preview_done:
+                preview_done = True
+                crossword = await preview_task
+                if crossword is not None:
+                    yield sse_event("crossword", crossword)
+            
+            crossword_id = str(uuid.uuid4())
+            await asyncio.to_thread(clue_storage.put, crossword_id,
+                                    {item['word']: item['clue'] for item in word_clues})
+            yield sse_event("done", {
+                "words": [item['word'] for item in word_clues],
+                "topic": topic,
+                "crossword_id": crossword_id,
+                "cached": stream.result.cached,
+                "provider": stream.result.provider,
+                "model": stream.result.model
+            })
+        finally:
+            if preview_task is not None:
+                preview_task.cancel()
+    
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.get("/generate-from-topic/cache", response_model=TopicCacheStatsResponse)
+async def get_topic_cache_stats():
+    return TopicCacheStatsResponse(**asdict(LLMService.get_topic_cache().stats()))
+
+@app.get("/generate-from-topic/coalescing", response_model=TopicCoalescingStatsResponse)
+async def get_topic_coalescing_stats():
+    return TopicCoalescingStatsResponse(**asdict(LLMService.topic_flights.stats()))
+
+@app.get("/llm/providers", response_model=ProviderChainStatsResponse)
+async def get_provider_stats():
+    config = LLMService.get_config()
+    chain = LLMService.get_provider_chain(config)
+    if chain is None:
+        return ProviderChainStatsResponse(providers=[], hedge_delay=config['hedge_delay'], hedges=0)
+    return ProviderChainStatsResponse(
+        providers=[ProviderStatsResponse(**asdict(stats)) for stats in chain.stats()],
+        hedge_delay=chain.hedge_delay,
+        hedges=chain.hedges
+    )
+
+@app.get("/clues/stats", response_model=ClueStoreStatsResponse)
+async def get_clue_store_stats():
+    return ClueStoreStatsResponse(**asdict(await asyncio.to_thread(clue_storage.stats)))
+
 @app.get("/clues/{crossword_id}", response_model=CluesResponse)
 async def get_clues(crossword_id: str):
     try:
-        if crossword_id not in clue_storage:
+        lookup = await asyncio.to_thread(clue_storage.get, crossword_id)
+        if lookup.status == CLUES_EXPIRED:
+            # 410 Gone: the id was valid, but its clues have been dropped
+            return JSONResponse(status_code=410, content=CluesResponse(
+                clues={},
+                crossword_id=crossword_id,
+                success=False,
+                message=f"Clues for crossword '{crossword_id}' have expired. Generate the puzzle again.",
+                status="expired"
+            ).model_dump())
+        if lookup.status != CLUES_OK:
             raise HTTPException(
                 status_code=404,
                 detail=f"Crossword ID '{crossword_id}' not found. Clues may have expired."
             )
         
-        clues = clue_storage[crossword_id]
+        clues = lookup.clues
         
         return CluesResponse(
             clues=clues,
@@ -228,7 +845,13 @@ async def get_clues(crossword_id: str):
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "service": "crossword-generator"}
+    return {
+        "status": "healthy",
+        "service": "crossword-generator",
+        "pid": os.getpid(),
+        # Import plus lifespan startup of this worker; None when served without the lifespan
+        "startup_seconds": getattr(app.state, "startup_seconds", None)
+    }
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,322 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+DEFAULT_TTL_SECONDS = 24 * 3600.0
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+DEFAULT_EXPIRY_INTERVAL = 60.0
+
+# ClueLookup.status values
+CLUES_OK = "ok"
+CLUES_EXPIRED = "expired"  # Stored once, dropped by the TTL or to stay under the caps
+CLUES_MISSING = "missing"  # Never stored here (or forgotten long ago)
+
+
+@dataclass
+class ClueLookup:
+    status: str
+    clues: Optional[Dict[str, str]] = None
+
+
+@dataclass
+class ClueStoreStats:
+    entries: int = 0
+    bytes: int = 0
+    max_entries: int = 0
+    max_bytes: int = 0
+    expirations: int = 0  # Dropped because their TTL ran out
+    evictions: int = 0  # Dropped, least recently used first, to stay under the caps
+
+
+def clues_size(crossword_id: str, clues: Dict[str, str]) -> int:
+    """Bytes accounted for one entry: the UTF-8 id, words and clues"""
+    return len(crossword_id.encode()) + sum(len(word.encode()) + len(clue.encode()) for word, clue in clues.items())
+
+
+class ClueStore(ABC):
+    """Where /generate-from-topic keeps clues until the client asks for them by crossword_id"""
+
+    @abstractmethod
+    def put(self, crossword_id: str, clues: Dict[str, str]) -> None:
+        ...
+
+    @abstractmethod
+    def get(self, crossword_id: str) -> ClueLookup:
+        ...
+
+    @abstractmethod
+    def expire(self) -> int:
+        """Drop every entry past its TTL, returning how many were dropped"""
+
+    @abstractmethod
+    def stats(self) -> ClueStoreStats:
+        ...
+
+    def close(self) -> None:
+        pass
+
+
+class InMemoryClueStore(ClueStore):
+    """Process-local clue store with a TTL and LRU caps on entry count and bytes.
+
+    Reads refresh recency but not the TTL. Ids of dropped entries are remembered (up to
+    max_entries of them) so a late lookup reports "expired" rather than "missing"."""
+
+    def __init__(self, ttl_seconds: float = DEFAULT_TTL_SECONDS, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_bytes: int = DEFAULT_MAX_BYTES, clock: Callable[[], float] = time.time):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.expirations = 0
+        self.evictions = 0
+        # crossword_id -> (expires_at, size, clues), least recently used first
+        self._entries: "OrderedDict[str, Tuple[float, int, Dict[str, str]]]" = OrderedDict()
+        self._dropped: "OrderedDict[str, None]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def put(self, crossword_id: str, clues: Dict[str, str]) -> None:
+        size = clues_size(crossword_id, clues)
+        with self._lock:
+            self._remove(crossword_id)
+            self._dropped.pop(crossword_id, None)
+            self._entries[crossword_id] = (self.clock() + self.ttl_seconds, size, dict(clues))
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def get(self, crossword_id: str) -> ClueLookup:
+        with self._lock:
+            entry = self._entries.get(crossword_id)
+            if entry is not None and entry[0] <= self.clock():
+                self._drop(crossword_id)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                return ClueLookup(CLUES_EXPIRED if crossword_id in self._dropped else CLUES_MISSING)
+            self._entries.move_to_end(crossword_id)
+            return ClueLookup(CLUES_OK, dict(entry[2]))
+
+    def expire(self) -> int:
+        now = self.clock()
+        with self._lock:
+            expired = [crossword_id for crossword_id, entry in self._entries.items() if entry[0] <= now]
+            for crossword_id in expired:
+                self._drop(crossword_id)
+            self.expirations += len(expired)
+            return len(expired)
+
+    def stats(self) -> ClueStoreStats:
+        with self._lock:
+            return ClueStoreStats(len(self._entries), self._bytes, self.max_entries, self.max_bytes,
+                                  self.expirations, self.evictions)
+
+    def _remove(self, crossword_id: str) -> None:
+        entry = self._entries.pop(crossword_id, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def _drop(self, crossword_id: str) -> None:
+        self._remove(crossword_id)
+        self._dropped[crossword_id] = None
+        while len(self._dropped) > self.max_entries:
+            self._dropped.popitem(last=False)
+
+
+class SqliteClueStore(ClueStore):
+    """Clue store in a SQLite file, shared by every worker process that opens the same path.
+
+    Same TTL, LRU caps and expired/missing distinction as InMemoryClueStore. Writes run in
+    an IMMEDIATE transaction, so concurrent workers never evict past the caps or lose an
+    entry. Lookups only read, which WAL lets run alongside a writer; the recency they
+    refresh is written by this process's next put or expire. Triggers keep the entry and
+    byte totals, so a put at the caps evicts through the used index without a scan. The
+    expiration and eviction counters count this process only."""
+
+    def __init__(self, path: str, ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES,
+                 clock: Callable[[], float] = time.time):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.expirations = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        # Ids read since this process last wrote, least recently read first
+        self._reads: "OrderedDict[str, None]" = OrderedDict()
+        # Autocommit mode: transactions are opened explicitly by _transaction
+        self._db: Optional[sqlite3.Connection] = sqlite3.connect(
+            path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        with self._transaction() as db:
+            # used is a counter rather than a timestamp so recency never ties
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS clues (crossword_id TEXT PRIMARY KEY, clues TEXT NOT NULL, "
+                "size INTEGER NOT NULL, expires_at REAL NOT NULL, used INTEGER NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS clues_used ON clues (used)")
+            db.execute("CREATE INDEX IF NOT EXISTS clues_expires_at ON clues (expires_at)")
+            db.execute("CREATE TABLE IF NOT EXISTS dropped (crossword_id TEXT PRIMARY KEY, seq INTEGER NOT NULL)")
+            db.execute("CREATE INDEX IF NOT EXISTS dropped_seq ON dropped (seq)")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS totals (id INTEGER PRIMARY KEY CHECK (id = 0), "
+                "entries INTEGER NOT NULL, bytes INTEGER NOT NULL)"
+            )
+            db.execute("INSERT OR IGNORE INTO totals SELECT 0, COUNT(*), COALESCE(SUM(size), 0) FROM clues")
+            db.execute(
+                "CREATE TRIGGER IF NOT EXISTS clues_inserted AFTER INSERT ON clues BEGIN "
+                "UPDATE totals SET entries = entries + 1, bytes = bytes + NEW.size; END"
+            )
+            db.execute(
+                "CREATE TRIGGER IF NOT EXISTS clues_deleted AFTER DELETE ON clues BEGIN "
+                "UPDATE totals SET entries = entries - 1, bytes = bytes - OLD.size; END"
+            )
+            db.execute(
+                "CREATE TRIGGER IF NOT EXISTS clues_resized AFTER UPDATE OF size ON clues BEGIN "
+                "UPDATE totals SET bytes = bytes + NEW.size - OLD.size; END"
+            )
+
+    def put(self, crossword_id: str, clues: Dict[str, str]) -> None:
+        size = clues_size(crossword_id, clues)
+        with self._transaction() as db:
+            self._apply_reads(db)
+            db.execute("DELETE FROM dropped WHERE crossword_id = ?", (crossword_id,))
+            db.execute(
+                "INSERT INTO clues (crossword_id, clues, size, expires_at, used) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (crossword_id) DO UPDATE SET clues = excluded.clues, size = excluded.size, "
+                "expires_at = excluded.expires_at, used = excluded.used",
+                (crossword_id, json.dumps(clues), size, self.clock() + self.ttl_seconds, self._next_used(db))
+            )
+            entries, total = db.execute("SELECT entries, bytes FROM totals").fetchone()
+            oldest = max(entries - self.max_entries, 0)
+            if total > self.max_bytes:
+                oldest = max(oldest, self._count_to_free(db, total - self.max_bytes))
+            if oldest:
+                self.evictions += self._drop(
+                    db, "crossword_id IN (SELECT crossword_id FROM clues ORDER BY used LIMIT ?)", (oldest,)
+                )
+
+    def get(self, crossword_id: str) -> ClueLookup:
+        with self._lock:
+            row = self._db.execute("SELECT clues, expires_at FROM clues WHERE crossword_id = ?", (crossword_id,)).fetchone()
+            if row is not None and row[1] > self.clock():
+                self._reads[crossword_id] = None
+                self._reads.move_to_end(crossword_id)
+                if len(self._reads) > self.max_entries:
+                    self._reads.popitem(last=False)
+                return ClueLookup(CLUES_OK, json.loads(row[0]))
+        if row is not None:
+            # Past its TTL: the one lookup that writes, dropping the entry as InMemoryClueStore does
+            with self._transaction() as db:
+                self.expirations += self._drop(db, "crossword_id = ? AND expires_at <= ?", (crossword_id, self.clock()))
+            return ClueLookup(CLUES_EXPIRED)
+        with self._lock:
+            dropped = self._db.execute("SELECT 1 FROM dropped WHERE crossword_id = ?", (crossword_id,)).fetchone()
+        return ClueLookup(CLUES_EXPIRED if dropped else CLUES_MISSING)
+
+    def expire(self) -> int:
+        with self._transaction() as db:
+            self._apply_reads(db)
+            expired = self._drop(db, "expires_at <= ?", (self.clock(),))
+            self.expirations += expired
+            return expired
+
+    def stats(self) -> ClueStoreStats:
+        with self._lock:
+            entries, total = self._db.execute("SELECT entries, bytes FROM totals").fetchone()
+            return ClueStoreStats(entries, total, self.max_entries, self.max_bytes, self.expirations, self.evictions)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._db
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+
+    def _next_used(self, db: sqlite3.Connection) -> int:
+        return db.execute("SELECT COALESCE(MAX(used), 0) + 1 FROM clues").fetchone()[0]
+
+    def _apply_reads(self, db: sqlite3.Connection) -> None:
+        """Make the entries this process read since its last write the most recently used, in read order"""
+        if not self._reads:
+            return
+        first = self._next_used(db)
+        db.executemany("UPDATE clues SET used = ? WHERE crossword_id = ?",
+                       [(first + i, crossword_id) for i, crossword_id in enumerate(self._reads)])
+        self._reads.clear()
+
+    def _count_to_free(self, db: sqlite3.Connection, excess: int) -> int:
+        """How many of the least recently used entries add up to at least excess bytes.
+        Walks the used index from the oldest end and stops as soon as that is enough."""
+        cursor = db.execute("SELECT size FROM clues ORDER BY used")
+        try:
+            count = freed = 0
+            for (size,) in cursor:
+                if freed >= excess:
+                    break
+                count += 1
+                freed += size
+            return count
+        finally:
+            cursor.close()
+
+    def _drop(self, db: sqlite3.Connection, where: str, params: tuple) -> int:
+        """Delete the entries matching where, remembering their ids so lookups report them
+        expired. Returns how many were deleted."""
+        db.execute(
+            "INSERT OR REPLACE INTO dropped (crossword_id, seq) "
+            "SELECT crossword_id, (SELECT COALESCE(MAX(seq), 0) FROM dropped) + ROW_NUMBER() OVER (ORDER BY used) "
+            f"FROM clues WHERE {where}", params
+        )
+        deleted = db.execute(f"DELETE FROM clues WHERE {where}", params).rowcount
+        db.execute(
+            "DELETE FROM dropped WHERE crossword_id IN "
+            "(SELECT crossword_id FROM dropped ORDER BY seq DESC LIMIT -1 OFFSET ?)", (self.max_entries,)
+        )
+        return deleted
+
+
+def create_clue_store() -> ClueStore:
+    """Clue store configured from CLUE_STORE_TTL_SECONDS, CLUE_STORE_MAX_ENTRIES and
+    CLUE_STORE_MAX_BYTES. With CLUE_STORE_PATH the store is a SQLite file that several
+    worker processes can share; unset, it lives in this process's memory."""
+    settings = dict(
+        ttl_seconds=float(os.getenv("CLUE_STORE_TTL_SECONDS", DEFAULT_TTL_SECONDS)),
+        max_entries=int(os.getenv("CLUE_STORE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+        max_bytes=int(os.getenv("CLUE_STORE_MAX_BYTES", DEFAULT_MAX_BYTES))
+    )
+    path = os.getenv("CLUE_STORE_PATH")
+    if path:
+        return SqliteClueStore(path, **settings)
+    return InMemoryClueStore(**settings)
+
+
+async def expire_periodically(store: ClueStore, interval_seconds: float = DEFAULT_EXPIRY_INTERVAL) -> None:
+    """Background task: sweep expired entries so memory is returned without waiting for a lookup"""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        # A SQLite store may wait on another worker's write lock, so keep it off the event loop
+        await asyncio.to_thread(store.expire)
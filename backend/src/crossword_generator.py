@@ -1,14 +1,400 @@
-from typing import List, Optional, Tuple
-from src.models import Direction, WordPlacement, CrosswordGrid
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+from src.models import (
+    Direction, WordPlacement, CrosswordGrid, LetterGrid, SparseCanvas, EMPTY_CELL, GenerationStats,
+    WordListAnalysis,
+    REJECT_BOUNDS, REJECT_CONFLICT, REJECT_UNINTENDED_WORD, REJECT_BOUNDARY_MERGE, REJECT_NOT_CONNECTED
+)
+from collections import deque
+import math
 import random
+import time
+
+DEFAULT_NODE_BUDGET = 2000  # Search nodes the backtracking engine may expand per puzzle
+DEFAULT_TIME_BUDGET_MS = 200  # Milliseconds the annealing engine spends improving the greedy layout
+
+# Annealing energy: placed words dominate; crossings per word and bounding-box area
+# (as a fraction of the grid) together move it by less than one word
+ANNEAL_PLACED_WEIGHT = 2.0
+ANNEAL_CROSSING_WEIGHT = 0.4
+ANNEAL_AREA_WEIGHT = 0.4
+# Temperature falls geometrically from start to end over the time budget
+ANNEAL_START_TEMPERATURE = 0.3
+ANNEAL_END_TEMPERATURE = 0.005
+# Annealing stops early after this many moves in a row change nothing: no word can be lifted or placed
+ANNEAL_MAX_IDLE_MOVES = 200
+
+ALL_LETTERS = (1 << 26) - 1  # Cross-check mask allowing every letter A-Z (A is bit 0)
+
+# CrossChecks.blocked flags: the neighbouring cell in that direction is filled
+BLOCKED_START_H = 1
+BLOCKED_END_H = 2
+BLOCKED_START_V = 4
+BLOCKED_END_V = 8
+
+def letter_bit(letter: str) -> int:
+    """Cross-check mask bit for an A-Z letter, 0 for anything else"""
+    code = ord(letter) - 65
+    return 1 << code if 0 <= code < 26 else 0
+
+class CrossChecks:
+    """Per-cell placement constraints for one grid, kept current as words are placed.
+    
+    mask_h[idx] holds the letters a horizontal word may put in cell idx: the existing
+    letter if the cell is filled (and its vertical run is an intended word), otherwise
+    every letter that turns the vertical run through the cell into an intended word.
+    mask_v is the same for vertical words. blocked holds BLOCKED_* flags for cells that
+    cannot start or end a word because the neighbouring cell is filled. Together they
+    give the same answer as the conflict, perpendicular and boundary checks in
+    CrosswordGenerator.can_place_word. Masks invalidated by a placement are stored as
+    None and recomputed the first time a candidate needs them."""
+    
+    def __init__(self, grid: LetterGrid, word_set: frozenset,
+                 run_masks: Optional[Dict[Tuple[str, str], int]] = None):
+        self.grid = grid
+        self.word_set = word_set
+        # (prefix, suffix) -> letters completing an intended word, shared across grids
+        self.run_masks = {} if run_masks is None else run_masks
+        self.words_by_length: Dict[int, List[str]] = {}
+        for word in word_set:
+            self.words_by_length.setdefault(len(word), []).append(word)
+        size = grid.width * grid.height
+        self.mask_h: List[Optional[int]] = [ALL_LETTERS] * size
+        self.mask_v: List[Optional[int]] = [ALL_LETTERS] * size
+        self.blocked = bytearray(size)
+        self.rebuild()
+    
+    def rebuild(self) -> None:
+        """Recompute every cell from the grid"""
+        if not any(self.grid.cells):
+            return  # An empty grid allows every letter everywhere, as initialised
+        for idx in range(len(self.grid.cells)):
+            self.mask_h[idx] = self._compute_mask(idx, self.grid.width)
+            self.mask_v[idx] = self._compute_mask(idx, 1)
+            self.blocked[idx] = self._compute_blocked(idx)
+    
+    def refresh(self, changed) -> None:
+        """Update the cells whose constraints depend on the changed cells.
+        A cell's mask depends on the run of filled cells it touches, so for each changed
+        cell we recompute that run plus the empty cells bounding it, in both directions.
+        A walk stops at a cell an earlier walk already reached, since that walk covered
+        everything beyond it."""
+        grid = self.grid
+        cells = grid.cells
+        width = grid.width
+        size = len(cells)
+        affected_h = set()
+        affected_v = set()
+        affected_blocked = set()
+        for idx in changed:
+            affected_h.add(idx)
+            affected_v.add(idx)
+            col = idx % width
+            # Column run: feeds the masks used by horizontal words
+            up = idx - width
+            while up >= 0 and up not in affected_h:
+                affected_h.add(up)
+                if cells[up] == EMPTY_CELL:
+                    break
+                up -= width
+            down = idx + width
+            while down < size and down not in affected_h:
+                affected_h.add(down)
+                if cells[down] == EMPTY_CELL:
+                    break
+                down += width
+            # Row run: feeds the masks used by vertical words
+            left = idx - 1
+            while left >= idx - col and left not in affected_v:
+                affected_v.add(left)
+                if cells[left] == EMPTY_CELL:
+                    break
+                left -= 1
+            right = idx + 1
+            while right < idx - col + width and right not in affected_v:
+                affected_v.add(right)
+                if cells[right] == EMPTY_CELL:
+                    break
+                right += 1
+            affected_blocked.add(idx)
+            if col > 0:
+                affected_blocked.add(idx - 1)
+            if col < width - 1:
+                affected_blocked.add(idx + 1)
+            if idx >= width:
+                affected_blocked.add(idx - width)
+            if idx + width < size:
+                affected_blocked.add(idx + width)
+        mask_h = self.mask_h
+        for idx in affected_h:
+            mask_h[idx] = None
+        mask_v = self.mask_v
+        for idx in affected_v:
+            mask_v[idx] = None
+        for idx in affected_blocked:
+            self.blocked[idx] = self._compute_blocked(idx)
+    
+    def rejection(self, bits: List[int], start_row: int, start_col: int, direction: Direction) -> Optional[str]:
+        """Why a word with these letter bits cannot go at the position, or None if it fits.
+        Checks run in the same order as the slow path; bounds are the caller's job."""
+        width = self.grid.width
+        idx = start_row * width + start_col
+        if direction == Direction.HORIZONTAL:
+            # Horizontal words cross vertical runs, which step a full row at a time
+            masks, step, run_step, start_flag, end_flag = self.mask_h, 1, width, BLOCKED_START_H, BLOCKED_END_H
+        else:
+            masks, step, run_step, start_flag, end_flag = self.mask_v, width, 1, BLOCKED_START_V, BLOCKED_END_V
+        start = idx
+        for bit in bits:
+            mask = masks[idx]
+            if mask is None:
+                mask = masks[idx] = self._compute_mask(idx, run_step)
+            if not mask & bit:
+                # Letter conflicts were already ruled out, so the perpendicular run is the problem
+                return REJECT_UNINTENDED_WORD
+            idx += step
+        if self.blocked[start] & start_flag or self.blocked[idx - step] & end_flag:
+            return REJECT_BOUNDARY_MERGE
+        return None
+    
+    def debug_view(self) -> Dict[str, List[List[str]]]:
+        """Readable copy of the masks for tests and debugging.
+        'horizontal'/'vertical' list the allowed letters per cell ('*' for any letter);
+        'blocked' lists the flags per cell as S/E (horizontal start/end) and s/e (vertical)."""
+        def letters(mask: int) -> str:
+            if mask == ALL_LETTERS:
+                return '*'
+            return ''.join(chr(65 + b) for b in range(26) if mask & (1 << b))
+        
+        def flags(value: int) -> str:
+            return ''.join(name for flag, name in ((BLOCKED_START_H, 'S'), (BLOCKED_END_H, 'E'),
+                                                   (BLOCKED_START_V, 's'), (BLOCKED_END_V, 'e'))
+                           if value & flag)
+        
+        width = self.grid.width
+        rows = range(self.grid.height)
+        for idx in range(len(self.grid.cells)):
+            if self.mask_h[idx] is None:
+                self.mask_h[idx] = self._compute_mask(idx, width)
+            if self.mask_v[idx] is None:
+                self.mask_v[idx] = self._compute_mask(idx, 1)
+        return {
+            'horizontal': [[letters(m) for m in self.mask_h[r * width:(r + 1) * width]] for r in rows],
+            'vertical': [[letters(m) for m in self.mask_v[r * width:(r + 1) * width]] for r in rows],
+            'blocked': [[flags(b) for b in self.blocked[r * width:(r + 1) * width]] for r in rows],
+        }
+    
+    def _compute_mask(self, idx: int, step: int) -> int:
+        """Allowed letters at idx for a word running across the perpendicular run along step"""
+        cells = self.grid.cells
+        width = self.grid.width
+        letter = cells[idx]
+        if step == 1:
+            lower_limit = idx - idx % width
+            upper_limit = lower_limit + width - 1
+        else:
+            lower_limit = idx % width
+            upper_limit = len(cells) - width + lower_limit
+        if ((idx == lower_limit or cells[idx - step] == EMPTY_CELL) and
+                (idx == upper_limit or cells[idx + step] == EMPTY_CELL)):
+            # No perpendicular run through this cell
+            return ALL_LETTERS if letter == EMPTY_CELL else letter_bit(chr(letter))
+        before = idx
+        while before > lower_limit and cells[before - step] != EMPTY_CELL:
+            before -= step
+        after = idx
+        while after < upper_limit and cells[after + step] != EMPTY_CELL:
+            after += step
+        prefix = cells[before:idx:step].decode('latin-1')
+        suffix = cells[idx + step:after + step:step].decode('latin-1')
+        
+        if letter != EMPTY_CELL:
+            run = prefix + chr(letter) + suffix
+            if len(run) == 1 or run in self.word_set:
+                return letter_bit(chr(letter))
+            return 0
+        return self._run_mask(prefix, suffix)
+    
+    def _run_mask(self, prefix: str, suffix: str) -> int:
+        key = (prefix, suffix)
+        mask = self.run_masks.get(key)
+        if mask is None:
+            mask = 0
+            length = len(prefix) + len(suffix) + 1
+            for word in self.words_by_length.get(length, ()):
+                if word.startswith(prefix) and word.endswith(suffix):
+                    mask |= letter_bit(word[len(prefix)])
+            self.run_masks[key] = mask
+        return mask
+    
+    def _compute_blocked(self, idx: int) -> int:
+        cells = self.grid.cells
+        width = self.grid.width
+        col = idx % width
+        value = 0
+        if col > 0 and cells[idx - 1] != EMPTY_CELL:
+            value |= BLOCKED_START_H
+        if col < width - 1 and cells[idx + 1] != EMPTY_CELL:
+            value |= BLOCKED_END_H
+        if idx >= width and cells[idx - width] != EMPTY_CELL:
+            value |= BLOCKED_START_V
+        if idx + width < len(cells) and cells[idx + width] != EMPTY_CELL:
+            value |= BLOCKED_END_V
+        return value
 
 class CrosswordGenerator:
-    def __init__(self, words: List[str], grid_size: int = 15):
-        """Initialize with word list and grid size"""
+    def __init__(self, words: List[str], grid_size: int = 15, collect_stats: bool = False,
+                 placement_order: str = "input"):
+        """Initialize with word list and grid size.
+        collect_stats=True records a GenerationStats for each generate_* call.
+        placement_order="connectivity" places the best-connected words first (see
+        connectivity_order); "input" keeps the list as given."""
+        if placement_order not in ("input", "connectivity"):
+            raise ValueError(f"Unknown placement order: {placement_order}")
         self.words = [word.upper() for word in words]
+        self.word_set = frozenset(self.words)  # O(1) membership for perpendicular checks
         self.grid_size = grid_size
+        self.analysis: Optional[WordListAnalysis] = None
+        if placement_order == "connectivity":
+            self.words = self.connectivity_order()
+            self.analysis = None  # Indices changed with the order; recompute on demand
         self.max_unintended_words = max(1, len(words) // 5)  # 1 unintended word per 5 intended
         self.debug_mode = False  # Set to True for debugging output
+        self.collect_stats = collect_stats
+        self.stats: Optional[GenerationStats] = None
+        # Letter -> offsets table for every input word, built once so anchor
+        # lookup never has to rescan the word's characters
+        self.letter_positions: Dict[str, Dict[str, List[int]]] = {
+            word: self._build_letter_positions(word) for word in self.words
+        }
+        # Cross-check masks for the grid being generated; they cover A-Z only, so word
+        # lists with other letters always take the string-building path
+        self.use_cross_checks = True
+        self.cross_checks: Optional[CrossChecks] = None
+        self._run_masks: Dict[Tuple[str, str], int] = {}
+        if all('A' <= letter <= 'Z' for word in self.words for letter in word):
+            self.letter_bits: Dict[str, List[int]] = {
+                word: [letter_bit(letter) for letter in word] for word in self.words
+            }
+        else:
+            self.letter_bits = {}
+    
+    def analyze_words(self) -> WordListAnalysis:
+        """Letter histograms, the shares-a-letter graph and list diagnostics, computed once.
+        
+        Each letter gets a bitset of the words containing it, so a word's neighbours are
+        the OR of its letters' bitsets and the whole graph takes one pass over the letters
+        instead of comparing every pair of words."""
+        if self.analysis is not None:
+            return self.analysis
+        words = self.words
+        alphabet = ''.join(sorted(set(''.join(words))))
+        column = {letter: i for i, letter in enumerate(alphabet)}
+        
+        histograms = []
+        words_with_letter = [0] * len(alphabet)
+        for idx, word in enumerate(words):
+            histogram = [0] * len(alphabet)
+            for letter in word:
+                histogram[column[letter]] += 1
+            histograms.append(histogram)
+            for letter in set(word):
+                words_with_letter[column[letter]] |= 1 << idx
+        
+        neighbors = []
+        for idx, word in enumerate(words):
+            bits = 0
+            for letter in set(word):
+                bits |= words_with_letter[column[letter]]
+            neighbors.append(bits & ~(1 << idx))
+        degrees = [bin(bits).count('1') for bits in neighbors]
+        
+        # Connected components by flooding neighbour bitsets
+        largest_component = 0
+        unvisited = (1 << len(words)) - 1
+        while unvisited:
+            seed = unvisited & -unvisited
+            component = frontier = seed
+            while frontier:
+                low = frontier & -frontier
+                frontier ^= low
+                new = neighbors[low.bit_length() - 1] & ~component
+                component |= new
+                frontier |= new
+            unvisited &= ~component
+            largest_component = max(largest_component, bin(component).count('1'))
+        
+        seen: Set[str] = set()
+        duplicate_words = []
+        for word in words:
+            if word in seen and word not in duplicate_words:
+                duplicate_words.append(word)
+            seen.add(word)
+        
+        # Substrings of each word looked up in the word set: O(n * len^2) rather than O(n^2)
+        contained_words = []
+        for outer in dict.fromkeys(words):
+            found = {outer[i:j] for i in range(len(outer)) for j in range(i + 1, len(outer) + 1)}
+            for inner in sorted(found & self.word_set - {outer}):
+                contained_words.append((inner, outer))
+        
+        self.analysis = WordListAnalysis(
+            alphabet=alphabet,
+            letter_histograms=histograms,
+            neighbors=neighbors,
+            degrees=degrees,
+            isolated_words=[word for word, degree in zip(words, degrees) if degree == 0],
+            duplicate_words=duplicate_words,
+            contained_words=contained_words,
+            oversized_words=[word for word in words if len(word) > self.grid_size],
+            largest_component=largest_component,
+        )
+        return self.analysis
+    
+    def connectivity_order(self) -> List[str]:
+        """Words reordered so each one shares a letter with a word placed before it.
+        Walks the shares-a-letter graph breadth-first from the word with the most partners,
+        taking better-connected words first at each step (ties keep input order). Other
+        components follow the same way, and isolated words end up last."""
+        analysis = self.analyze_words()
+        by_degree = sorted(range(len(self.words)), key=lambda i: (-analysis.degrees[i], i))
+        ordered: List[int] = []
+        visited = 0
+        for start in by_degree:
+            if visited >> start & 1:
+                continue
+            visited |= 1 << start
+            queue = deque([start])
+            while queue:
+                idx = queue.popleft()
+                ordered.append(idx)
+                new = analysis.neighbors[idx] & ~visited
+                visited |= new
+                discovered = []
+                while new:
+                    low = new & -new
+                    new ^= low
+                    discovered.append(low.bit_length() - 1)
+                discovered.sort(key=lambda i: (-analysis.degrees[i], i))
+                queue.extend(discovered)
+        return [self.words[i] for i in ordered]
+    
+    def has_possible_layout(self, max_length: Optional[int] = None) -> bool:
+        """Whether two words no longer than max_length share a letter. When this is False
+        no connected layout of two or more words exists, so there is nothing to search."""
+        analysis = self.analyze_words()
+        fits = 0
+        for idx, word in enumerate(self.words):
+            if max_length is None or len(word) <= max_length:
+                fits |= 1 << idx
+        return any(fits >> idx & 1 and analysis.neighbors[idx] & fits for idx in range(len(self.words)))
+    
+    @staticmethod
+    def _build_letter_positions(word: str) -> Dict[str, List[int]]:
+        """Map each letter of word to the ascending offsets where it occurs"""
+        positions: Dict[str, List[int]] = {}
+        for i, letter in enumerate(word):
+            positions.setdefault(letter, []).append(i)
+        return positions
     
     def find_intersections(self, word1: str, word2: str) -> List[Tuple[int, int]]:
         """Find all possible intersection points between two words
@@ -20,65 +406,92 @@ class CrosswordGenerator:
                     intersections.append((i, j))
         return intersections
     
-    def can_place_word(self, grid: List[List[Optional[str]]], word: str, 
+    def can_place_word(self, grid: LetterGrid, word: str, 
                       start_row: int, start_col: int, direction: Direction, 
                       word_placements: List[WordPlacement] = None) -> bool:
         """Check if word can be placed at given position without conflicts"""
+        # Stats stay None unless collect_stats is set, so disabled runs only pay for this check
+        stats = self.stats
+        
         # Check bounds
         if direction == Direction.HORIZONTAL:
-            if start_col + len(word) > self.grid_size or start_row >= self.grid_size:
-                return False
-            if start_row < 0 or start_col < 0:
+            if (start_col + len(word) > self.grid_size or start_row >= self.grid_size or
+                    start_row < 0 or start_col < 0):
+                if stats is not None:
+                    stats.rejections[REJECT_BOUNDS] += 1
                 return False
         else:  # VERTICAL
-            if start_row + len(word) > self.grid_size or start_col >= self.grid_size:
-                return False
-            if start_row < 0 or start_col < 0:
+            if (start_row + len(word) > self.grid_size or start_col >= self.grid_size or
+                    start_row < 0 or start_col < 0):
+                if stats is not None:
+                    stats.rejections[REJECT_BOUNDS] += 1
                 return False
         
         # Check for conflicts
-        for i, letter in enumerate(word):
-            if direction == Direction.HORIZONTAL:
-                row, col = start_row, start_col + i
-            else:
-                row, col = start_row + i, start_col
-            
-            if grid[row][col] is not None and grid[row][col] != letter:
+        cells = grid.cells
+        idx = start_row * grid.width + start_col
+        step = 1 if direction == Direction.HORIZONTAL else grid.width
+        for code in word.encode('latin-1'):
+            cell = cells[idx]
+            if cell != EMPTY_CELL and cell != code:
+                if stats is not None:
+                    stats.rejections[REJECT_CONFLICT] += 1
                 return False
+            idx += step
         
         # Check perpendicular word formation if we have existing placements
         if word_placements and len(word_placements) > 0:
-            if not self._is_valid_perpendicular_placement(grid, word, start_row, start_col, direction):
-                return False
-            
+            checks = self.cross_checks
+            if checks is not None and checks.grid is grid and word in self.letter_bits:
+                # The masks encode the perpendicular and boundary checks exactly,
+                # so a few ANDs replace building the perpendicular strings
+                reason = checks.rejection(self.letter_bits[word], start_row, start_col, direction)
+            elif not self._is_valid_perpendicular_placement(grid, word, start_row, start_col, direction):
+                reason = REJECT_UNINTENDED_WORD
             # Check for word boundary violations (merging words)
-            if not self._check_word_boundaries(grid, word, start_row, start_col, direction):
-                return False
+            elif not self._check_word_boundaries(grid, word, start_row, start_col, direction):
+                reason = REJECT_BOUNDARY_MERGE
+            else:
+                reason = None
             
             # Ensure connectivity (word must intersect with existing words)
-            if not self._is_connected_to_existing(grid, word, start_row, start_col, direction):
+            if reason is None and not self._is_connected_to_existing(grid, word, start_row, start_col, direction):
+                reason = REJECT_NOT_CONNECTED
+            
+            if reason is not None:
+                if stats is not None:
+                    stats.rejections[reason] += 1
                 return False
         
         return True
     
-    def place_word(self, grid: List[List[Optional[str]]], word: str,
+    def place_word(self, grid: LetterGrid, word: str,
                   start_row: int, start_col: int, direction: Direction) -> bool:
         """Place word on grid if possible, return success status"""
         if not self.can_place_word(grid, word, start_row, start_col, direction):
             return False
         
-        for i, letter in enumerate(word):
-            if direction == Direction.HORIZONTAL:
-                row, col = start_row, start_col + i
-            else:
-                row, col = start_row + i, start_col
-            grid[row][col] = letter
+        start = start_row * grid.width + start_col
+        step = 1 if direction == Direction.HORIZONTAL else grid.width
+        checks = self.cross_checks
+        if checks is not None and checks.grid is grid:
+            # Crossing cells already held this letter, so only new letters change constraints
+            newly_filled = [idx for idx in range(start, start + len(word) * step, step)
+                            if grid.cells[idx] == EMPTY_CELL]
+        grid.cells[start:start + len(word) * step:step] = word.encode('latin-1')
+        
+        if checks is not None and checks.grid is grid:
+            checks.refresh(newly_filled)
         
         return True
     
-    def generate_crossword(self) -> CrosswordGrid:
-        """Main algorithm to generate crossword puzzle"""
-        grid = [[None for _ in range(self.grid_size)] for _ in range(self.grid_size)]
+    def generate_crossword(self, should_stop: Optional[Callable[[], bool]] = None) -> CrosswordGrid:
+        """Main algorithm to generate crossword puzzle.
+        should_stop is polled before each word; once it returns True the rest stay unplaced."""
+        stats = self._start_stats()
+        phase_start = time.perf_counter() if stats is not None else 0.0
+        grid = LetterGrid(self.grid_size, self.grid_size)
+        self._attach_cross_checks(grid)
         word_placements = []
         
         # Place first word in center horizontally
@@ -94,59 +507,636 @@ class CrosswordGenerator:
                 direction=Direction.HORIZONTAL
             ))
         
+        unplaced_words = [] if word_placements else [first_word]
+        if stats is not None:
+            phase_start = self._record_phase(stats, "first_word", phase_start)
+        
+        def try_place(word: str, row: int, col: int, direction: Direction) -> bool:
+            return (self.can_place_word(grid, word, row, col, direction, word_placements) and
+                    self.place_word(grid, word, row, col, direction))
+        
         # Try to place remaining words
-        for word in self.words[1:]:
+        unplaced_words += self._place_remaining_words(self.words[1:], word_placements, try_place, should_stop)
+        if stats is not None:
+            self._record_phase(stats, "placement", phase_start)
+        
+        return self._finish_stats(CrosswordGrid(
+            grid=grid,
+            width=self.grid_size,
+            height=self.grid_size,
+            word_placements=word_placements,
+            unplaced_words=unplaced_words
+        ))
+    
+    def generate_crossword_sparse(self, max_width: Optional[int] = None,
+                                  max_height: Optional[int] = None) -> CrosswordGrid:
+        """Greedy pass on an unbounded canvas, cropped to the used rectangle.
+        
+        Words are only rejected by the crossword rules and, when given, by max_width and
+        max_height limits on the bounding box, never by an arbitrary grid frame. The
+        returned grid and placements are shifted so the top-left used cell is (0, 0)."""
+        stats = self._start_stats()
+        phase_start = time.perf_counter() if stats is not None else 0.0
+        canvas = SparseCanvas()
+        word_placements: List[WordPlacement] = []
+        
+        first_word = self.words[0]
+        if self._canvas_fits(canvas, first_word, 0, 0, Direction.HORIZONTAL, max_width, max_height):
+            self._place_on_canvas(canvas, first_word, 0, 0, Direction.HORIZONTAL)
+            word_placements.append(WordPlacement(
+                word=first_word,
+                start_row=0,
+                start_col=0,
+                direction=Direction.HORIZONTAL
+            ))
+        unplaced_words = [] if word_placements else [first_word]
+        if stats is not None:
+            phase_start = self._record_phase(stats, "first_word", phase_start)
+        
+        def try_place(word: str, row: int, col: int, direction: Direction) -> bool:
+            if not self._canvas_fits(canvas, word, row, col, direction, max_width, max_height):
+                if stats is not None:
+                    stats.rejections[REJECT_BOUNDS] += 1
+                return False
+            if not self._can_place_on_canvas(canvas, word, row, col, direction):
+                return False
+            self._place_on_canvas(canvas, word, row, col, direction)
+            return True
+        
+        unplaced_words += self._place_remaining_words(self.words[1:], word_placements, try_place)
+        if stats is not None:
+            phase_start = self._record_phase(stats, "placement", phase_start)
+        
+        # Crop: shift everything so the bounding box starts at the origin
+        grid = canvas.crop()
+        for placement in word_placements:
+            placement.start_row -= canvas.min_row
+            placement.start_col -= canvas.min_col
+        if stats is not None:
+            self._record_phase(stats, "crop", phase_start)
+        
+        return self._finish_stats(CrosswordGrid(
+            grid=grid,
+            width=grid.width,
+            height=grid.height,
+            word_placements=word_placements,
+            unplaced_words=unplaced_words
+        ))
+    
+    def _place_remaining_words(self, words: List[str], word_placements: List[WordPlacement],
+                               try_place: Callable[[str, int, int, Direction], bool],
+                               should_stop: Optional[Callable[[], bool]] = None) -> List[str]:
+        """Greedy pass shared by the fixed grid and the sparse canvas.
+        Each word goes at the first anchor try_place accepts; returns the words that fit nowhere
+        (and, once should_stop returns True, every word not yet tried)."""
+        # Live index of letter -> (placement index, offset) for every letter on the grid
+        letter_index: Dict[str, List[Tuple[int, int]]] = {}
+        for placement_idx, placement in enumerate(word_placements):
+            self._index_placement(letter_index, placement_idx, placement.word)
+        
+        stats = self.stats
+        unplaced_words = []
+        for position, word in enumerate(words):
+            if should_stop is not None and should_stop():
+                unplaced_words.extend(words[position:])
+                break
             placed = False
-            
-            # Try to intersect with existing words
-            for placed_word in word_placements:
-                intersections = self.find_intersections(word, placed_word.word)
+            for placement_idx, word_idx, placed_idx in self._candidate_anchors(word, letter_index):
+                if stats is not None:
+                    stats.anchors_tried += 1
+                new_start_row, new_start_col, new_direction = self._anchor_position(
+                    word_placements[placement_idx], word_idx, placed_idx
+                )
                 
-                for word_idx, placed_idx in intersections:
-                    # Calculate position for intersection
-                    if placed_word.direction == Direction.HORIZONTAL:
-                        # Place new word vertically
-                        new_start_row = placed_word.start_row - word_idx
-                        new_start_col = placed_word.start_col + placed_idx
-                        new_direction = Direction.VERTICAL
-                    else:
-                        # Place new word horizontally
-                        new_start_row = placed_word.start_row + placed_idx
-                        new_start_col = placed_word.start_col - word_idx
-                        new_direction = Direction.HORIZONTAL
-                    
-                    if self.can_place_word(grid, word, new_start_row, new_start_col, new_direction, word_placements):
-                        if self.place_word(grid, word, new_start_row, new_start_col, new_direction):
-                            word_placements.append(WordPlacement(
-                                word=word,
-                                start_row=new_start_row,
-                                start_col=new_start_col,
-                                direction=new_direction
-                            ))
-                            placed = True
-                            break
-                
-                if placed:
+                if try_place(word, new_start_row, new_start_col, new_direction):
+                    word_placements.append(WordPlacement(
+                        word=word,
+                        start_row=new_start_row,
+                        start_col=new_start_col,
+                        direction=new_direction
+                    ))
+                    self._index_placement(letter_index, len(word_placements) - 1, word)
+                    placed = True
                     break
             
             # Skip words that can't be connected (removed random fallback)
             # All words must be connected to maintain crossword integrity
+            if not placed:
+                unplaced_words.append(word)
         
-        return CrosswordGrid(
-            grid=grid,
+        return unplaced_words
+    
+    def _canvas_fits(self, canvas: SparseCanvas, word: str, start_row: int, start_col: int,
+                     direction: Direction, max_width: Optional[int], max_height: Optional[int]) -> bool:
+        """Whether the canvas bounding box stays within the optional limits after placing word"""
+        if max_width is None and max_height is None:
+            return True
+        if direction == Direction.HORIZONTAL:
+            end_row, end_col = start_row, start_col + len(word) - 1
+        else:
+            end_row, end_col = start_row + len(word) - 1, start_col
+        width, height = canvas.size_with(start_row, start_col, end_row, end_col)
+        return ((max_width is None or width <= max_width) and
+                (max_height is None or height <= max_height))
+    
+    def _can_place_on_canvas(self, canvas: SparseCanvas, word: str, start_row: int,
+                             start_col: int, direction: Direction) -> bool:
+        """Same rules as can_place_word (conflicts, perpendicular words, merges and
+        connectivity) on a canvas without edges"""
+        cells = canvas.cells
+        if not cells:
+            return True
+        d_row, d_col = (0, 1) if direction == Direction.HORIZONTAL else (1, 0)
+        
+        reason = None
+        connected = False
+        for i, letter in enumerate(word):
+            existing = cells.get((start_row + d_row * i, start_col + d_col * i))
+            if existing is not None:
+                if existing != letter:
+                    reason = REJECT_CONFLICT
+                    break
+                connected = True
+        if reason is None:
+            reason = self._canvas_run_rejection(canvas, word, start_row, start_col, direction)
+        if reason is None and not connected:
+            # Ensure connectivity (word must intersect with existing words)
+            reason = REJECT_NOT_CONNECTED
+        
+        if reason is not None:
+            if self.stats is not None:
+                self.stats.rejections[reason] += 1
+            return False
+        return True
+    
+    def _canvas_run_rejection(self, canvas: SparseCanvas, word: str, start_row: int,
+                              start_col: int, direction: Direction) -> Optional[str]:
+        """Perpendicular-word and boundary checks on the canvas, in the slow path's order"""
+        cells = canvas.cells
+        d_row, d_col = (0, 1) if direction == Direction.HORIZONTAL else (1, 0)
+        for i, letter in enumerate(word):
+            row, col = start_row + d_row * i, start_col + d_col * i
+            
+            # Perpendicular run through this cell, reading the word as an overlay
+            before = []
+            r, c = row - d_col, col - d_row
+            while (r, c) in cells:
+                before.append(cells[(r, c)])
+                r, c = r - d_col, c - d_row
+            after = []
+            r, c = row + d_col, col + d_row
+            while (r, c) in cells:
+                after.append(cells[(r, c)])
+                r, c = r + d_col, c + d_row
+            if before or after:
+                run = ''.join(reversed(before)) + letter + ''.join(after)
+                if run not in self.word_set:
+                    return REJECT_UNINTENDED_WORD
+        
+        # Check for word boundary violations (merging words)
+        if (start_row - d_row, start_col - d_col) in cells:
+            return REJECT_BOUNDARY_MERGE
+        if (start_row + d_row * len(word), start_col + d_col * len(word)) in cells:
+            return REJECT_BOUNDARY_MERGE
+        return None
+    
+    def _place_on_canvas(self, canvas: SparseCanvas, word: str, start_row: int,
+                         start_col: int, direction: Direction) -> None:
+        d_row, d_col = (0, 1) if direction == Direction.HORIZONTAL else (1, 0)
+        for i, letter in enumerate(word):
+            canvas.set(start_row + d_row * i, start_col + d_col * i, letter)
+    
+    def generate_crossword_backtracking(self, node_budget: int = DEFAULT_NODE_BUDGET) -> CrosswordGrid:
+        """Depth-first search that revisits earlier anchors when a later word gets stuck.
+        
+        Every remaining word/anchor pair is a branch, tried in the same order the greedy
+        pass uses, so the first descent is at least as good as generate_crossword. A
+        transposition table keyed by a Zobrist hash of the grid and placed-word set
+        skips layouts already explored through a different placement order. Stops when
+        every word is placed or node_budget nodes have been expanded, returning the
+        layout with the most words placed."""
+        stats = self._start_stats()
+        phase_start = time.perf_counter() if stats is not None else 0.0
+        grid = LetterGrid(self.grid_size, self.grid_size)
+        self._attach_cross_checks(grid)
+        word_placements: List[WordPlacement] = []
+        letter_index: Dict[str, List[Tuple[int, int]]] = {}
+        placed_flags = [False] * len(self.words)
+        
+        # Place first word in center horizontally, same as the greedy pass
+        first_word = self.words[0]
+        start_row = self.grid_size // 2
+        start_col = (self.grid_size - len(first_word)) // 2
+        if not self.place_word(grid, first_word, start_row, start_col, Direction.HORIZONTAL):
+            return self._finish_stats(CrosswordGrid(grid=grid, width=self.grid_size, height=self.grid_size,
+                                                    word_placements=[], unplaced_words=list(self.words),
+                                                    search_nodes=1))
+        word_placements.append(WordPlacement(
+            word=first_word,
+            start_row=start_row,
+            start_col=start_col,
+            direction=Direction.HORIZONTAL
+        ))
+        self._index_placement(letter_index, 0, first_word)
+        placed_flags[0] = True
+        if stats is not None:
+            phase_start = self._record_phase(stats, "first_word", phase_start)
+        
+        cell_keys, word_keys = self._zobrist_keys()
+        state_hash = word_keys[0]
+        for idx, cell in enumerate(grid.cells):
+            if cell != EMPTY_CELL:
+                state_hash ^= cell_keys[cell][idx]
+        seen = {state_hash}
+        
+        nodes = 1
+        best_placements = list(word_placements)
+        best_grid = grid.copy()
+        
+        # Explicit stacks keep deep searches on large word lists clear of the recursion limit
+        moves_stack = [self._backtracking_moves(grid, word_placements, letter_index, placed_flags)]
+        undo_stack: List[Tuple[int, List[int], int]] = []
+        
+        while moves_stack and len(word_placements) < len(self.words) and nodes < node_budget:
+            move = next(moves_stack[-1], None)
+            if move is None:
+                # Dead end: every branch from this layout is exhausted, undo the last placement
+                moves_stack.pop()
+                if undo_stack:
+                    state_hash = self._undo_backtracking_placement(
+                        grid, word_placements, letter_index, placed_flags, undo_stack.pop()
+                    )
+                continue
+            
+            word_idx, row, col, direction = move
+            word = self.words[word_idx]
+            start = row * grid.width + col
+            step = 1 if direction == Direction.HORIZONTAL else grid.width
+            filled = []
+            new_hash = state_hash ^ word_keys[word_idx]
+            for i, code in enumerate(word.encode('latin-1')):
+                idx = start + i * step
+                if grid.cells[idx] == EMPTY_CELL:
+                    filled.append(idx)
+                    new_hash ^= cell_keys[code][idx]
+            if new_hash in seen:
+                continue
+            seen.add(new_hash)
+            nodes += 1
+            
+            self.place_word(grid, word, row, col, direction)
+            word_placements.append(WordPlacement(word=word, start_row=row, start_col=col, direction=direction))
+            self._index_placement(letter_index, len(word_placements) - 1, word)
+            placed_flags[word_idx] = True
+            undo_stack.append((word_idx, filled, state_hash))
+            state_hash = new_hash
+            
+            if len(word_placements) > len(best_placements):
+                best_placements = list(word_placements)
+                best_grid = grid.copy()
+            
+            moves_stack.append(self._backtracking_moves(grid, word_placements, letter_index, placed_flags))
+        
+        if stats is not None:
+            self._record_phase(stats, "search", phase_start)
+        
+        return self._finish_stats(CrosswordGrid(
+            grid=best_grid,
             width=self.grid_size,
             height=self.grid_size,
-            word_placements=word_placements
-        )
+            word_placements=best_placements,
+            unplaced_words=self._unplaced_in_input_order(best_placements),
+            search_nodes=nodes
+        ))
+    
+    def _backtracking_moves(self, grid: LetterGrid, word_placements: List[WordPlacement],
+                            letter_index: Dict[str, List[Tuple[int, int]]],
+                            placed_flags: List[bool]) -> Iterator[Tuple[int, int, int, Direction]]:
+        """Lazily yield valid (word_idx, row, col, direction) moves from the current layout.
+        The caller restores the layout before resuming, so the generator always sees the
+        state it was created for."""
+        stats = self.stats
+        for word_idx, word in enumerate(self.words):
+            if placed_flags[word_idx]:
+                continue
+            tried: Set[Tuple[int, int, Direction]] = set()
+            for placement_idx, anchor_word_idx, placed_idx in self._candidate_anchors(word, letter_index):
+                if stats is not None:
+                    stats.anchors_tried += 1
+                position = self._anchor_position(word_placements[placement_idx], anchor_word_idx, placed_idx)
+                if position in tried:
+                    continue
+                tried.add(position)
+                row, col, direction = position
+                if self.can_place_word(grid, word, row, col, direction, word_placements):
+                    yield word_idx, row, col, direction
+    
+    def _undo_backtracking_placement(self, grid: LetterGrid, word_placements: List[WordPlacement],
+                                     letter_index: Dict[str, List[Tuple[int, int]]],
+                                     placed_flags: List[bool], undo: Tuple[int, List[int], int]) -> int:
+        """Remove the most recent placement and return the restored state hash"""
+        word_idx, filled, previous_hash = undo
+        placement = word_placements.pop()
+        self._unindex_placement(letter_index, placement.word)
+        placed_flags[word_idx] = False
+        for idx in filled:
+            grid.cells[idx] = EMPTY_CELL
+        checks = self.cross_checks
+        if checks is not None and checks.grid is grid:
+            checks.refresh(filled)
+        return previous_hash
+    
+    def generate_crossword_annealed(self, time_budget_ms: int = DEFAULT_TIME_BUDGET_MS,
+                                    seed: int = 0) -> CrosswordGrid:
+        """Greedy layout improved by simulated annealing until time_budget_ms milliseconds
+        after the call, the greedy pass included; the greedy pass itself always completes.
+        
+        Each move lifts a random word off the grid (when the rest stays a valid, connected
+        layout), then puts the lifted and unplaced words back at random anchors where they
+        fit. Layouts are scored by _layout_energy: placed words, crossings per word and
+        bounding-box area. Worse layouts are accepted with a probability that shrinks as
+        the budget runs out. Returns the best layout seen, which never has fewer words than
+        the greedy one; search_nodes counts the moves made. Stops before the deadline when
+        ANNEAL_MAX_IDLE_MOVES attempts in a row find no move. Runs are repeatable for a seed
+        only up to how many moves fit in the budget."""
+        started = time.perf_counter()
+        budget = time_budget_ms / 1000
+        deadline = started + budget
+        crossword = self.generate_crossword()
+        stats = self.stats
+        phase_start = time.perf_counter()
+        grid = crossword.grid
+        placements = list(crossword.word_placements)
+        unplaced = list(crossword.unplaced_words)
+        if not placements:
+            return crossword
+        
+        # Words covering each cell, so lifting a word only clears the cells it owns
+        cover = bytearray(len(grid.cells))
+        for placement in placements:
+            for idx in self._placement_cells(grid, placement):
+                cover[idx] += 1
+        
+        rng = random.Random(seed)
+        energy = self._layout_energy(grid, placements)
+        best_key = (len(placements), energy)
+        best_placements, best_grid = list(placements), grid.copy()
+        moves = 0
+        idle = 0
+        checks = self.cross_checks
+        while idle < ANNEAL_MAX_IDLE_MOVES:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            saved = self._anneal_move(grid, placements, unplaced, cover, rng)
+            if saved is None:
+                idle += 1
+                continue
+            idle = 0
+            moves += 1
+
+            new_energy = self._layout_energy(grid, placements)
+            progress = min(1.0, (now - started) / budget)
+            temperature = ANNEAL_START_TEMPERATURE * (ANNEAL_END_TEMPERATURE / ANNEAL_START_TEMPERATURE) ** progress
+            if new_energy >= energy or rng.random() < math.exp((new_energy - energy) / temperature):
+                energy = new_energy
+                key = (len(placements), energy)
+                if key > best_key:
+                    best_key = key
+                    best_placements, best_grid = list(placements), grid.copy()
+                continue
+
+            # Rejected: restore the saved layout and refresh the masks of the cells that changed
+            changed = [idx for idx, (old, new) in enumerate(zip(saved[0], grid.cells)) if old != new]
+            grid.cells[:] = saved[0]
+            placements[:] = saved[1]
+            unplaced[:] = saved[2]
+            cover[:] = saved[3]
+            if checks is not None and checks.grid is grid:
+                checks.refresh(changed)
+        
+        if stats is not None:
+            self._record_phase(stats, "search", phase_start)
+        return self._finish_stats(CrosswordGrid(
+            grid=best_grid,
+            width=self.grid_size,
+            height=self.grid_size,
+            word_placements=best_placements,
+            unplaced_words=self._unplaced_in_input_order(best_placements),
+            search_nodes=moves
+        ))
+    
+    def _anneal_move(self, grid: LetterGrid, placements: List[WordPlacement], unplaced: List[str],
+                     cover: bytearray, rng: random.Random) -> Optional[Tuple[bytes, list, list, bytes]]:
+        """Lift one random word, then try to fit every unplaced word (the lifted one
+        included) at a random anchor. Returns the layout as it was before the move (cells,
+        placements, unplaced, cover) to undo it with, or None, with nothing changed, if no
+        word moved. The copy is only taken once the move is sure to change something."""
+        saved = None
+        if len(placements) > 1:
+            index = rng.randrange(len(placements))
+            if self._can_lift(grid, placements, index, cover):
+                saved = (bytes(grid.cells), list(placements), list(unplaced), bytes(cover))
+                lifted = placements.pop(index)
+                cleared = []
+                for idx in self._placement_cells(grid, lifted):
+                    cover[idx] -= 1
+                    if not cover[idx]:
+                        grid.cells[idx] = EMPTY_CELL
+                        cleared.append(idx)
+                checks = self.cross_checks
+                if checks is not None and checks.grid is grid:
+                    checks.refresh(cleared)
+                unplaced.append(lifted.word)
+        
+        order = list(unplaced)
+        rng.shuffle(order)
+        for word in order:
+            position = self._random_fit(grid, word, placements, rng)
+            if position is None:
+                continue
+            if saved is None:
+                saved = (bytes(grid.cells), list(placements), list(unplaced), bytes(cover))
+            row, col, direction = position
+            self.place_word(grid, word, row, col, direction)
+            placement = WordPlacement(word=word, start_row=row, start_col=col, direction=direction)
+            for idx in self._placement_cells(grid, placement):
+                cover[idx] += 1
+            placements.append(placement)
+            unplaced.remove(word)
+        return saved
+    
+    def _random_fit(self, grid: LetterGrid, word: str, placements: List[WordPlacement],
+                    rng: random.Random) -> Optional[Tuple[int, int, Direction]]:
+        """A random anchor where word can be placed, or None. Placements and their anchors
+        are visited in shuffled order, stopping at the first fit."""
+        positions = self.letter_positions.get(word) or self._build_letter_positions(word)
+        order = list(range(len(placements)))
+        rng.shuffle(order)
+        for placement_idx in order:
+            placement = placements[placement_idx]
+            anchors = [(word_idx, placed_idx) for placed_idx, letter in enumerate(placement.word)
+                       for word_idx in positions.get(letter, ())]
+            rng.shuffle(anchors)
+            for word_idx, placed_idx in anchors:
+                if self.stats is not None:
+                    self.stats.anchors_tried += 1
+                row, col, direction = self._anchor_position(placement, word_idx, placed_idx)
+                if self.can_place_word(grid, word, row, col, direction, placements):
+                    return row, col, direction
+        return None
+    
+    def _can_lift(self, grid: LetterGrid, placements: List[WordPlacement], index: int, cover: bytearray) -> bool:
+        """Whether removing placements[index] leaves a valid layout: no letter run it shares
+        with other words is cut short, and the remaining words stay connected"""
+        lifted = placements[index]
+        cells = grid.cells
+        width = grid.width
+        horizontal = lifted.direction == Direction.HORIZONTAL
+        shared_before = False
+        for idx in self._placement_cells(grid, lifted):
+            shared = cover[idx] > 1
+            if shared and shared_before:
+                return False  # Two crossings side by side would be left as a stray run
+            if not shared:
+                # A filled perpendicular neighbour of a cell only this word covers means a
+                # run through that cell which clearing it would cut
+                row, col = divmod(idx, width)
+                if horizontal:
+                    neighbours = (idx - width if row > 0 else None, idx + width if row < grid.height - 1 else None)
+                else:
+                    neighbours = (idx - 1 if col > 0 else None, idx + 1 if col < width - 1 else None)
+                if any(neighbour is not None and cells[neighbour] != EMPTY_CELL for neighbour in neighbours):
+                    return False
+            shared_before = shared
+        
+        remaining = placements[:index] + placements[index + 1:]
+        covered = [set(self._placement_cells(grid, placement)) for placement in remaining]
+        reached = {0}
+        frontier = [0]
+        while frontier:
+            current = frontier.pop()
+            for other in range(len(remaining)):
+                if other not in reached and covered[current] & covered[other]:
+                    reached.add(other)
+                    frontier.append(other)
+        return len(reached) == len(remaining)
+    
+    def _layout_energy(self, grid: LetterGrid, placements: List[WordPlacement]) -> float:
+        """Annealing score, higher is better: placed words, crossings per word, bounding-box area"""
+        if not placements:
+            return 0.0
+        filled = len(grid.cells) - grid.cells.count(EMPTY_CELL)
+        crossings = sum(len(placement.word) for placement in placements) - filled
+        min_row = min(p.start_row for p in placements)
+        min_col = min(p.start_col for p in placements)
+        max_row = max(p.start_row + (len(p.word) - 1 if p.direction == Direction.VERTICAL else 0) for p in placements)
+        max_col = max(p.start_col + (len(p.word) - 1 if p.direction == Direction.HORIZONTAL else 0) for p in placements)
+        area = (max_row - min_row + 1) * (max_col - min_col + 1)
+        return (ANNEAL_PLACED_WEIGHT * len(placements) +
+                ANNEAL_CROSSING_WEIGHT * crossings / len(placements) -
+                ANNEAL_AREA_WEIGHT * area / (self.grid_size * self.grid_size))
+    
+    @staticmethod
+    def _placement_cells(grid: LetterGrid, placement: WordPlacement) -> range:
+        """Cell indices covered by a placement"""
+        start = placement.start_row * grid.width + placement.start_col
+        step = 1 if placement.direction == Direction.HORIZONTAL else grid.width
+        return range(start, start + len(placement.word) * step, step)
+    
+    def _unplaced_in_input_order(self, placements: List[WordPlacement]) -> List[str]:
+        """Input words missing from placements; duplicates are matched off one placement at a time"""
+        remaining = [p.word for p in placements]
+        unplaced_words = []
+        for word in self.words:
+            if word in remaining:
+                remaining.remove(word)
+            else:
+                unplaced_words.append(word)
+        return unplaced_words
+    
+    def _start_stats(self) -> Optional[GenerationStats]:
+        """Fresh stats for a generate_* call, or None when collection is off"""
+        self.stats = GenerationStats() if self.collect_stats else None
+        return self.stats
+    
+    @staticmethod
+    def _record_phase(stats: GenerationStats, phase: str, phase_start: float) -> float:
+        """Add the time since phase_start to phase and return the start of the next phase"""
+        now = time.perf_counter()
+        stats.add_phase_time(phase, now - phase_start)
+        return now
+    
+    def _finish_stats(self, crossword: CrosswordGrid) -> CrosswordGrid:
+        stats = self.stats
+        if stats is not None:
+            stats.words_placed = len(crossword.word_placements)
+            stats.words_dropped = len(crossword.unplaced_words)
+            crossword.stats = stats
+        return crossword
+    
+    def _attach_cross_checks(self, grid: LetterGrid) -> None:
+        """Start tracking cross-check masks for grid, which place_word keeps up to date"""
+        self.cross_checks = CrossChecks(grid, self.word_set, self._run_masks) if self.use_cross_checks else None
+    
+    def _zobrist_keys(self) -> Tuple[Dict[int, List[int]], List[int]]:
+        """Random 64-bit keys per (letter, cell) and per word index for hashing search states.
+        Seeded so a given word list always explores in the same order."""
+        rng = random.Random(0x5EED)
+        cells = self.grid_size * self.grid_size
+        cell_keys = {
+            code: [rng.getrandbits(64) for _ in range(cells)]
+            for code in sorted(set(''.join(self.words).encode('latin-1')))
+        }
+        word_keys = [rng.getrandbits(64) for _ in self.words]
+        return cell_keys, word_keys
+    
+    def _index_placement(self, letter_index: Dict[str, List[Tuple[int, int]]],
+                         placement_idx: int, word: str) -> None:
+        """Add the letters of a newly placed word to the live letter index"""
+        positions = self.letter_positions.get(word) or self._build_letter_positions(word)
+        for letter, offsets in positions.items():
+            entries = letter_index.setdefault(letter, [])
+            for offset in offsets:
+                entries.append((placement_idx, offset))
+    
+    def _unindex_placement(self, letter_index: Dict[str, List[Tuple[int, int]]], word: str) -> None:
+        """Drop the entries added by the most recent _index_placement call for word"""
+        positions = self.letter_positions.get(word) or self._build_letter_positions(word)
+        for letter, offsets in positions.items():
+            del letter_index[letter][-len(offsets):]
+    
+    def _candidate_anchors(self, word: str,
+                           letter_index: Dict[str, List[Tuple[int, int]]]) -> List[Tuple[int, int, int]]:
+        """Return (placement_idx, word_idx, placed_idx) anchors for word.
+        Sorted so the order matches scanning placements in order with find_intersections."""
+        positions = self.letter_positions.get(word) or self._build_letter_positions(word)
+        anchors = []
+        for letter, word_offsets in positions.items():
+            for placement_idx, placed_idx in letter_index.get(letter, ()):
+                for word_idx in word_offsets:
+                    anchors.append((placement_idx, word_idx, placed_idx))
+        anchors.sort()
+        return anchors
+    
+    def _anchor_position(self, placed_word: WordPlacement, word_idx: int,
+                         placed_idx: int) -> Tuple[int, int, Direction]:
+        """Start position and direction for a word crossing placed_word at the given offsets"""
+        if placed_word.direction == Direction.HORIZONTAL:
+            # Place new word vertically
+            return (placed_word.start_row - word_idx,
+                    placed_word.start_col + placed_idx,
+                    Direction.VERTICAL)
+        # Place new word horizontally
+        return (placed_word.start_row + placed_idx,
+                placed_word.start_col - word_idx,
+                Direction.HORIZONTAL)
     
     def print_grid(self, grid: CrosswordGrid) -> str:
         """Return string representation of grid for debugging"""
         output = []
-        for row in grid.grid:
-            row_str = ""
-            for cell in row:
-                row_str += f" {cell or '.'} "
-            output.append(row_str)
+        for row in grid.grid.rows():
+            output.append("".join(f" {cell} " for cell in row))
         return "\n".join(output)
     
     def create_visual_test_output(self) -> str:
@@ -158,11 +1148,8 @@ class CrosswordGenerator:
         
         # Show the grid
         output.append("Generated Grid:")
-        for i, row in enumerate(crossword.grid):
-            row_str = f"{i:2d} "
-            for cell in row:
-                row_str += f" {cell or '.'} "
-            output.append(row_str)
+        for i, row in enumerate(crossword.grid.rows()):
+            output.append(f"{i:2d} " + "".join(f" {cell} " for cell in row))
         
         output.append(f"\nColumn numbers: {' '.join(f'{i:2d}' for i in range(crossword.width))}")
         
@@ -210,134 +1197,108 @@ class CrosswordGenerator:
         
         return intersections
     
-    def _extract_perpendicular_words(self, grid: List[List[Optional[str]]], 
+    def _perpendicular_run(self, grid: LetterGrid, word: str,
+                           start_row: int, start_col: int, direction: Direction,
+                           i: int) -> Optional[str]:
+        """Return the perpendicular word through letter i of the proposed word, if any.
+        The proposed word is read as an overlay, so the grid is never copied or modified."""
+        cells = grid.cells
+        width = grid.width
+        letter = word[i]
+        if direction == Direction.HORIZONTAL:
+            # Only (start_row, col) in this column belongs to the proposed word
+            col = start_col + i
+            center = start_row * width + col
+            above = center
+            while above >= width and cells[above - width] != EMPTY_CELL:
+                above -= width
+            below = center
+            last_row = (self.grid_size - 1) * width
+            while below < last_row and cells[below + width] != EMPTY_CELL:
+                below += width
+            if above == below:
+                return None
+            return (cells[above:center:width].decode('latin-1') + letter +
+                    cells[center + width:below + width:width].decode('latin-1'))
+        
+        # VERTICAL placement: only (row, start_col) in this row belongs to the proposed word
+        row_start = (start_row + i) * width
+        center = row_start + start_col
+        left = center
+        while left > row_start and cells[left - 1] != EMPTY_CELL:
+            left -= 1
+        right = center
+        row_end = row_start + self.grid_size - 1
+        while right < row_end and cells[right + 1] != EMPTY_CELL:
+            right += 1
+        if left == right:
+            return None
+        return cells[left:center].decode('latin-1') + letter + cells[center + 1:right + 1].decode('latin-1')
+    
+    def _extract_perpendicular_words(self, grid: LetterGrid, 
                                    word: str, start_row: int, start_col: int, 
                                    direction: Direction) -> List[str]:
         """Extract all words that would be formed perpendicular to the placed word"""
         perpendicular_words = []
-        
-        # Create a test grid with the word placed
-        test_grid = [row[:] for row in grid]  # Deep copy
-        for i in range(len(word)):
-            if direction == Direction.HORIZONTAL:
-                test_grid[start_row][start_col + i] = word[i]
-            else:
-                test_grid[start_row + i][start_col] = word[i]
-        
-        # Check each letter position for perpendicular word formation
         for i in range(len(word)):
-            if direction == Direction.HORIZONTAL:
-                # Check vertical words at each column
-                col = start_col + i
-                
-                # Find start of any vertical word containing this position
-                word_start_row = start_row
-                while (word_start_row > 0 and 
-                       test_grid[word_start_row - 1][col] is not None):
-                    word_start_row -= 1
-                
-                # Find end of vertical word
-                word_end_row = start_row
-                while (word_end_row < self.grid_size - 1 and 
-                       test_grid[word_end_row + 1][col] is not None):
-                    word_end_row += 1
-                
-                # Build the vertical word if it's longer than 1 character
-                if word_end_row > word_start_row:
-                    vertical_word = ""
-                    for row in range(word_start_row, word_end_row + 1):
-                        vertical_word += test_grid[row][col]
-                    
-                    if len(vertical_word) > 1:
-                        perpendicular_words.append(vertical_word)
-            
-            else:  # VERTICAL placement
-                # Check horizontal words at each row
-                row = start_row + i
-                
-                # Find start of any horizontal word containing this position
-                word_start_col = start_col
-                while (word_start_col > 0 and 
-                       test_grid[row][word_start_col - 1] is not None):
-                    word_start_col -= 1
-                
-                # Find end of horizontal word
-                word_end_col = start_col
-                while (word_end_col < self.grid_size - 1 and 
-                       test_grid[row][word_end_col + 1] is not None):
-                    word_end_col += 1
-                
-                # Build the horizontal word if it's longer than 1 character
-                if word_end_col > word_start_col:
-                    horizontal_word = ""
-                    for col in range(word_start_col, word_end_col + 1):
-                        horizontal_word += test_grid[row][col]
-                    
-                    if len(horizontal_word) > 1:
-                        perpendicular_words.append(horizontal_word)
-        
+            perp_word = self._perpendicular_run(grid, word, start_row, start_col, direction, i)
+            if perp_word is not None:
+                perpendicular_words.append(perp_word)
         return perpendicular_words
     
-    def _is_valid_perpendicular_placement(self, grid: List[List[Optional[str]]], 
+    def _first_unintended_word(self, grid: LetterGrid,
+                               word: str, start_row: int, start_col: int,
+                               direction: Direction) -> Optional[str]:
+        """Return the first perpendicular word that is not an intended word, or None"""
+        word_set = self.word_set
+        for i in range(len(word)):
+            perp_word = self._perpendicular_run(grid, word, start_row, start_col, direction, i)
+            if perp_word is not None and perp_word not in word_set:
+                return perp_word
+        return None
+    
+    def _is_valid_perpendicular_placement(self, grid: LetterGrid, 
                                         word: str, start_row: int, start_col: int, 
                                         direction: Direction) -> bool:
         """Check if placing word creates valid perpendicular words"""
-        perpendicular_words = self._extract_perpendicular_words(grid, word, start_row, start_col, direction)
-        
-        # Remove duplicates
-        unique_perpendicular_words = list(set(perpendicular_words))
-        
-        unintended_words = []
-        for perp_word in unique_perpendicular_words:
-            if perp_word not in self.words:
-                unintended_words.append(perp_word)
-        
-        # Debug output for testing
-        if unintended_words:
-            print(f"Placing '{word}' would create unintended words: {unintended_words}")
-        
         # For now, require ALL perpendicular words to be valid (strict mode)
-        return len(unintended_words) == 0
+        return self._first_unintended_word(grid, word, start_row, start_col, direction) is None
     
-    def _is_connected_to_existing(self, grid: List[List[Optional[str]]], 
+    def _is_connected_to_existing(self, grid: LetterGrid, 
                                 word: str, start_row: int, start_col: int, 
                                 direction: Direction) -> bool:
         """Check if word connects to existing letters on the grid"""
-        for i in range(len(word)):
-            if direction == Direction.HORIZONTAL:
-                row, col = start_row, start_col + i
-            else:
-                row, col = start_row + i, start_col
-            
-            # If any position already has a letter, we're connecting
-            if grid[row][col] is not None:
-                return True
-        
-        return False
+        start = start_row * grid.width + start_col
+        step = 1 if direction == Direction.HORIZONTAL else grid.width
+        # If any position already has a letter, we're connecting
+        return any(grid.cells[start:start + len(word) * step:step])
     
-    def _check_word_boundaries(self, grid: List[List[Optional[str]]], 
+    def _check_word_boundaries(self, grid: LetterGrid, 
                              word: str, start_row: int, start_col: int, 
                              direction: Direction) -> bool:
         """Check that placing word doesn't merge with adjacent words"""
+        cells = grid.cells
+        width = grid.width
+        start = start_row * width + start_col
         
         if direction == Direction.HORIZONTAL:
             # Check before the word starts
-            if start_col > 0 and grid[start_row][start_col - 1] is not None:
+            if start_col > 0 and cells[start - 1] != EMPTY_CELL:
                 return False
             
             # Check after the word ends
             end_col = start_col + len(word) - 1
-            if end_col < self.grid_size - 1 and grid[start_row][end_col + 1] is not None:
+            if end_col < self.grid_size - 1 and cells[start + len(word)] != EMPTY_CELL:
                 return False
                 
         else:  # VERTICAL
             # Check before the word starts
-            if start_row > 0 and grid[start_row - 1][start_col] is not None:
+            if start_row > 0 and cells[start - width] != EMPTY_CELL:
                 return False
             
             # Check after the word ends
             end_row = start_row + len(word) - 1
-            if end_row < self.grid_size - 1 and grid[end_row + 1][start_col] is not None:
+            if end_row < self.grid_size - 1 and cells[start + len(word) * width] != EMPTY_CELL:
                 return False
         
-        return True
\ No newline at end of file
+        return True
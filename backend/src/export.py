@@ -0,0 +1,68 @@
+import asyncio
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Iterable, Optional, TypeVar
+
+from src.generation import number_placements
+from src.models import CrosswordGrid, Direction
+
+T = TypeVar("T")
+
+IPUZ_VERSION = "http://ipuz.org/v2"
+IPUZ_KIND = "http://ipuz.org/crossword#1"
+IPUZ_BLOCK = "#"
+IPUZ_EMPTY = 0
+DEFAULT_EXPORT_WINDOW = 8
+
+
+def ipuz_document(crossword: CrosswordGrid, title: Optional[str] = None) -> Dict[str, Any]:
+    """The crossword as an ipuz v2 document: blocks for empty cells, numbered start cells,
+    the solution grid and Across/Down clues (empty text for words without a clue)"""
+    numbers = number_placements(crossword.word_placements)
+    rows = crossword.grid.rows()
+    solution = [[IPUZ_BLOCK if letter == "." else letter for letter in row] for row in rows]
+    puzzle = [[IPUZ_BLOCK if letter == "." else IPUZ_EMPTY for letter in row] for row in rows]
+    for (row, col), number in numbers.items():
+        puzzle[row][col] = number
+
+    clues: Dict[str, list] = {"Across": [], "Down": []}
+    for placement in sorted(crossword.word_placements, key=lambda p: numbers[(p.start_row, p.start_col)]):
+        section = "Across" if placement.direction == Direction.HORIZONTAL else "Down"
+        clues[section].append([numbers[(placement.start_row, placement.start_col)], placement.clue])
+
+    document = {
+        "version": IPUZ_VERSION,
+        "kind": [IPUZ_KIND],
+        "dimensions": {"width": crossword.width, "height": crossword.height},
+        "block": IPUZ_BLOCK,
+        "empty": IPUZ_EMPTY,
+        "puzzle": puzzle,
+        "solution": solution,
+        "clues": clues,
+    }
+    if title:
+        document["title"] = title
+    return document
+
+
+async def ordered_window(jobs: Iterable[Callable[[], Awaitable[T]]],
+                         window: int = DEFAULT_EXPORT_WINDOW) -> AsyncIterator[T]:
+    """Results of jobs in job order, with at most window of them started but not yet consumed.
+
+    A job is only started once the consumer has taken an earlier result, so a slow reader
+    (a client draining a stream slowly) holds the pipeline back instead of letting finished
+    results pile up, and memory stays bounded however many jobs there are. Jobs still
+    pending when the consumer stops are cancelled."""
+    pending: Deque[asyncio.Future] = deque()
+    jobs = iter(jobs)
+    try:
+        while True:
+            for job in jobs:
+                pending.append(asyncio.ensure_future(job()))
+                if len(pending) >= window:
+                    break
+            if not pending:
+                return
+            yield await pending.popleft()
+    finally:
+        for future in pending:
+            future.cancel()
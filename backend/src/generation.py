@@ -0,0 +1,156 @@
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from src.crossword_generator import CrosswordGenerator, DEFAULT_NODE_BUDGET, DEFAULT_TIME_BUDGET_MS
+from src.portfolio import generate_portfolio, DEFAULT_ATTEMPTS
+from src.models import CrosswordGrid, LetterGrid, WordListAnalysis, WordPlacement
+
+
+@dataclass
+class GenerationOptions:
+    """Engine settings for one puzzle, mirroring the /generate-crossword request fields"""
+    engine: str = "greedy"
+    grid_size: int = 15
+    node_budget: int = DEFAULT_NODE_BUDGET
+    attempts: int = DEFAULT_ATTEMPTS
+    seed: int = 0
+    time_budget_ms: int = DEFAULT_TIME_BUDGET_MS
+    max_width: Optional[int] = None
+    max_height: Optional[int] = None
+    include_stats: bool = False
+    placement_order: str = "input"
+
+
+@dataclass
+class GenerationResult:
+    """Outcome of generate_puzzle. crossword is None when the word list failed the
+    pre-analysis and no search was run; analysis is set in that case and with include_stats."""
+    words: List[str]
+    crossword: Optional[CrosswordGrid]
+    analysis: Optional[WordListAnalysis] = None
+
+
+@dataclass
+class BatchItemResult:
+    """One entry of a batch, in the same position as its word list"""
+    index: int
+    result: Optional[GenerationResult] = None
+    error: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+
+def clean_words(words: Sequence[str]) -> List[str]:
+    """Strip and uppercase a word list, raising ValueError for anything the grid cannot hold"""
+    if not words or len(words) < 2:
+        raise ValueError("Please provide at least 2 words")
+    cleaned_words = []
+    for word in words:
+        cleaned_word = word.strip().upper()
+        if not cleaned_word.isalpha() or not LetterGrid.can_store(cleaned_word):
+            raise ValueError(f"Word '{word}' contains invalid characters. Only letters allowed.")
+        if len(cleaned_word) < 2:
+            raise ValueError(f"Word '{word}' is too short. Minimum 2 letters required.")
+        cleaned_words.append(cleaned_word)
+    return cleaned_words
+
+
+def number_placements(placements: List[WordPlacement]) -> Dict[Tuple[int, int], int]:
+    """Clue numbers by start cell, counting in reading order. Words sharing a start cell share a number."""
+    position_numbers: Dict[Tuple[int, int], int] = {}
+    for placement in sorted(placements, key=lambda p: (p.start_row, p.start_col)):
+        pos_key = (placement.start_row, placement.start_col)
+        if pos_key not in position_numbers:
+            position_numbers[pos_key] = len(position_numbers) + 1
+    return position_numbers
+
+
+def attach_clues(crossword: CrosswordGrid, clues: Dict[str, str]) -> None:
+    """Fill WordPlacement.clue from a word -> clue mapping"""
+    for placement in crossword.word_placements:
+        placement.clue = clues.get(placement.word, placement.clue)
+
+
+def generate_puzzle(words: List[str], options: GenerationOptions,
+                    executor: Optional[Executor] = None,
+                    max_workers: Optional[int] = None) -> GenerationResult:
+    """Run the engine selected in options over an already cleaned word list.
+    executor and max_workers are handed to the portfolio engine; the others ignore them."""
+    generator = CrosswordGenerator(words, grid_size=options.grid_size,
+                                   collect_stats=options.include_stats,
+                                   placement_order=options.placement_order)
+
+    # Fail fast when no two words could ever cross
+    if options.engine == "sparse":
+        limits = (options.max_width, options.max_height)
+        max_length = None if None in limits else max(limits)
+    else:
+        max_length = options.grid_size
+    if not generator.has_possible_layout(max_length):
+        return GenerationResult(generator.words, None, generator.analyze_words())
+
+    if options.engine == "backtracking":
+        crossword = generator.generate_crossword_backtracking(node_budget=options.node_budget)
+    elif options.engine == "portfolio":
+        crossword = generate_portfolio(generator.words, grid_size=options.grid_size,
+                                       attempts=options.attempts, seed=options.seed,
+                                       max_workers=max_workers, executor=executor,
+                                       collect_stats=options.include_stats)
+    elif options.engine == "anneal":
+        crossword = generator.generate_crossword_annealed(time_budget_ms=options.time_budget_ms, seed=options.seed)
+    elif options.engine == "sparse":
+        crossword = generator.generate_crossword_sparse(max_width=options.max_width,
+                                                        max_height=options.max_height)
+    else:
+        crossword = generator.generate_crossword()
+    analysis = generator.analyze_words() if options.include_stats else None
+    return GenerationResult(generator.words, crossword, analysis)
+
+
+def run_batch_item(index: int, words: List[str], options: GenerationOptions) -> BatchItemResult:
+    """Clean and generate one batch entry, turning any failure into an error result.
+    Module-level so it can be pickled to worker processes. Portfolio attempts run
+    in-process here: the batch already spreads puzzles across the pool."""
+    try:
+        result = generate_puzzle(clean_words(words), options, max_workers=1)
+    except Exception as e:
+        return BatchItemResult(index, error=str(e))
+    return BatchItemResult(index, result=result)
+
+
+def generate_batch(word_lists: List[List[str]],
+                   options: Union[GenerationOptions, List[GenerationOptions], None] = None,
+                   max_workers: Optional[int] = None,
+                   executor: Optional[Executor] = None) -> List[BatchItemResult]:
+    """Generate one puzzle per word list across a process pool.
+
+    options is shared by every list or given per list. Results come back in input
+    order; a list that fails validation or generation gets an error result instead of
+    failing the batch. Pass an existing executor to reuse a warm pool; otherwise a
+    process pool with max_workers workers (default: one per core) is created for the
+    call. max_workers=1 runs in-process."""
+    if options is None:
+        options = GenerationOptions()
+    if isinstance(options, GenerationOptions):
+        options = [options] * len(word_lists)
+    if len(options) != len(word_lists):
+        raise ValueError("options must be a single GenerationOptions or one per word list")
+    indices = range(len(word_lists))
+
+    workers = max_workers or os.cpu_count() or 1
+    if executor is None and workers <= 1:
+        return [run_batch_item(i, words, opts) for i, words, opts in zip(indices, word_lists, options)]
+
+    own_executor = executor is None
+    pool = executor or ProcessPoolExecutor(max_workers=workers)
+    # Hand out a few chunks per worker so pickling overhead stays small without idling cores
+    chunksize = max(1, len(word_lists) // (workers * 4))
+    try:
+        return list(pool.map(run_batch_item, indices, word_lists, options, chunksize=chunksize))
+    finally:
+        if own_executor:
+            pool.shutdown()
@@ -0,0 +1,185 @@
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Tuple
+
+DEFAULT_MAX_QUEUE = 32
+# Recent jobs kept for the wait and service time figures
+WINDOW = 500
+
+
+class PoolSaturated(Exception):
+    """Raised by GenerationPool.run when every worker is busy and the queue is full"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Generation queue is full, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+@dataclass
+class PoolStats:
+    mode: str
+    workers: int
+    max_queue: int
+    in_flight: int  # Running plus queued
+    queue_depth: int  # Accepted but not yet started
+    reserved: int  # Slots held by bulk jobs, see GenerationPool.reserve
+    completed: int
+    rejected: int
+    mean_wait_seconds: float
+    p95_wait_seconds: float
+    mean_service_seconds: float
+
+
+def _timed_call(submitted_at: float, fn: Callable, args: Tuple) -> Tuple[float, float, Any]:
+    """Run fn(*args) in a worker, returning (wait, service, result) in seconds.
+    Wall-clock time so the figures hold across processes."""
+    started = time.time()
+    result = fn(*args)
+    return started - submitted_at, time.time() - started, result
+
+
+class Reservation:
+    """Admission slots held for one bulk job until release(), which is safe to call twice"""
+
+    def __init__(self, pool: "GenerationPool", slots: int):
+        self.pool = pool
+        self.slots = slots
+        self.released = False
+
+    def release(self) -> None:
+        if not self.released:
+            self.released = True
+            self.pool.reserved -= self.slots
+
+
+class GenerationPool:
+    """Runs CPU-bound generation off the event loop with bounded admission.
+
+    At most workers jobs run at once and at most max_queue more wait for a worker;
+    anything beyond that is refused immediately with PoolSaturated rather than
+    queueing without limit. mode "thread" keeps jobs in this process (the GIL still
+    hands the event loop a turn every switch interval), "process" runs them in worker
+    processes, so fn and its arguments must be picklable. The executor starts on first use."""
+
+    def __init__(self, mode: str = "thread", workers: Optional[int] = None,
+                 max_queue: int = DEFAULT_MAX_QUEUE):
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Unknown pool mode '{mode}'")
+        if max_queue < 0:
+            raise ValueError("max_queue cannot be negative")
+        self.mode = mode
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.in_flight = 0
+        self.reserved = 0
+        # Jobs run under a reservation; they are covered by its slots, not counted again
+        self.reserved_in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self._waits: deque = deque(maxlen=WINDOW)
+        self._services: deque = deque(maxlen=WINDOW)
+        self._executor: Optional[Executor] = None
+
+    @classmethod
+    def from_env(cls) -> "GenerationPool":
+        """Configure from CROSSWORD_POOL_MODE (thread or process), CROSSWORD_POOL_WORKERS
+        (default: one per core) and CROSSWORD_POOL_MAX_QUEUE"""
+        workers = os.getenv("CROSSWORD_POOL_WORKERS")
+        return cls(
+            mode=os.getenv("CROSSWORD_POOL_MODE", "thread"),
+            workers=int(workers) if workers else None,
+            max_queue=int(os.getenv("CROSSWORD_POOL_MAX_QUEUE", DEFAULT_MAX_QUEUE))
+        )
+
+    @property
+    def uses_processes(self) -> bool:
+        return self.mode == "process"
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self.uses_processes:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="generation")
+        return self._executor
+
+    @property
+    def capacity(self) -> int:
+        """Jobs admitted at once: running plus queued"""
+        return self.workers + self.max_queue
+
+    def admit(self, slots: int = 1) -> None:
+        """Raise PoolSaturated unless slots more jobs fit under the admission limit"""
+        committed = self.in_flight - self.reserved_in_flight + self.reserved
+        if committed + slots > self.capacity:
+            self.rejected += 1
+            raise PoolSaturated(self.retry_after())
+
+    def reserve(self, slots: int) -> Reservation:
+        """Hold slots for a bulk job that keeps at most that many jobs in flight, or raise
+        PoolSaturated. Until released they count as taken whether or not its jobs are running,
+        so concurrent bulk jobs and interactive requests cannot overcommit the pool."""
+        self.admit(slots)
+        self.reserved += slots
+        return Reservation(self, slots)
+
+    async def run(self, fn: Callable, *args, executor: Optional[Executor] = None, reserved: bool = False) -> Any:
+        """Await fn(*args) on the pool, or raise PoolSaturated straight away if it is full.
+
+        executor runs the job elsewhere (a bulk job on the shared process pool) while it
+        still counts against the admission limit; reserved runs it on slots held by
+        reserve() instead of checking for a free one."""
+        if not reserved:
+            self.admit()
+        loop = asyncio.get_running_loop()
+        future = (executor or self.executor).submit(_timed_call, time.time(), fn, args)
+        self.in_flight += 1
+        if reserved:
+            self.reserved_in_flight += 1
+        # Release the slot when the job really ends, even if the caller stops waiting for it
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(self._release, reserved))
+        wait, service, result = await asyncio.wrap_future(future)
+        self._waits.append(wait)
+        self._services.append(service)
+        return result
+
+    def _release(self, reserved: bool = False) -> None:
+        self.in_flight -= 1
+        if reserved:
+            self.reserved_in_flight -= 1
+        self.completed += 1
+
+    def retry_after(self) -> int:
+        """Whole seconds until a queue slot is likely to free up, at least 1"""
+        if not self._services:
+            return 1
+        mean_service = sum(self._services) / len(self._services)
+        queued = max(self.in_flight - self.workers, 0)
+        return max(1, math.ceil(mean_service * (queued + 1) / self.workers))
+
+    def stats(self) -> PoolStats:
+        waits = sorted(self._waits)
+        return PoolStats(
+            mode=self.mode,
+            workers=self.workers,
+            max_queue=self.max_queue,
+            in_flight=self.in_flight,
+            queue_depth=max(self.in_flight - self.workers, 0),
+            reserved=self.reserved,
+            completed=self.completed,
+            rejected=self.rejected,
+            mean_wait_seconds=sum(waits) / len(waits) if waits else 0.0,
+            p95_wait_seconds=waits[min(len(waits) - 1, int(len(waits) * 0.95))] if waits else 0.0,
+            mean_service_seconds=sum(self._services) / len(self._services) if self._services else 0.0
+        )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -1,11 +1,44 @@
 import os
-import httpx
 import csv
 import io
-from typing import List, Optional, Dict, Tuple
+import importlib.util
+from typing import TYPE_CHECKING, AsyncIterator, List, Optional, Dict, Tuple
 import json
+from dataclasses import replace
+from src.single_flight import SingleFlight
+from src.provider_chain import ProviderChain, DEFAULT_HEDGE_DELAY, DEFAULT_FAILURE_THRESHOLD, DEFAULT_COOLDOWN_SECONDS
+from src.topic_cache import TopicCache, TopicResult, normalize_topic
+
+if TYPE_CHECKING:
+    # Imported when the first client is created, so mock-only workers start without it
+    import httpx
+
+OPENAI_MODEL = 'gpt-3.5-turbo'
+ANTHROPIC_MODEL = 'claude-3-haiku-20240307'
+OLLAMA_MODEL = 'llama2'
+MOCK_MODEL = 'mock'
+
+MAX_WORD_CLUES = 30  # Pairs kept from one completion
+MIN_WORD_CLUES = 10  # Fewer valid pairs than this counts as a failed completion
+
+# Provider -> base URL of its shared client (Ollama's comes from OLLAMA_BASE_URL)
+PROVIDER_BASE_URLS = {
+    'openai': 'https://api.openai.com',
+    'anthropic': 'https://api.anthropic.com',
+}
+# Local models answer slowly, so Ollama gets a longer default read timeout
+DEFAULT_READ_TIMEOUTS = {'openai': 30.0, 'anthropic': 30.0, 'ollama': 60.0}
 
 class LLMService:
+    # One long-lived client per provider, so requests reuse pooled keep-alive connections
+    _clients: Dict[str, "httpx.AsyncClient"] = {}
+    # Topic -> word/clue cache in front of the provider calls, created on first use
+    _topic_cache: Optional[TopicCache] = None
+    # Concurrent requests for the same topic share one provider call
+    topic_flights = SingleFlight()
+    # Hedging, circuit breakers and latency stats across the configured providers
+    _provider_chain: Optional[ProviderChain] = None
+    _provider_chain_settings: Optional[tuple] = None
     
     @staticmethod
     def get_config():
@@ -13,9 +46,123 @@ class LLMService:
             'provider': os.getenv('LLM_PROVIDER', 'mock'),
             'openai_key': os.getenv('OPENAI_API_KEY'),
             'anthropic_key': os.getenv('ANTHROPIC_API_KEY'),
-            'ollama_url': os.getenv('OLLAMA_BASE_URL', 'http://localhost:11434')
+            'ollama_url': os.getenv('OLLAMA_BASE_URL', 'http://localhost:11434'),
+            # Comma-separated providers to hedge across, e.g. "openai,anthropic"; overrides provider
+            'provider_chain': [name.strip().lower() for name in os.getenv('LLM_PROVIDER_CHAIN', '').split(',') if name.strip()],
+            'hedge_delay': float(os.getenv('LLM_HEDGE_DELAY_SECONDS', DEFAULT_HEDGE_DELAY)),
+            'breaker_failures': int(os.getenv('LLM_BREAKER_FAILURES', DEFAULT_FAILURE_THRESHOLD)),
+            'breaker_cooldown': float(os.getenv('LLM_BREAKER_COOLDOWN_SECONDS', DEFAULT_COOLDOWN_SECONDS))
+        }
+    
+    @staticmethod
+    def get_http_config() -> dict:
+        """Connection pool limits and per-phase timeouts (seconds) shared by the provider clients"""
+        read_timeout = os.getenv('LLM_HTTP_READ_TIMEOUT')
+        return {
+            'max_connections': int(os.getenv('LLM_HTTP_MAX_CONNECTIONS', '20')),
+            'max_keepalive_connections': int(os.getenv('LLM_HTTP_MAX_KEEPALIVE', '10')),
+            'keepalive_expiry': float(os.getenv('LLM_HTTP_KEEPALIVE_EXPIRY', '30')),
+            'connect_timeout': float(os.getenv('LLM_HTTP_CONNECT_TIMEOUT', '5')),
+            'read_timeout': float(read_timeout) if read_timeout else None,  # None: per-provider default
+            'write_timeout': float(os.getenv('LLM_HTTP_WRITE_TIMEOUT', '10')),
+            'pool_timeout': float(os.getenv('LLM_HTTP_POOL_TIMEOUT', '5')),
+            # HTTP/2 needs the optional h2 package (pip install 'httpx[http2]')
+            'http2': os.getenv('LLM_HTTP2', '1') != '0' and importlib.util.find_spec('h2') is not None,
         }
     
+    @staticmethod
+    def _create_client(provider: str, transport: Optional["httpx.AsyncBaseTransport"] = None) -> "httpx.AsyncClient":
+        import httpx
+        
+        http_config = LLMService.get_http_config()
+        base_url = PROVIDER_BASE_URLS.get(provider) or LLMService.get_config()['ollama_url']
+        return httpx.AsyncClient(
+            base_url=base_url,
+            limits=httpx.Limits(
+                max_connections=http_config['max_connections'],
+                max_keepalive_connections=http_config['max_keepalive_connections'],
+                keepalive_expiry=http_config['keepalive_expiry']
+            ),
+            timeout=httpx.Timeout(
+                connect=http_config['connect_timeout'],
+                read=http_config['read_timeout'] or DEFAULT_READ_TIMEOUTS[provider],
+                write=http_config['write_timeout'],
+                pool=http_config['pool_timeout']
+            ),
+            # Ollama is usually plain HTTP on localhost, where HTTP/2 is not negotiated
+            http2=http_config['http2'] and base_url.startswith('https'),
+            transport=transport
+        )
+    
+    @staticmethod
+    async def startup(transport: Optional["httpx.AsyncBaseTransport"] = None) -> None:
+        """Create the shared clients for the configured providers. Called from the FastAPI
+        lifespan; transport replaces the network layer in tests and gets a client for every provider."""
+        await LLMService.shutdown()
+        if transport is not None:
+            providers = list(DEFAULT_READ_TIMEOUTS)
+        else:
+            chain = LLMService.get_provider_chain()
+            providers = chain.providers if chain is not None else []
+        for provider in providers:
+            LLMService._clients[provider] = LLMService._create_client(provider, transport)
+    
+    @staticmethod
+    async def shutdown() -> None:
+        """Close the shared provider clients and their pooled connections"""
+        clients = list(LLMService._clients.values())
+        LLMService._clients.clear()
+        for client in clients:
+            await client.aclose()
+    
+    @staticmethod
+    def get_client(provider: str) -> "httpx.AsyncClient":
+        """Shared client for provider, created on first use when startup has not run"""
+        client = LLMService._clients.get(provider)
+        if client is None or client.is_closed:
+            client = LLMService._clients[provider] = LLMService._create_client(provider)
+        return client
+    
+    @staticmethod
+    def get_topic_cache() -> TopicCache:
+        if LLMService._topic_cache is None:
+            LLMService._topic_cache = TopicCache.from_env()
+        return LLMService._topic_cache
+    
+    @staticmethod
+    def _provider_configured(provider: str, config: dict) -> bool:
+        if provider == 'openai':
+            return bool(config['openai_key'])
+        if provider == 'anthropic':
+            return bool(config['anthropic_key'])
+        return provider == 'ollama'
+    
+    @staticmethod
+    def get_provider_chain(config: Optional[dict] = None) -> Optional[ProviderChain]:
+        """Shared chain over LLM_PROVIDER_CHAIN (or just LLM_PROVIDER), skipping providers
+        without credentials. None when no real provider is configured. The chain and its
+        breakers and stats are kept until the configuration changes."""
+        config = config or LLMService.get_config()
+        names = config['provider_chain'] or [config['provider']]
+        providers = [name for name in names if LLMService._provider_configured(name, config)]
+        if not providers:
+            return None
+        settings = (providers, config['hedge_delay'], config['breaker_failures'], config['breaker_cooldown'])
+        if LLMService._provider_chain is None or LLMService._provider_chain_settings != settings:
+            LLMService._provider_chain = ProviderChain(
+                providers, hedge_delay=config['hedge_delay'],
+                failure_threshold=config['breaker_failures'], cooldown_seconds=config['breaker_cooldown']
+            )
+            LLMService._provider_chain_settings = settings
+        return LLMService._provider_chain
+    
+    @staticmethod
+    def _is_cacheable(result: TopicResult, config: dict) -> bool:
+        """Mock answers are kept only when mock is what was configured, not a fallback"""
+        if result.provider != 'mock':
+            return True
+        return config['provider'] == 'mock' and not config['provider_chain']
+    
     @staticmethod
     def create_prompt(topic: str) -> str:
         return f"""You are helping create a crossword puzzle. Generate exactly 30 words with clues related to the topic "{topic}".
@@ -53,89 +200,211 @@ Now generate 30 word-clue pairs for the topic: "{topic}\""""
     @staticmethod
     async def generate_words_and_clues_from_topic(topic: str) -> List[Dict[str, str]]:
         """New method that returns both words and clues"""
+        result = await LLMService.generate_topic_result(topic)
+        return result.word_clues
+    
+    @staticmethod
+    async def generate_topic_result(topic: str, cache_mode: str = 'use') -> TopicResult:
+        """Word-clue pairs for a topic, served from the topic cache when possible.
+        cache_mode 'bypass' skips the cache entirely; 'refresh' skips the lookup but stores the new answer."""
+        cache = LLMService.get_topic_cache()
+        if cache_mode == 'use':
+            cached = await cache.aget(topic)
+            if cached is not None:
+                print(f"⚡ Topic cache hit for '{topic}' ({cached.provider}/{cached.model})")
+                return cached
+        
         config = LLMService.get_config()
-        print(f"🔧 LLM_PROVIDER: {config['provider']}")
+        result, coalesced = await LLMService.topic_flights.do(
+            normalize_topic(topic), lambda: LLMService._call_provider(topic, config)
+        )
+        if coalesced:
+            print(f"🔗 Joined in-flight LLM call for '{topic}'")
+            return replace(result, coalesced=True)
+        # Mock answers standing in for a failed or unconfigured provider are not worth keeping
+        if cache_mode != 'bypass' and LLMService._is_cacheable(result, config):
+            await cache.aput(topic, result)
+        return result
+    
+    @staticmethod
+    async def _call_provider(topic: str, config: dict) -> TopicResult:
+        print(f"🔧 LLM_PROVIDER: {', '.join(config['provider_chain']) or config['provider']}")
         
         try:
-            if config['provider'] == 'openai' and config['openai_key']:
-                print(f"🚀 Using OpenAI for topic: {topic}")
-                return await LLMService._call_openai(topic, config)
-            elif config['provider'] == 'anthropic' and config['anthropic_key']:
-                print(f"🚀 Using Anthropic for topic: {topic}")
-                return await LLMService._call_anthropic(topic, config)
-            elif config['provider'] == 'ollama':
-                print(f"🚀 Using Ollama for topic: {topic}")
-                return await LLMService._call_ollama(topic, config)
-            else:
+            chain = LLMService.get_provider_chain(config)
+            if chain is None:
                 print(f"⚠️  No valid LLM provider configured. Provider: {config['provider']}, Has API keys: OpenAI={bool(config['openai_key'])}, Anthropic={bool(config['anthropic_key'])}")
-                return LLMService._get_mock_word_clues(topic)
+                return TopicResult(LLMService._get_mock_word_clues(topic), 'mock', MOCK_MODEL)
+            return await chain.call(lambda provider: LLMService._call_named_provider(provider, topic, config))
         except Exception as e:
             print(f"❌ LLM call failed: {e}")
             print(f"Provider: {config['provider']}")
             print(f"API key present: {bool(config.get('openai_key' if config['provider'] == 'openai' else 'anthropic_key'))}")
             print("Falling back to mock")
-            return LLMService._get_mock_word_clues(topic)
+            return TopicResult(LLMService._get_mock_word_clues(topic), 'mock', MOCK_MODEL)
+    
+    @staticmethod
+    async def _call_named_provider(provider: str, topic: str, config: dict) -> TopicResult:
+        if provider == 'openai':
+            print(f"🚀 Using OpenAI for topic: {topic}")
+            return TopicResult(await LLMService._call_openai(topic, config), 'openai', OPENAI_MODEL)
+        elif provider == 'anthropic':
+            print(f"🚀 Using Anthropic for topic: {topic}")
+            return TopicResult(await LLMService._call_anthropic(topic, config), 'anthropic', ANTHROPIC_MODEL)
+        print(f"🚀 Using Ollama for topic: {topic}")
+        return TopicResult(await LLMService._call_ollama(topic, config), 'ollama', OLLAMA_MODEL)
     
     @staticmethod
     async def _call_openai(topic: str, config: dict) -> List[Dict[str, str]]:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                'https://api.openai.com/v1/chat/completions',
-                headers={
-                    'Authorization': f"Bearer {config['openai_key']}",
-                    'Content-Type': 'application/json'
-                },
-                json={
-                    'model': 'gpt-3.5-turbo',
-                    'messages': [{'role': 'user', 'content': LLMService.create_prompt(topic)}],
-                    'max_tokens': 1000,
-                    'temperature': 0.7
-                },
-                timeout=30.0
-            )
-            response.raise_for_status()
-            data = response.json()
-            content = data['choices'][0]['message']['content']
-            return LLMService._parse_csv_content(content)
+        response = await LLMService.get_client('openai').post(
+            '/v1/chat/completions',
+            headers={
+                'Authorization': f"Bearer {config['openai_key']}",
+                'Content-Type': 'application/json'
+            },
+            json={
+                'model': OPENAI_MODEL,
+                'messages': [{'role': 'user', 'content': LLMService.create_prompt(topic)}],
+                'max_tokens': 1000,
+                'temperature': 0.7
+            }
+        )
+        response.raise_for_status()
+        data = response.json()
+        content = data['choices'][0]['message']['content']
+        return LLMService._parse_csv_content(content)
     
     @staticmethod
     async def _call_anthropic(topic: str, config: dict) -> List[Dict[str, str]]:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                'https://api.anthropic.com/v1/messages',
-                headers={
-                    'x-api-key': config['anthropic_key'],
-                    'Content-Type': 'application/json',
-                    'anthropic-version': '2023-06-01'
-                },
-                json={
-                    'model': 'claude-3-haiku-20240307',
-                    'max_tokens': 1000,
-                    'messages': [{'role': 'user', 'content': LLMService.create_prompt(topic)}]
-                },
-                timeout=30.0
-            )
-            response.raise_for_status()
-            data = response.json()
-            content = data['content'][0]['text']
-            return LLMService._parse_csv_content(content)
+        response = await LLMService.get_client('anthropic').post(
+            '/v1/messages',
+            headers={
+                'x-api-key': config['anthropic_key'],
+                'Content-Type': 'application/json',
+                'anthropic-version': '2023-06-01'
+            },
+            json={
+                'model': ANTHROPIC_MODEL,
+                'max_tokens': 1000,
+                'messages': [{'role': 'user', 'content': LLMService.create_prompt(topic)}]
+            }
+        )
+        response.raise_for_status()
+        data = response.json()
+        content = data['content'][0]['text']
+        return LLMService._parse_csv_content(content)
     
     @staticmethod
     async def _call_ollama(topic: str, config: dict) -> List[Dict[str, str]]:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{config['ollama_url']}/api/generate",
-                json={
-                    'model': 'llama2',
-                    'prompt': LLMService.create_prompt(topic),
-                    'stream': False
-                },
-                timeout=60.0
-            )
+        response = await LLMService.get_client('ollama').post(
+            '/api/generate',
+            json={
+                'model': OLLAMA_MODEL,
+                'prompt': LLMService.create_prompt(topic),
+                'stream': False
+            }
+        )
+        response.raise_for_status()
+        data = response.json()
+        content = data['response']
+        return LLMService._parse_csv_content(content)
+    
+    @staticmethod
+    def _stream_source(topic: str, config: dict) -> Tuple[str, str, Optional[AsyncIterator[str]]]:
+        """(provider, model, text chunks) for a streamed completion; chunks is None for mock data.
+        Streams are not hedged: a provider chain streams from its first configured provider."""
+        chain = LLMService.get_provider_chain(config)
+        provider = chain.providers[0] if chain is not None else None
+        if provider == 'openai':
+            return 'openai', OPENAI_MODEL, LLMService._stream_openai(topic, config)
+        elif provider == 'anthropic':
+            return 'anthropic', ANTHROPIC_MODEL, LLMService._stream_anthropic(topic, config)
+        elif provider == 'ollama':
+            return 'ollama', OLLAMA_MODEL, LLMService._stream_ollama(topic, config)
+        return 'mock', MOCK_MODEL, None
+    
+    @staticmethod
+    async def _sse_payloads(response: "httpx.Response") -> AsyncIterator[dict]:
+        """JSON payloads of the data: lines in a server-sent event stream"""
+        async for line in response.aiter_lines():
+            if not line.startswith('data:'):
+                continue
+            payload = line[5:].strip()
+            if payload == '[DONE]':
+                return
+            yield json.loads(payload)
+    
+    @staticmethod
+    async def _stream_openai(topic: str, config: dict) -> AsyncIterator[str]:
+        async with LLMService.get_client('openai').stream(
+            'POST',
+            '/v1/chat/completions',
+            headers={
+                'Authorization': f"Bearer {config['openai_key']}",
+                'Content-Type': 'application/json'
+            },
+            json={
+                'model': OPENAI_MODEL,
+                'messages': [{'role': 'user', 'content': LLMService.create_prompt(topic)}],
+                'max_tokens': 1000,
+                'temperature': 0.7,
+                'stream': True
+            }
+        ) as response:
+            response.raise_for_status()
+            async for data in LLMService._sse_payloads(response):
+                choices = data.get('choices') or [{}]
+                text = choices[0].get('delta', {}).get('content')
+                if text:
+                    yield text
+    
+    @staticmethod
+    async def _stream_anthropic(topic: str, config: dict) -> AsyncIterator[str]:
+        async with LLMService.get_client('anthropic').stream(
+            'POST',
+            '/v1/messages',
+            headers={
+                'x-api-key': config['anthropic_key'],
+                'Content-Type': 'application/json',
+                'anthropic-version': '2023-06-01'
+            },
+            json={
+                'model': ANTHROPIC_MODEL,
+                'max_tokens': 1000,
+                'messages': [{'role': 'user', 'content': LLMService.create_prompt(topic)}],
+                'stream': True
+            }
+        ) as response:
+            response.raise_for_status()
+            async for data in LLMService._sse_payloads(response):
+                if data.get('type') == 'content_block_delta':
+                    text = data.get('delta', {}).get('text')
+                    if text:
+                        yield text
+                elif data.get('type') == 'message_stop':
+                    return
+    
+    @staticmethod
+    async def _stream_ollama(topic: str, config: dict) -> AsyncIterator[str]:
+        async with LLMService.get_client('ollama').stream(
+            'POST',
+            '/api/generate',
+            json={
+                'model': OLLAMA_MODEL,
+                'prompt': LLMService.create_prompt(topic),
+                'stream': True
+            }
+        ) as response:
             response.raise_for_status()
-            data = response.json()
-            content = data['response']
-            return LLMService._parse_csv_content(content)
+            # Ollama streams one JSON object per line
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                data = json.loads(line)
+                if data.get('response'):
+                    yield data['response']
+                if data.get('done'):
+                    return
     
     @staticmethod
     def _parse_words(content: str) -> List[str]:
@@ -167,51 +436,46 @@ Now generate 30 word-clue pairs for the topic: "{topic}\""""
         
         return words[:30]
     
+    @staticmethod
+    def _parse_csv_line(line: str) -> Optional[Dict[str, str]]:
+        """Word-clue pair from one WORD,CLUE line of a completion, or None if the line is not one"""
+        line = line.strip()
+        # Skip empty lines, markdown, or explanatory text
+        if not line or line.startswith('#') or line.startswith('```') or line.lower().startswith('here'):
+            return None
+        # Look for lines with comma separation
+        if ',' not in line or line.lower().startswith('word,clue'):
+            return None
+        try:
+            # Use CSV reader to handle quoted content properly
+            row = next(csv.reader([line]))
+        except (csv.Error, StopIteration):
+            return None
+        if len(row) < 2:
+            return None
+        word = row[0].strip().upper()
+        clue = row[1].strip()
+        # Validate word
+        if not (word.isalpha() and 3 <= len(word) <= 15):
+            return None
+        return {'word': word, 'clue': clue}
+    
     @staticmethod
     def _parse_csv_content(content: str) -> List[Dict[str, str]]:
         """Parse CSV content from LLM response and return word-clue pairs"""
         try:
-            # Clean the content - remove any markdown, explanations, etc.
-            lines = content.strip().split('\n')
-            csv_lines = []
-            
-            for line in lines:
-                line = line.strip()
-                # Skip empty lines, markdown, or explanatory text
-                if not line or line.startswith('#') or line.startswith('```') or line.lower().startswith('here'):
-                    continue
-                # Look for lines with comma separation
-                if ',' in line and not line.lower().startswith('word,clue'):
-                    csv_lines.append(line)
-            
-            if not csv_lines:
-                raise ValueError("No CSV content found in LLM response")
-            
-            # Parse CSV data
             word_clue_pairs = []
-            for line in csv_lines:
-                try:
-                    # Use CSV reader to handle quoted content properly
-                    csv_reader = csv.reader([line])
-                    row = next(csv_reader)
-                    
-                    if len(row) >= 2:
-                        word = row[0].strip().upper()
-                        clue = row[1].strip()
-                        
-                        # Validate word
-                        if word.isalpha() and 3 <= len(word) <= 15:
-                            word_clue_pairs.append({
-                                'word': word,
-                                'clue': clue
-                            })
-                except (csv.Error, ValueError):
-                    continue
+            for line in content.strip().split('\n'):
+                pair = LLMService._parse_csv_line(line)
+                if pair is not None:
+                    word_clue_pairs.append(pair)
             
-            if len(word_clue_pairs) < 10:
+            if not word_clue_pairs:
+                raise ValueError("No CSV content found in LLM response")
+            if len(word_clue_pairs) < MIN_WORD_CLUES:
                 raise ValueError(f"Too few valid word-clue pairs: {len(word_clue_pairs)}")
             
-            return word_clue_pairs[:30]
+            return word_clue_pairs[:MAX_WORD_CLUES]
             
         except Exception as e:
             print(f"Error parsing CSV content: {e}")
@@ -386,4 +650,97 @@ Now generate 30 word-clue pairs for the topic: "{topic}\""""
             {'word': 'BUILD', 'clue': 'Construct or assemble'},
             {'word': 'FORM', 'clue': 'Shape or structure'},
             {'word': 'SHAPE', 'clue': 'External form'}
-        ]
\ No newline at end of file
+        ]
+
+
+class CSVPairParser:
+    """Incremental WORD,CLUE parser for streamed completions.
+    feed() takes text chunks as they arrive and returns the pairs their complete lines
+    hold; a trailing partial line waits for the next chunk or close()."""
+    
+    def __init__(self, limit: int = MAX_WORD_CLUES):
+        self.limit = limit
+        self.count = 0
+        self._partial = ''
+    
+    def feed(self, text: str) -> List[Dict[str, str]]:
+        lines = (self._partial + text).split('\n')
+        self._partial = lines.pop()
+        return self._take(lines)
+    
+    def close(self) -> List[Dict[str, str]]:
+        line, self._partial = self._partial, ''
+        return self._take([line])
+    
+    def _take(self, lines: List[str]) -> List[Dict[str, str]]:
+        pairs = []
+        for line in lines:
+            if self.count >= self.limit:
+                break
+            pair = LLMService._parse_csv_line(line)
+            if pair is not None:
+                pairs.append(pair)
+                self.count += 1
+        return pairs
+
+
+class TopicStream:
+    """Async iterator over a topic's word-clue pairs, yielded as the provider streams them.
+    
+    Follows LLMService.generate_topic_result: cache_mode works the same way, a failed
+    provider falls back to mock data, and only complete answers from the configured
+    provider are cached. Once iteration ends, result holds the full TopicResult."""
+    
+    def __init__(self, topic: str, cache_mode: str = 'use'):
+        self.topic = topic
+        self.cache_mode = cache_mode
+        self.result: Optional[TopicResult] = None
+    
+    def __aiter__(self) -> AsyncIterator[Dict[str, str]]:
+        return self._pairs()
+    
+    async def _pairs(self) -> AsyncIterator[Dict[str, str]]:
+        cache = LLMService.get_topic_cache()
+        if self.cache_mode == 'use':
+            cached = await cache.aget(self.topic)
+            if cached is not None:
+                self.result = cached
+                for pair in cached.word_clues:
+                    yield pair
+                return
+        
+        config = LLMService.get_config()
+        provider, model, chunks = LLMService._stream_source(self.topic, config)
+        pairs: List[Dict[str, str]] = []
+        if chunks is not None:
+            print(f"🚀 Streaming {provider} for topic: {self.topic}")
+            parser = CSVPairParser()
+            try:
+                try:
+                    async for chunk in chunks:
+                        for pair in parser.feed(chunk):
+                            pairs.append(pair)
+                            yield pair
+                finally:
+                    await chunks.aclose()
+                for pair in parser.close():
+                    pairs.append(pair)
+                    yield pair
+                if len(pairs) < MIN_WORD_CLUES:
+                    raise ValueError(f"Too few valid word-clue pairs: {len(pairs)}")
+            except Exception as e:
+                print(f"❌ LLM stream failed: {e}")
+                if pairs:
+                    # Pairs already sent cannot be taken back: finish with them, uncached
+                    self.result = TopicResult(pairs, provider, model)
+                    return
+                print("Falling back to mock")
+                provider, model = 'mock', MOCK_MODEL
+        if not pairs:
+            pairs = LLMService._get_mock_word_clues(self.topic)
+            for pair in pairs:
+                yield pair
+        
+        self.result = TopicResult(pairs, provider, model)
+        if self.cache_mode != 'bypass' and LLMService._is_cacheable(self.result, config):
+            await cache.aput(self.topic, self.result)
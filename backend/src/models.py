@@ -1,11 +1,172 @@
-from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
 from enum import Enum
 
 class Direction(Enum):
     HORIZONTAL = "horizontal"
     VERTICAL = "vertical"
 
+EMPTY_CELL = 0  # Sentinel byte for a cell with no letter
+
+class LetterGrid:
+    """Fixed-size letter grid stored row-major in a single bytearray.
+    Each cell holds the Latin-1 code of its letter, or EMPTY_CELL."""
+    __slots__ = ("width", "height", "cells")
+
+    def __init__(self, width: int, height: int, cells: Optional[bytearray] = None):
+        self.width = width
+        self.height = height
+        self.cells = bytearray(width * height) if cells is None else cells
+
+    @staticmethod
+    def can_store(word: str) -> bool:
+        """Whether every letter of word fits in a single cell byte"""
+        try:
+            encoded = word.encode('latin-1')
+        except UnicodeEncodeError:
+            return False
+        return EMPTY_CELL not in encoded
+
+    def index(self, row: int, col: int) -> int:
+        return row * self.width + col
+
+    def in_bounds(self, row: int, col: int) -> bool:
+        return 0 <= row < self.height and 0 <= col < self.width
+
+    def get(self, row: int, col: int) -> Optional[str]:
+        cell = self.cells[row * self.width + col]
+        return None if cell == EMPTY_CELL else chr(cell)
+
+    def set(self, row: int, col: int, letter: Optional[str]) -> None:
+        self.cells[row * self.width + col] = EMPTY_CELL if letter is None else ord(letter)
+
+    def is_empty(self, row: int, col: int) -> bool:
+        return self.cells[row * self.width + col] == EMPTY_CELL
+
+    def copy(self) -> "LetterGrid":
+        return LetterGrid(self.width, self.height, bytearray(self.cells))
+
+    def rows(self) -> List[str]:
+        """Each row as a string, with '.' for empty cells"""
+        text = self.cells.replace(bytes([EMPTY_CELL]), b'.').decode('latin-1')
+        return [text[r * self.width:(r + 1) * self.width] for r in range(self.height)]
+
+    def to_rows(self) -> List[List[Optional[str]]]:
+        """Nested-list form used by the API: one-character strings and None"""
+        width = self.width
+        return [
+            [None if cell == EMPTY_CELL else chr(cell) for cell in self.cells[r * width:(r + 1) * width]]
+            for r in range(self.height)
+        ]
+
+    @classmethod
+    def from_rows(cls, rows: List[List[Optional[str]]]) -> "LetterGrid":
+        height = len(rows)
+        width = len(rows[0]) if rows else 0
+        grid = cls(width, height)
+        for r, row in enumerate(rows):
+            for c, letter in enumerate(row):
+                if letter is not None:
+                    grid.set(r, c, letter)
+        return grid
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, LetterGrid):
+            return NotImplemented
+        return (self.width, self.height, self.cells) == (other.width, other.height, other.cells)
+
+    def __repr__(self) -> str:
+        return f"LetterGrid({self.width}x{self.height}, {self.rows()!r})"
+
+class SparseCanvas:
+    """Unbounded letter canvas keyed by (row, col). Coordinates may be negative;
+    the bounding box of the used cells is tracked as letters are added."""
+    __slots__ = ("cells", "min_row", "min_col", "max_row", "max_col")
+
+    def __init__(self):
+        self.cells: Dict[Tuple[int, int], str] = {}
+        self.min_row = self.min_col = 0
+        self.max_row = self.max_col = -1
+
+    @property
+    def width(self) -> int:
+        return self.max_col - self.min_col + 1
+
+    @property
+    def height(self) -> int:
+        return self.max_row - self.min_row + 1
+
+    def get(self, row: int, col: int) -> Optional[str]:
+        return self.cells.get((row, col))
+
+    def set(self, row: int, col: int, letter: str) -> None:
+        if not self.cells:
+            self.min_row = self.max_row = row
+            self.min_col = self.max_col = col
+        else:
+            self.min_row = min(self.min_row, row)
+            self.max_row = max(self.max_row, row)
+            self.min_col = min(self.min_col, col)
+            self.max_col = max(self.max_col, col)
+        self.cells[(row, col)] = letter
+
+    def size_with(self, start_row: int, start_col: int, end_row: int, end_col: int) -> Tuple[int, int]:
+        """(width, height) of the bounding box after adding the given rectangle"""
+        if not self.cells:
+            return end_col - start_col + 1, end_row - start_row + 1
+        return (max(self.max_col, end_col) - min(self.min_col, start_col) + 1,
+                max(self.max_row, end_row) - min(self.min_row, start_row) + 1)
+
+    def crop(self) -> LetterGrid:
+        """Copy the used rectangle into a LetterGrid whose (0, 0) is (min_row, min_col)"""
+        if not self.cells:
+            return LetterGrid(0, 0)
+        grid = LetterGrid(self.width, self.height)
+        for (row, col), letter in self.cells.items():
+            grid.set(row - self.min_row, col - self.min_col, letter)
+        return grid
+
+# Reasons a candidate position is rejected, as counted in GenerationStats.rejections
+REJECT_BOUNDS = "bounds"
+REJECT_CONFLICT = "letter_conflict"
+REJECT_UNINTENDED_WORD = "unintended_word"
+REJECT_BOUNDARY_MERGE = "boundary_merge"
+REJECT_NOT_CONNECTED = "not_connected"
+REJECTION_REASONS = (REJECT_BOUNDS, REJECT_CONFLICT, REJECT_UNINTENDED_WORD,
+                     REJECT_BOUNDARY_MERGE, REJECT_NOT_CONNECTED)
+
+@dataclass
+class GenerationStats:
+    """Counters from one generation run, collected when CrosswordGenerator has collect_stats=True.
+    Each rejected candidate counts once, under the first check it failed."""
+    anchors_tried: int = 0
+    rejections: Dict[str, int] = field(default_factory=lambda: dict.fromkeys(REJECTION_REASONS, 0))
+    phase_seconds: Dict[str, float] = field(default_factory=dict)
+    words_placed: int = 0
+    words_dropped: int = 0
+
+    def add_phase_time(self, phase: str, seconds: float) -> None:
+        self.phase_seconds[phase] = self.phase_seconds.get(phase, 0.0) + seconds
+
+@dataclass
+class WordListAnalysis:
+    """Pre-placement diagnostics for a word list, from CrosswordGenerator.analyze_words.
+    Word indices refer to the generator's word list as given."""
+    alphabet: str                       # Distinct letters, the columns of letter_histograms
+    letter_histograms: List[List[int]]  # Per word, how often each alphabet letter occurs
+    neighbors: List[int]                # Per word, bitset of the indices it shares a letter with
+    degrees: List[int]                  # Per word, how many other words it shares a letter with
+    isolated_words: List[str]           # Words that share no letter with any other word
+    duplicate_words: List[str]
+    contained_words: List[Tuple[str, str]]  # (inner, outer) where inner is a substring of outer
+    oversized_words: List[str]          # Words longer than the generator's grid
+    largest_component: int              # Size of the largest group of mutually reachable words
+
+    @property
+    def can_connect(self) -> bool:
+        """Whether any two words could cross, i.e. a connected layout of two words may exist"""
+        return self.largest_component >= 2
+
 @dataclass
 class WordPlacement:
     word: str
@@ -16,7 +177,14 @@ class WordPlacement:
 
 @dataclass
 class CrosswordGrid:
-    grid: List[List[Optional[str]]]
+    grid: LetterGrid
     width: int
     height: int
-    word_placements: List[WordPlacement]
\ No newline at end of file
+    word_placements: List[WordPlacement]
+    unplaced_words: List[str] = field(default_factory=list)
+    search_nodes: int = 0  # Nodes expanded by backtracking, moves made by anneal (0 for greedy)
+    stats: Optional[GenerationStats] = None
+
+    @property
+    def all_words_placed(self) -> bool:
+        return not self.unplaced_words
@@ -0,0 +1,187 @@
+import multiprocessing
+import os
+import random
+import threading
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Deque, List, Optional, Set, Tuple
+
+from src.crossword_generator import CrosswordGenerator
+from src.models import CrosswordGrid, Direction, EMPTY_CELL
+
+DEFAULT_ATTEMPTS = 8
+# Portfolio calls that can hold an early-exit flag at once; further calls run without one
+DEFAULT_STOP_SLOTS = 256
+
+
+class StopFlags:
+    """Early-exit flags in shared memory, one slot per running portfolio call.
+
+    Pools made by create_attempt_pool hand the array to their workers when they start, so
+    a call can claim a slot, pass its index to its attempts and set it once a winner is
+    found; the attempts poll it between words and give up. Released slots are reused
+    oldest first, which leaves stragglers of a finished call time to see their flag."""
+
+    def __init__(self, slots: int = DEFAULT_STOP_SLOTS):
+        self.array = multiprocessing.Array("b", slots, lock=False)
+        self._free: Deque[int] = deque(range(slots))
+        self._lock = threading.Lock()
+
+    def claim(self) -> Optional[int]:
+        with self._lock:
+            if not self._free:
+                return None
+            slot = self._free.popleft()
+        self.array[slot] = 0
+        return slot
+
+    def release(self, slot: int) -> None:
+        """Stop the attempts using slot and make it available again"""
+        self.array[slot] = 1
+        with self._lock:
+            self._free.append(slot)
+
+
+_stop_flags: Optional[StopFlags] = None
+_stop_flags_lock = threading.Lock()
+# The flags array inside an attempt worker, set by _init_attempt_worker
+_worker_flags = None
+
+
+def stop_flags() -> StopFlags:
+    """This process's StopFlags, created on first use"""
+    global _stop_flags
+    with _stop_flags_lock:
+        if _stop_flags is None:
+            _stop_flags = StopFlags()
+        return _stop_flags
+
+
+def create_attempt_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Process pool whose workers see the stop flags, so generate_portfolio can stop
+    attempts it no longer needs. Other executors work too, without the early stop."""
+    return ProcessPoolExecutor(max_workers=max_workers, initializer=_init_attempt_worker,
+                               initargs=(stop_flags().array,))
+
+
+def _init_attempt_worker(flags) -> None:
+    global _worker_flags
+    _worker_flags = flags
+
+
+def attempt_ordering(words: List[str], seed: int, attempt: int) -> List[str]:
+    """Word ordering for one portfolio attempt.
+    Attempt 0 keeps the caller's order, so the portfolio is never worse than the plain
+    greedy pass. Later attempts rotate the first word through the list and shuffle the rest."""
+    if attempt == 0 or len(words) < 2:
+        return list(words)
+    first_idx = (attempt - 1) % len(words)
+    rest = words[:first_idx] + words[first_idx + 1:]
+    random.Random(f"{seed}:{attempt}").shuffle(rest)
+    return [words[first_idx]] + rest
+
+
+def layout_bounds(crossword: CrosswordGrid) -> Tuple[int, int, int, int]:
+    """(min_row, min_col, max_row, max_col) covered by the placed words"""
+    rows, cols = [], []
+    for placement in crossword.word_placements:
+        rows.append(placement.start_row)
+        cols.append(placement.start_col)
+        if placement.direction == Direction.HORIZONTAL:
+            rows.append(placement.start_row)
+            cols.append(placement.start_col + len(placement.word) - 1)
+        else:
+            rows.append(placement.start_row + len(placement.word) - 1)
+            cols.append(placement.start_col)
+    if not rows:
+        return 0, 0, -1, -1
+    return min(rows), min(cols), max(rows), max(cols)
+
+
+def score_layout(crossword: CrosswordGrid) -> Tuple[int, float]:
+    """Placed-word count first, then compactness (filled cells / bounding-box area)"""
+    min_row, min_col, max_row, max_col = layout_bounds(crossword)
+    area = (max_row - min_row + 1) * (max_col - min_col + 1)
+    if area <= 0:
+        return 0, 0.0
+    filled = len(crossword.grid.cells) - crossword.grid.cells.count(EMPTY_CELL)
+    return len(crossword.word_placements), filled / area
+
+
+def run_attempt(words: List[str], grid_size: int, seed: int, attempt: int,
+                collect_stats: bool = False, stop_slot: Optional[int] = None) -> CrosswordGrid:
+    """Generate one portfolio candidate. Module-level so it can be pickled to worker processes.
+    In a create_attempt_pool worker the attempt stops early once stop_slot is set."""
+    generator = CrosswordGenerator(attempt_ordering(words, seed, attempt), grid_size, collect_stats=collect_stats)
+    flags = _worker_flags
+    if stop_slot is None or flags is None:
+        return generator.generate_crossword()
+    return generator.generate_crossword(should_stop=lambda: flags[stop_slot] != 0)
+
+
+def generate_portfolio(words: List[str], grid_size: int = 15, attempts: int = DEFAULT_ATTEMPTS,
+                       seed: int = 0, max_workers: Optional[int] = None,
+                       target_words: Optional[int] = None,
+                       executor: Optional[Executor] = None,
+                       collect_stats: bool = False) -> CrosswordGrid:
+    """Run several seeded word orderings in parallel and return the best-scoring layout.
+
+    As soon as one attempt places at least target_words words (default: every word)
+    that layout is returned, attempts that have not started are dropped and running ones
+    are told to stop through a StopFlags slot. Pass an existing executor to reuse a warm
+    pool (made with create_attempt_pool, or running attempts finish in the background);
+    otherwise one with max_workers workers (default: one per core) is created for the
+    call. max_workers=1 runs in-process.
+    With an early exit the winner is the best attempt finished at that moment, so
+    parallel runs can differ from in-process ones; without one they always agree.
+    With collect_stats the winner carries the GenerationStats of its own attempt."""
+    if attempts < 1:
+        raise ValueError("attempts must be at least 1")
+    words = [word.upper() for word in words]
+    target = len(words) if target_words is None else target_words
+
+    if executor is None and (max_workers or os.cpu_count() or 1) <= 1:
+        return _run_sequential(words, grid_size, attempts, seed, target, collect_stats)
+
+    own_executor = executor is None
+    pool = executor or create_attempt_pool(max_workers)
+    flags = stop_flags()
+    slot = flags.claim()
+    futures: List[Future] = [pool.submit(run_attempt, words, grid_size, seed, i, collect_stats, slot)
+                             for i in range(attempts)]
+    best: Optional[Tuple[Tuple[int, float, int], CrosswordGrid]] = None
+    pending: Set[Future] = set(futures)
+    try:
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                crossword = future.result()
+                attempt = futures.index(future)
+                # Ties go to the lower attempt number so results are reproducible
+                key = score_layout(crossword) + (-attempt,)
+                if best is None or key > best[0]:
+                    best = (key, crossword)
+            if best is not None and best[0][0] >= target:
+                break
+    finally:
+        # First good-enough result wins: drop attempts not started yet, stop the running ones
+        for future in futures:
+            future.cancel()
+        if slot is not None:
+            flags.release(slot)
+        if own_executor:
+            pool.shutdown(wait=False, cancel_futures=True)
+    return best[1]
+
+
+def _run_sequential(words: List[str], grid_size: int, attempts: int, seed: int,
+                    target: int, collect_stats: bool) -> CrosswordGrid:
+    best: Optional[Tuple[Tuple[int, float], CrosswordGrid]] = None
+    for attempt in range(attempts):
+        crossword = run_attempt(words, grid_size, seed, attempt, collect_stats)
+        key = score_layout(crossword)
+        if best is None or key > best[0]:
+            best = (key, crossword)
+        if best[0][0] >= target:
+            break
+    return best[1]
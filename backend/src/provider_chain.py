@@ -0,0 +1,216 @@
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_HEDGE_DELAY = 2.0
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_COOLDOWN_SECONDS = 30.0
+# Recent calls per provider kept for the latency percentiles
+LATENCY_WINDOW = 200
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stops calling a provider after failure_threshold consecutive failures.
+    After cooldown_seconds one trial call is let through (half open); its outcome
+    closes the breaker again or restarts the cooldown."""
+
+    def __init__(self, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 cooldown_seconds: float = DEFAULT_COOLDOWN_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.clock = clock
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_running = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return CLOSED
+        if self.clock() - self.opened_at >= self.cooldown_seconds:
+            return HALF_OPEN
+        return OPEN
+
+    def acquire(self) -> Optional[str]:
+        """Claim a call: CLOSED for an ordinary one, HALF_OPEN when it is the single trial,
+        None when no call may start now. Pass trial=(result == HALF_OPEN) to the outcome."""
+        state = self.state
+        if state == CLOSED:
+            return CLOSED
+        if state == HALF_OPEN and not self.trial_running:
+            self.trial_running = True
+            return HALF_OPEN
+        return None
+
+    def allow(self) -> bool:
+        """Whether a call may start now; claims the single trial slot when half open"""
+        return self.acquire() is not None
+
+    def record_success(self, trial: bool = True) -> None:
+        self.failures = 0
+        self.opened_at = None
+        if trial:
+            self.trial_running = False
+
+    def record_failure(self, trial: bool = True) -> None:
+        self.failures += 1
+        if trial or self.failures >= self.failure_threshold:
+            self.opened_at = self.clock()
+        if trial:
+            self.trial_running = False
+
+    def release(self, trial: bool = True) -> None:
+        """The call was abandoned (lost a race) without an outcome; only a trial frees its slot"""
+        if trial:
+            self.trial_running = False
+
+
+@dataclass
+class ProviderStats:
+    provider: str
+    state: str
+    calls: int
+    successes: int
+    failures: int
+    cancelled: int  # Lost the race to another provider and were abandoned
+    skipped: int  # Not called because the breaker was open
+    wins: int  # Produced the result the caller got
+    p50_seconds: float
+    p95_seconds: float
+    p99_seconds: float
+
+
+class ProviderRecord:
+    def __init__(self, breaker: CircuitBreaker):
+        self.breaker = breaker
+        self.calls = 0
+        self.successes = 0
+        self.failures = 0
+        self.cancelled = 0
+        self.skipped = 0
+        self.wins = 0
+        self.latencies: deque = deque(maxlen=LATENCY_WINDOW)
+
+    def percentile(self, fraction: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class ProviderChain:
+    """Calls providers in order, hedging and racing them.
+
+    The first available provider is called; if it has not answered within hedge_delay
+    seconds the next one is started alongside it, and so on down the chain. A failure
+    starts the next provider at once. The first successful result wins and the other
+    calls are cancelled. Providers whose circuit breaker is open are skipped."""
+
+    def __init__(self, providers: List[str], hedge_delay: float = DEFAULT_HEDGE_DELAY,
+                 failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 cooldown_seconds: float = DEFAULT_COOLDOWN_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        if not providers:
+            raise ValueError("A provider chain needs at least one provider")
+        self.providers = list(providers)
+        self.hedge_delay = hedge_delay
+        self.clock = clock
+        self.hedges = 0  # Calls started because an earlier provider was slow
+        self.records: Dict[str, ProviderRecord] = {
+            provider: ProviderRecord(CircuitBreaker(failure_threshold, cooldown_seconds, clock))
+            for provider in self.providers
+        }
+
+    async def call(self, make_call: Callable[[str], Awaitable[T]]) -> T:
+        """Result of the first provider to succeed; make_call(provider) starts one call.
+        Raises the last provider error if every provider fails or is skipped."""
+        remaining = list(self.providers)
+        running: Dict[asyncio.Task, str] = {}
+        started_at: Dict[asyncio.Task, float] = {}
+        # Tasks holding their breaker's half-open trial slot; breakers are shared across calls
+        trials = set()
+        last_error: Exception = RuntimeError("No provider in the chain is available")
+
+        def start_next() -> bool:
+            while remaining:
+                provider = remaining.pop(0)
+                record = self.records[provider]
+                claim = record.breaker.acquire()
+                if claim is None:
+                    record.skipped += 1
+                    continue
+                record.calls += 1
+                task = asyncio.ensure_future(make_call(provider))
+                running[task] = provider
+                started_at[task] = self.clock()
+                if claim == HALF_OPEN:
+                    trials.add(task)
+                return True
+            return False
+
+        try:
+            start_next()
+            while running:
+                timeout = self.hedge_delay if remaining else None
+                done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # Slow provider: hedge with the next one but keep waiting on both
+                    if start_next():
+                        self.hedges += 1
+                    continue
+                # Record every finished call before picking a winner, so none is miscounted as cancelled
+                winner: Optional[asyncio.Task] = None
+                winner_record: Optional[ProviderRecord] = None
+                for task in done:
+                    provider = running.pop(task)
+                    record = self.records[provider]
+                    record.latencies.append(self.clock() - started_at.pop(task))
+                    trial = task in trials
+                    trials.discard(task)
+                    if task.exception() is None:
+                        record.successes += 1
+                        record.breaker.record_success(trial)
+                        if winner is None:
+                            winner, winner_record = task, record
+                    else:
+                        record.failures += 1
+                        record.breaker.record_failure(trial)
+                        last_error = task.exception()
+                if winner is not None:
+                    winner_record.wins += 1
+                    return winner.result()
+                for _ in done:
+                    start_next()
+            raise last_error
+        finally:
+            for task, provider in running.items():
+                task.cancel()
+                self.records[provider].cancelled += 1
+                self.records[provider].breaker.release(task in trials)
+
+    def stats(self) -> List[ProviderStats]:
+        return [
+            ProviderStats(
+                provider=provider,
+                state=record.breaker.state,
+                calls=record.calls,
+                successes=record.successes,
+                failures=record.failures,
+                cancelled=record.cancelled,
+                skipped=record.skipped,
+                wins=record.wins,
+                p50_seconds=record.percentile(0.50),
+                p95_seconds=record.percentile(0.95),
+                p99_seconds=record.percentile(0.99)
+            )
+            for provider, record in self.records.items()
+        ]
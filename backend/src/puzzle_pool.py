@@ -0,0 +1,301 @@
+import asyncio
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import IO, Awaitable, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Not on Windows; every process warms there
+    fcntl = None
+
+from src.generation import GenerationResult
+from src.topic_cache import TopicResult, normalize_topic
+
+DEFAULT_DEPTH = 2
+DEFAULT_CONCURRENCY = 2
+DEFAULT_MAX_AGE_SECONDS = 3600.0
+DEFAULT_REFILL_INTERVAL = 30.0
+# With a shared store takes in other workers cannot wake the warmer, so it checks this often
+SHARED_POLL_SECONDS = 1.0
+STORE_TIMEOUT_SECONDS = 5.0
+
+
+@dataclass
+class WarmPuzzle:
+    """A finished topic puzzle: the LLM answer, the layout with clues attached, and word -> clue"""
+    topic_result: TopicResult
+    result: GenerationResult
+    clues: Dict[str, str]
+
+
+@dataclass
+class PuzzlePoolStats:
+    topics: int = 0
+    depth: int = 0
+    ready: Dict[str, int] = field(default_factory=dict)  # topic -> puzzles waiting
+    hits: int = 0  # Requests served a ready puzzle
+    misses: int = 0  # Requests for a hot topic that found none ready
+    builds: int = 0
+    failures: int = 0
+    expired: int = 0  # Dropped unserved after max_age_seconds
+    warmer: bool = False  # This process runs the refill task
+    shared: bool = False  # Ready puzzles live in a store every worker takes from
+
+
+class PuzzlePool:
+    """Ready-made puzzles for a fixed list of hot topics.
+
+    take() hands out a waiting puzzle and wakes the refiller; run() is the background
+    task that keeps depth puzzles per topic, building at most concurrency at a time so
+    refills stay within provider rate limits. Puzzles older than max_age_seconds are
+    dropped so a topic's words do not go stale while nobody asks for it.
+
+    Worker processes of one server share lock_path: only the worker that claims it runs
+    the refill task, so the LLM calls it makes do not multiply with the worker count.
+    They also share store_path, a SQLite file holding the ready puzzles, so every worker
+    takes from what that one warmer builds. A take pops in an IMMEDIATE transaction, so
+    no puzzle is served twice; async callers use atake to keep it off the event loop.
+    The hit, miss and build counters count this process only."""
+
+    def __init__(self, topics: List[str], depth: int = DEFAULT_DEPTH, concurrency: int = DEFAULT_CONCURRENCY,
+                 max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS, clock: Callable[[], float] = time.time,
+                 lock_path: Optional[str] = None, store_path: Optional[str] = None):
+        self.topics = list(dict.fromkeys(normalize_topic(topic) for topic in topics if topic.strip()))
+        self.depth = depth
+        self.concurrency = max(1, concurrency)
+        self.max_age_seconds = max_age_seconds
+        self.clock = clock
+        self.lock_path = lock_path
+        self.warmer = False
+        self.hits = 0
+        self.misses = 0
+        self.builds = 0
+        self.failures = 0
+        self.expired = 0
+        # topic -> (built_at, puzzle), oldest first
+        self._ready: Dict[str, Deque[Tuple[float, WarmPuzzle]]] = {topic: deque() for topic in self.topics}
+        self._building: Dict[str, int] = {topic: 0 for topic in self.topics}
+        # Created by run() so it belongs to the serving event loop
+        self._wakeup: Optional[asyncio.Event] = None
+        # Held open while this process is the warmer; the lock goes with the process
+        self._lock_file: Optional[IO] = None
+        self._db_lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if store_path and self.topics:
+            # Autocommit mode: transactions are opened explicitly by _transaction
+            self._db = sqlite3.connect(store_path, timeout=STORE_TIMEOUT_SECONDS,
+                                       isolation_level=None, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS puzzles (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "topic TEXT NOT NULL, built_at REAL NOT NULL, puzzle BLOB NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS puzzles_topic ON puzzles (topic, id)")
+
+    @classmethod
+    def from_env(cls) -> "PuzzlePool":
+        """Configure from PUZZLE_POOL_TOPICS (comma separated; unset: no warming),
+        PUZZLE_POOL_DEPTH, PUZZLE_POOL_CONCURRENCY, PUZZLE_POOL_MAX_AGE_SECONDS,
+        PUZZLE_POOL_LOCK_PATH and PUZZLE_POOL_PATH (both set by start_server.py when it
+        runs several workers)"""
+        return cls(
+            topics=os.getenv("PUZZLE_POOL_TOPICS", "").split(","),
+            depth=int(os.getenv("PUZZLE_POOL_DEPTH", DEFAULT_DEPTH)),
+            concurrency=int(os.getenv("PUZZLE_POOL_CONCURRENCY", DEFAULT_CONCURRENCY)),
+            max_age_seconds=float(os.getenv("PUZZLE_POOL_MAX_AGE_SECONDS", DEFAULT_MAX_AGE_SECONDS)),
+            lock_path=os.getenv("PUZZLE_POOL_LOCK_PATH") or None,
+            store_path=os.getenv("PUZZLE_POOL_PATH") or None
+        )
+
+    @property
+    def shared(self) -> bool:
+        return self._db is not None
+
+    def claim_warmer(self) -> bool:
+        """Whether this process should run the refill task: always without a lock_path,
+        otherwise only if no other process holds the lock"""
+        if self.warmer or self.lock_path is None or fcntl is None:
+            self.warmer = True
+            return True
+        lock_file = open(self.lock_path, "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        self.warmer = True
+        return True
+
+    def release_warmer(self) -> None:
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+        self.warmer = False
+
+    def take(self, topic: str) -> Optional[WarmPuzzle]:
+        """A ready puzzle for topic, or None if it is not a hot topic or none is ready"""
+        topic = normalize_topic(topic)
+        if topic not in self._ready:
+            return None
+        return self._served(self._pop(topic))
+
+    async def atake(self, topic: str) -> Optional[WarmPuzzle]:
+        """take, in a thread when the store is shared: it can wait on other workers' writes"""
+        topic = normalize_topic(topic)
+        if topic not in self._ready:
+            return None
+        return self._served(await self._call(self._pop, topic))
+
+    async def fill(self, build: Callable[[str], Awaitable[WarmPuzzle]]) -> int:
+        """Build puzzles until every topic has depth of them ready, returning how many were built"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def build_one(topic: str) -> bool:
+            try:
+                async with semaphore:
+                    puzzle = await build(topic)
+                await self._call(self._push, topic, puzzle)
+            except Exception as e:
+                self.failures += 1
+                print(f"Warming a puzzle for '{topic}' failed: {e}")
+                return False
+            finally:
+                self._building[topic] -= 1
+            self.builds += 1
+            return True
+
+        try:
+            ready = await self._call(self._ready_counts)
+        except sqlite3.Error as e:
+            print(f"⚠️  Puzzle pool store unavailable, retrying on the next refill: {e}")
+            return 0
+        jobs = []
+        for topic in self.topics:
+            for _ in range(self.depth - ready[topic] - self._building[topic]):
+                self._building[topic] += 1
+                jobs.append(build_one(topic))
+        return sum(await asyncio.gather(*jobs))
+
+    async def run(self, build: Callable[[str], Awaitable[WarmPuzzle]],
+                  interval_seconds: float = DEFAULT_REFILL_INTERVAL) -> None:
+        """Background task: fill now, then again after every take() or interval_seconds.
+        With a shared store takes in other workers are noticed within SHARED_POLL_SECONDS."""
+        self._wakeup = asyncio.Event()
+        if self.shared:
+            interval_seconds = min(interval_seconds, SHARED_POLL_SECONDS)
+        while True:
+            self._wakeup.clear()
+            await self.fill(build)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self) -> PuzzlePoolStats:
+        """Counters for this process; with a shared store, reads it (run in a thread from async code)"""
+        return PuzzlePoolStats(
+            topics=len(self.topics),
+            depth=self.depth,
+            ready=self._ready_counts(),
+            hits=self.hits,
+            misses=self.misses,
+            builds=self.builds,
+            failures=self.failures,
+            expired=self.expired,
+            warmer=self.warmer,
+            shared=self.shared
+        )
+
+    def close(self) -> None:
+        if self._db is not None:
+            with self._db_lock:
+                self._db.close()
+                self._db = None
+
+    def _served(self, puzzle: Optional[WarmPuzzle]) -> Optional[WarmPuzzle]:
+        """Count a take of a hot topic and wake the refiller"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+        if puzzle is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return puzzle
+
+    async def _call(self, method: Callable, *args):
+        if self.shared:
+            return await asyncio.to_thread(method, *args)
+        return method(*args)
+
+    def _pop(self, topic: str) -> Optional[WarmPuzzle]:
+        """Remove and return the oldest fresh puzzle for topic; a store failure is a miss"""
+        if self._db is None:
+            ready = self._ready[topic]
+            self._prune(ready)
+            return ready.popleft()[1] if ready else None
+        try:
+            with self._transaction() as db:
+                self._prune_store(db)
+                row = db.execute(
+                    "SELECT id, puzzle FROM puzzles WHERE topic = ? ORDER BY id LIMIT 1", (topic,)
+                ).fetchone()
+                if row is None:
+                    return None
+                db.execute("DELETE FROM puzzles WHERE id = ?", (row[0],))
+        except sqlite3.Error as e:
+            print(f"⚠️  Puzzle pool store unavailable, building instead: {e}")
+            return None
+        return pickle.loads(row[1])
+
+    def _push(self, topic: str, puzzle: WarmPuzzle) -> None:
+        if self._db is None:
+            self._ready[topic].append((self.clock(), puzzle))
+            return
+        blob = pickle.dumps(puzzle, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._transaction() as db:
+            db.execute("INSERT INTO puzzles (topic, built_at, puzzle) VALUES (?, ?, ?)",
+                       (topic, self.clock(), blob))
+
+    def _ready_counts(self) -> Dict[str, int]:
+        """topic -> fresh puzzles waiting, after dropping the expired ones"""
+        if self._db is None:
+            for ready in self._ready.values():
+                self._prune(ready)
+            return {topic: len(ready) for topic, ready in self._ready.items()}
+        counts = dict.fromkeys(self.topics, 0)
+        with self._transaction() as db:
+            self._prune_store(db)
+            for topic, count in db.execute("SELECT topic, COUNT(*) FROM puzzles GROUP BY topic"):
+                if topic in counts:
+                    counts[topic] = count
+        return counts
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._db_lock:
+            if self._db is None:
+                raise sqlite3.ProgrammingError("The puzzle pool store is closed")
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._db
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+
+    def _prune(self, ready: Deque[Tuple[float, WarmPuzzle]]) -> None:
+        oldest = self.clock() - self.max_age_seconds
+        while ready and ready[0][0] <= oldest:
+            ready.popleft()
+            self.expired += 1
+
+    def _prune_store(self, db: sqlite3.Connection) -> None:
+        cursor = db.execute("DELETE FROM puzzles WHERE built_at <= ?", (self.clock() - self.max_age_seconds,))
+        self.expired += max(cursor.rowcount, 0)
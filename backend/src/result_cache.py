@@ -0,0 +1,176 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Callable, List, Optional, Tuple
+
+from src.generation import GenerationOptions
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+DEFAULT_TTL_SECONDS = 3600.0
+# How long a disk read or write waits for another worker's write lock before giving up
+DISK_TIMEOUT_SECONDS = 5.0
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0  # Entries dropped from memory to stay under max_bytes
+    expirations: int = 0  # Entries dropped because their TTL ran out
+    disk_hits: int = 0  # Hits served from the on-disk store (also counted in hits)
+    disk_errors: int = 0  # Disk reads and writes that failed (locked, full, ...); the memory tier still works
+    entries: int = 0
+    bytes: int = 0
+    max_bytes: int = 0
+
+
+class ResultCache:
+    """LRU cache of serialized /generate-crossword responses with a TTL.
+
+    Memory use is capped at max_bytes of stored keys and values; the least recently
+    used entries are evicted first. With a path, every entry is also written to a
+    SQLite file, which serves misses from memory and survives restarts. Expiry uses
+    wall-clock time so entries read back from disk keep their original deadline.
+    Disk access can wait on other workers' writes, so async callers should run get and
+    put in a thread when persistent; a failing disk only costs the cache, never the caller."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 path: Optional[str] = None, clock: Callable[[], float] = time.time):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.counters = CacheStats(max_bytes=max_bytes)
+        # key -> (expires_at, value), oldest first
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        # Separate from _lock so memory hits never wait behind disk I/O
+        self._db_lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if path:
+            self._db = sqlite3.connect(path, timeout=DISK_TIMEOUT_SECONDS, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.execute("DELETE FROM results WHERE expires_at <= ?", (self.clock(),))
+            self._db.commit()
+
+    @classmethod
+    def from_env(cls) -> "ResultCache":
+        """Configure from CROSSWORD_CACHE_MAX_BYTES (0 disables the memory tier),
+        CROSSWORD_CACHE_TTL_SECONDS and CROSSWORD_CACHE_PATH (unset: memory only)"""
+        return cls(
+            max_bytes=int(os.getenv("CROSSWORD_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)),
+            ttl_seconds=float(os.getenv("CROSSWORD_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)),
+            path=os.getenv("CROSSWORD_CACHE_PATH") or None
+        )
+
+    @staticmethod
+    def make_key(words: List[str], options: GenerationOptions) -> str:
+        """Canonical key: the cleaned words in sorted order (duplicates kept) plus every engine option.
+        Requests that differ only in word order share an entry and get the layout of the first one."""
+        canonical = json.dumps([sorted(words), asdict(options)], sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    @property
+    def persistent(self) -> bool:
+        """Whether get and put may touch the disk store"""
+        return self._db is not None
+
+    def get(self, key: str) -> Optional[bytes]:
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.counters.hits += 1
+                    return entry[1]
+                self._discard(key)
+                self.counters.expirations += 1
+        row = self._read_disk(key, now)
+        with self._lock:
+            if row is None:
+                self.counters.misses += 1
+                return None
+            value, expires_at = bytes(row[0]), row[1]
+            self._store(key, value, expires_at)
+            self.counters.hits += 1
+            self.counters.disk_hits += 1
+            return value
+
+    def put(self, key: str, value: bytes) -> None:
+        expires_at = self.clock() + self.ttl_seconds
+        with self._lock:
+            self._store(key, value, expires_at)
+        with self._db_lock:
+            if self._db is None:
+                return
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO results (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, value, expires_at)
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                self._disk_failed("write", e)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        with self._db_lock:
+            if self._db is not None:
+                self._db.execute("DELETE FROM results")
+                self._db.commit()
+
+    def close(self) -> None:
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(**{**asdict(self.counters), "entries": len(self._entries), "bytes": self._bytes})
+
+    def _read_disk(self, key: str, now: float) -> Optional[Tuple[bytes, float]]:
+        with self._db_lock:
+            if self._db is None:
+                return None
+            try:
+                return self._db.execute(
+                    "SELECT value, expires_at FROM results WHERE key = ? AND expires_at > ?", (key, now)
+                ).fetchone()
+            except sqlite3.Error as e:
+                self._disk_failed("read", e)
+                return None
+
+    def _disk_failed(self, operation: str, error: sqlite3.Error) -> None:
+        if self._db.in_transaction:
+            self._db.rollback()
+        with self._lock:
+            self.counters.disk_errors += 1
+        print(f"⚠️  Result cache disk {operation} failed: {error}")
+
+    def _store(self, key: str, value: bytes, expires_at: float) -> None:
+        self._discard(key)
+        size = len(key) + len(value)
+        if size > self.max_bytes:
+            return  # Too large for the memory tier; the disk store still keeps it
+        while self._bytes + size > self.max_bytes:
+            self._discard(next(iter(self._entries)))
+            self.counters.evictions += 1
+        self._entries[key] = (expires_at, value)
+        self._bytes += size
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(key) + len(entry[1])
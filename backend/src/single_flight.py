@@ -0,0 +1,45 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class SingleFlightStats:
+    calls: int = 0
+    leaders: int = 0  # Calls that ran the underlying work
+    coalesced: int = 0  # Calls that joined work already in flight
+    in_flight: int = 0
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key onto one in-flight task.
+
+    The first caller for a key starts the work; callers arriving before it finishes
+    await the same task instead of starting their own. The work runs as its own task,
+    so a leader that gives up (client disconnect) does not cancel it for the others.
+    Nothing is remembered after the task ends: this deduplicates, it does not cache."""
+
+    def __init__(self):
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self.calls = 0
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, work: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """(result, coalesced) for work keyed by key; exceptions reach every waiting caller"""
+        self.calls += 1
+        task = self._tasks.get(key)
+        coalesced = task is not None
+        if coalesced:
+            self.coalesced += 1
+        else:
+            self.leaders += 1
+            task = asyncio.ensure_future(work())
+            self._tasks[key] = task
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        return await asyncio.shield(task), coalesced
+
+    def stats(self) -> SingleFlightStats:
+        return SingleFlightStats(self.calls, self.leaders, self.coalesced, len(self._tasks))
@@ -0,0 +1,179 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600.0
+DEFAULT_MAX_ENTRIES = 1000
+# How long a disk read or write waits for another worker's write lock before giving up
+DISK_TIMEOUT_SECONDS = 5.0
+
+
+@dataclass
+class TopicResult:
+    """Word-clue pairs for a topic and where they came from"""
+    word_clues: List[Dict[str, str]]
+    provider: str
+    model: str
+    created_at: float = 0.0
+    cached: bool = False
+    coalesced: bool = False  # Shared with a concurrent identical request
+
+
+@dataclass
+class TopicCacheStats:
+    hits: int = 0
+    misses: int = 0
+    disk_hits: int = 0
+    disk_errors: int = 0  # Failed disk reads and writes; they cost the cache, never the caller
+    entries: int = 0
+    by_provider: Dict[str, int] = field(default_factory=dict)  # provider -> entries in memory
+
+
+def normalize_topic(topic: str) -> str:
+    """Cache key for a topic: case and runs of whitespace do not matter"""
+    return " ".join(topic.lower().split())
+
+
+class TopicCache:
+    """Topic -> word/clue cache with a TTL, so repeated topics skip the LLM call.
+
+    The in-memory tier holds up to max_entries topics, least recently used first out.
+    With a path every entry is also kept in SQLite, which serves memory misses and
+    survives restarts. Each entry records the provider and model that produced it.
+    Async callers use aget and aput, which keep disk access off the event loop."""
+
+    def __init__(self, ttl_seconds: float = DEFAULT_TTL_SECONDS, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 path: Optional[str] = None, clock: Callable[[], float] = time.time):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.disk_errors = 0
+        self._entries: "OrderedDict[str, TopicResult]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Separate from _lock so memory hits never wait behind disk I/O
+        self._db_lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if path:
+            self._db = sqlite3.connect(path, timeout=DISK_TIMEOUT_SECONDS, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS topics (topic TEXT PRIMARY KEY, word_clues TEXT NOT NULL, "
+                "provider TEXT NOT NULL, model TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._db.execute("DELETE FROM topics WHERE created_at <= ?", (self.clock() - self.ttl_seconds,))
+            self._db.commit()
+
+    @classmethod
+    def from_env(cls) -> "TopicCache":
+        """Configure from TOPIC_CACHE_TTL_SECONDS, TOPIC_CACHE_MAX_ENTRIES and
+        TOPIC_CACHE_PATH (unset: memory only)"""
+        return cls(
+            ttl_seconds=float(os.getenv("TOPIC_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)),
+            max_entries=int(os.getenv("TOPIC_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+            path=os.getenv("TOPIC_CACHE_PATH") or None
+        )
+
+    @property
+    def persistent(self) -> bool:
+        """Whether get and put may touch the disk store"""
+        return self._db is not None
+
+    def get(self, topic: str) -> Optional[TopicResult]:
+        key = normalize_topic(topic)
+        oldest = self.clock() - self.ttl_seconds
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.created_at <= oldest:
+                del self._entries[key]
+                entry = None
+        if entry is None:
+            row = self._read_disk(key, oldest)
+            if row is not None:
+                entry = TopicResult(json.loads(row[0]), row[1], row[2], row[3])
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            if key not in self._entries:
+                self._remember(key, entry)
+                self.disk_hits += 1
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return TopicResult(**{**asdict(entry), "cached": True})
+
+    def put(self, topic: str, result: TopicResult) -> None:
+        key = normalize_topic(topic)
+        entry = TopicResult(result.word_clues, result.provider, result.model, created_at=self.clock())
+        with self._lock:
+            self._remember(key, entry)
+        with self._db_lock:
+            if self._db is None:
+                return
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO topics (topic, word_clues, provider, model, created_at) VALUES (?, ?, ?, ?, ?)",
+                    (key, json.dumps(entry.word_clues), entry.provider, entry.model, entry.created_at)
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                self._disk_failed("write", e)
+
+    async def aget(self, topic: str) -> Optional[TopicResult]:
+        if self.persistent:
+            return await asyncio.to_thread(self.get, topic)
+        return self.get(topic)
+
+    async def aput(self, topic: str, result: TopicResult) -> None:
+        if self.persistent:
+            await asyncio.to_thread(self.put, topic, result)
+        else:
+            self.put(topic, result)
+
+    def stats(self) -> TopicCacheStats:
+        with self._lock:
+            by_provider: Dict[str, int] = {}
+            for entry in self._entries.values():
+                by_provider[entry.provider] = by_provider.get(entry.provider, 0) + 1
+            return TopicCacheStats(self.hits, self.misses, self.disk_hits, self.disk_errors,
+                                   len(self._entries), by_provider)
+
+    def close(self) -> None:
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _read_disk(self, key: str, oldest: float) -> Optional[tuple]:
+        with self._db_lock:
+            if self._db is None:
+                return None
+            try:
+                return self._db.execute(
+                    "SELECT word_clues, provider, model, created_at FROM topics WHERE topic = ? AND created_at > ?",
+                    (key, oldest)
+                ).fetchone()
+            except sqlite3.Error as e:
+                self._disk_failed("read", e)
+                return None
+
+    def _disk_failed(self, operation: str, error: sqlite3.Error) -> None:
+        if self._db.in_transaction:
+            self._db.rollback()
+        with self._lock:
+            self.disk_errors += 1
+        print(f"⚠️  Topic cache disk {operation} failed: {error}")
+
+    def _remember(self, key: str, entry: TopicResult) -> None:
+        self._entries.pop(key, None)
+        self._entries[key] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -0,0 +1,97 @@
+import gzip
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # Listed in requirements.txt; the standard library encoder covers installs without it
+    orjson = None
+
+# Opt in with "Accept: application/vnd.crossword.compact+json" or ?format=compact
+COMPACT_MEDIA_TYPE = "application/vnd.crossword.compact+json"
+COMPACT_FORMAT = "compact"
+# Stands in for an empty cell in the row strings, as in LetterGrid.rows(); never a letter the grid can hold
+BLANK = "."
+DIRECTION_CODES = {"horizontal": "h", "vertical": "v"}
+PLACEMENT_COLUMNS = ("word", "start_row", "start_col", "direction", "number", "clue")
+DEFAULT_GZIP_MIN_BYTES = 1024
+
+
+def wants_compact(accept: Optional[str], format_param: Optional[str]) -> bool:
+    """Whether the client asked for the compact encoding; the query parameter wins over Accept"""
+    if format_param:
+        return format_param == COMPACT_FORMAT
+    return bool(accept) and COMPACT_MEDIA_TYPE in accept
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """Whether Accept-Encoding lists gzip (or *) without q=0"""
+    for coding in (accept_encoding or "").split(","):
+        name, *params = [part.strip() for part in coding.split(";")]
+        if name not in ("gzip", "*"):
+            continue
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    return float(value) > 0
+                except ValueError:
+                    return False
+        return True
+    return False
+
+
+@dataclass
+class WireFormat:
+    compact: bool = False
+    gzip: bool = False
+
+
+def negotiate(accept: Optional[str], accept_encoding: Optional[str], format_param: Optional[str]) -> WireFormat:
+    compact = wants_compact(accept, format_param)
+    return WireFormat(compact, compact and accepts_gzip(accept_encoding))
+
+
+def compact_grid(grid: List[List[Optional[str]]]) -> List[str]:
+    """One string per row, BLANK for empty cells"""
+    return ["".join([cell or BLANK for cell in row]) for row in grid]
+
+
+def compact_placements(placements: List[Dict[str, Any]]) -> Dict[str, list]:
+    """Placements as one array per field, index i of every array describing placement i.
+    Directions become "h"/"v"; the clue column is left out when no placement has a clue."""
+    columns = {name: [placement[name] for placement in placements] for name in PLACEMENT_COLUMNS}
+    columns["direction"] = [DIRECTION_CODES[direction] for direction in columns["direction"]]
+    if not any(columns["clue"]):
+        del columns["clue"]
+    return columns
+
+
+def compact_crossword(response: Dict[str, Any], grid_rows: Optional[List[str]] = None) -> Dict[str, Any]:
+    """A dumped CrosswordResponse (or subclass) in the compact encoding; other fields are kept as is.
+    Pass grid_rows (LetterGrid.rows()) when at hand to skip converting the nested grid."""
+    compact = dict(response)
+    compact["format"] = COMPACT_FORMAT
+    compact["blank"] = BLANK
+    compact["grid"] = compact_grid(response["grid"]) if grid_rows is None else grid_rows
+    compact["word_placements"] = compact_placements(response["word_placements"])
+    return compact
+
+
+def dumps(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def encode_compact(payload: Any, gzip_ok: bool,
+                   gzip_min_bytes: int = DEFAULT_GZIP_MIN_BYTES) -> Tuple[bytes, Dict[str, str]]:
+    """Serialized body and response headers; bodies of gzip_min_bytes or more are
+    gzipped when the client accepts it"""
+    body = dumps(payload)
+    headers = {"Vary": "Accept, Accept-Encoding"}
+    if gzip_ok and len(body) >= gzip_min_bytes:
+        body = gzip.compress(body, compresslevel=5)
+        headers["Content-Encoding"] = "gzip"
+    return body, headers
@@ -1,20 +1,123 @@
 #!/usr/bin/env python3
 """
 Simple script to start the FastAPI server
+
+Development (default): one process that reloads on changes under src/.
+Production (--production or SERVER_MODE=production): several worker processes,
+uvloop and httptools when installed, the app imported once before the workers
+start, and graceful shutdown of in-flight requests.
 """
+import argparse
+import importlib
+import importlib.util
+import os
+import shutil
+import tempfile
+import time
+from typing import Optional
+
 import uvicorn
 
-if __name__ == "__main__":
+APP = "src.api:app"
+
+
+def optional_impl(module: str) -> str:
+    """The module's name when it is installed, otherwise uvicorn's pure-Python default"""
+    return module if importlib.util.find_spec(module) is not None else "auto"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Start the Crossword Generator API server")
+    parser.add_argument("--production", action="store_true",
+                        default=os.getenv("SERVER_MODE", "development") == "production")
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--workers", type=int,
+                        default=int(os.getenv("UVICORN_WORKERS") or os.cpu_count() or 1))
+    parser.add_argument("--graceful-timeout", type=float,
+                        default=float(os.getenv("SERVER_GRACEFUL_TIMEOUT", "30")),
+                        help="Seconds in-flight requests get to finish on shutdown")
+    return parser.parse_args()
+
+
+def share_state_across_workers(workers: int) -> Optional[str]:
+    """Workers are separate processes, so clues stored by one must be readable by the
+    others: point the clue store at a shared SQLite file unless one is configured.
+    They also share a lock so only one of them warms the puzzle pool, and a SQLite file
+    holding the puzzles it warms, so every worker can serve them.
+
+    All live in a fresh directory for this run, returned so it can be removed on
+    shutdown: a restart starts empty and two servers on one host never share clues."""
+    if workers <= 1:
+        return None
+    run_dir = tempfile.mkdtemp(prefix="crossword-server-")
+    os.environ.setdefault("CLUE_STORE_PATH", os.path.join(run_dir, "clues.sqlite3"))
+    os.environ.setdefault("PUZZLE_POOL_LOCK_PATH", os.path.join(run_dir, "warmer.lock"))
+    os.environ.setdefault("PUZZLE_POOL_PATH", os.path.join(run_dir, "puzzles.sqlite3"))
+    return run_dir
+
+
+def preload_app() -> float:
+    """Import the app once before starting workers, returning the import time. A broken
+    import fails the launch here instead of in every worker, and the bytecode cache is
+    warm when the workers import it."""
+    started = time.perf_counter()
+    importlib.import_module(APP.split(":")[0])
+    return time.perf_counter() - started
+
+
+def run_production(args: argparse.Namespace) -> None:
+    launch_started = time.perf_counter()
+    run_dir = share_state_across_workers(args.workers)
+    import_seconds = preload_app()
+    loop, http = optional_impl("uvloop"), optional_impl("httptools")
+
+    print("🚀 Starting Crossword Generator API Server (production)...")
+    missing = [module for module, impl in (("uvloop", loop), ("httptools", http)) if impl == "auto"]
+    if missing:
+        print(f"⚠️  {' and '.join(missing)} not installed: falling back to the slower pure-Python "
+              f"implementation. Install uvicorn[standard] (see requirements.txt) for production.")
+    print(f"👷 Workers: {args.workers}, event loop: {loop}, HTTP parser: {http}")
+    if args.workers > 1:
+        print(f"🗂  Clues shared through {os.environ['CLUE_STORE_PATH']}")
+    print(f"⏱  App import took {import_seconds:.2f}s; launch ready after {time.perf_counter() - launch_started:.2f}s")
+    print(f"\n⚡ Starting server on http://{args.host}:{args.port}")
+
+    try:
+        uvicorn.run(
+            APP,
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            loop=loop,
+            http=http,
+            timeout_graceful_shutdown=args.graceful_timeout,
+            proxy_headers=True
+        )
+    finally:
+        if run_dir is not None:
+            shutil.rmtree(run_dir, ignore_errors=True)
+
+
+def run_development(args: argparse.Namespace) -> None:
     print("🚀 Starting Crossword Generator API Server...")
-    print("📝 API Documentation will be available at: http://localhost:8000/docs")
-    print("🔍 Health check endpoint: http://localhost:8000/health")
-    print("🧩 Generate endpoint: http://localhost:8000/generate-crossword")
-    print("\n⚡ Starting server on http://localhost:8000")
-    
+    print(f"📝 API Documentation will be available at: http://localhost:{args.port}/docs")
+    print(f"🔍 Health check endpoint: http://localhost:{args.port}/health")
+    print(f"🧩 Generate endpoint: http://localhost:{args.port}/generate-crossword")
+    print(f"\n⚡ Starting server on http://localhost:{args.port}")
+
     uvicorn.run(
-        "src.api:app", 
-        host="0.0.0.0", 
-        port=8000, 
+        APP,
+        host=args.host,
+        port=args.port,
         reload=True,
         reload_dirs=["src"]
-    )
\ No newline at end of file
+    )
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.production:
+        run_production(args)
+    else:
+        run_development(args)
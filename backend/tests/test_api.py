@@ -0,0 +1,289 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from src.api import app
+
+client = TestClient(app)
+
+
+def test_generate_crossword_fails_fast_without_shared_letters():
+    response = client.post("/generate-crossword", json={"words": ["ABC", "XYZ", "DEF"]})
+    data = response.json()
+    
+    assert response.status_code == 200
+    assert data["success"] is False
+    assert data["unplaced_words"] == ["ABC", "XYZ", "DEF"]
+    assert data["diagnostics"]["isolated_words"] == ["ABC", "XYZ", "DEF"]
+
+
+def test_fail_fast_message_names_oversized_words():
+    response = client.post("/generate-crossword", json={"words": ["CAT", "ACT", "TA"], "grid_size": 2})
+    data = response.json()
+    
+    assert data["success"] is False
+    assert data["diagnostics"]["oversized_words"] == ["CAT", "ACT"]
+    assert "Too long for the grid: CAT, ACT" in data["message"]
+    assert "No two words share a letter" not in data["message"]
+
+
+def test_generate_crossword_diagnostics_with_stats():
+    words = ["PYTHON", "CODE", "TEST", "GRID", "WORD"]
+    response = client.post("/generate-crossword", json={
+        "words": words, "placement_order": "connectivity", "include_stats": True
+    })
+    data = response.json()
+    
+    assert data["success"] is True
+    assert set(data["diagnostics"]["degrees"]) == set(words)
+    assert data["diagnostics"]["largest_component"] == len(words)
+
+
+def test_generate_crossword_batch():
+    response = client.post("/generate-crossword/batch", json={"items": [
+        {"words": ["PYTHON", "CODE", "TEST", "GRID", "WORD"]},
+        {"words": ["CAT", "D0G"]},
+        {"words": ["TOY", "STORY", "WOODY", "BUZZ"], "engine": "sparse"},
+    ]})
+    data = response.json()
+    
+    assert response.status_code == 200
+    assert [item["index"] for item in data["results"]] == [0, 1, 2]
+    assert data["succeeded"] == 2 and data["failed"] == 1
+    assert data["results"][0]["crossword"]["success"] is True
+    assert "invalid characters" in data["results"][1]["error"]
+    assert data["results"][1]["crossword"] is None
+
+
+def test_batch_and_export_go_through_admission_control(monkeypatch):
+    from src import api
+    
+    monkeypatch.setattr(api.generation_pool, "in_flight", api.generation_pool.capacity)
+    items = [{"words": ["PYTHON", "CODE", "TEST", "GRID"]}]
+    
+    for path in ("/generate-crossword/batch", "/export/puzzles"):
+        response = client.post(path, json={"items": items})
+        assert response.status_code == 503
+        assert int(response.headers["Retry-After"]) >= 1
+
+
+def test_bulk_jobs_release_their_reservation():
+    from src import api
+    
+    items = [{"words": ["PYTHON", "CODE", "TEST", "GRID"]}] * 3
+    assert client.post("/generate-crossword/batch", json={"items": items}).json()["succeeded"] == 3
+    assert len(client.post("/export/puzzles", json={"items": items}).text.splitlines()) == 3
+    assert client.get("/generate-crossword/queue").json()["reserved"] == 0
+    assert api.generation_pool.reserved == 0
+
+
+def test_broken_process_pool_is_replaced(monkeypatch):
+    from concurrent.futures.process import BrokenProcessPool
+    from src import api
+    
+    class CrashedPool:
+        def submit(self, *args, **kwargs):
+            raise BrokenProcessPool("A worker died")
+        
+        def shutdown(self, **kwargs):
+            pass
+    
+    crashed = CrashedPool()
+    monkeypatch.setattr(api, "_process_executor", crashed)
+    response = client.post("/generate-crossword/batch", json={"items": [{"words": ["PYTHON", "CODE", "TEST"]}]})
+    
+    assert response.json()["succeeded"] == 1
+    assert api._process_executor is not crashed
+
+
+def test_generate_crossword_uses_result_cache():
+    before = client.get("/generate-crossword/cache").json()
+    first = client.post("/generate-crossword", json={"words": ["lemon", "melon", "olive", "onion"], "seed": 99})
+    second = client.post("/generate-crossword", json={"words": ["ONION", "OLIVE", "MELON", " lemon "], "seed": 99})
+    after = client.get("/generate-crossword/cache").json()
+    
+    assert second.json() == first.json()
+    assert after["misses"] == before["misses"] + 1
+    assert after["hits"] == before["hits"] + 1
+    assert after["disk_errors"] == 0
+
+
+def test_generate_crossword_with_stats_skips_result_cache():
+    request = {"words": ["lemon", "melon", "olive", "onion"], "seed": 98, "include_stats": True}
+    before = client.get("/generate-crossword/cache").json()
+    first = client.post("/generate-crossword", json=request).json()
+    second = client.post("/generate-crossword", json=request).json()
+    after = client.get("/generate-crossword/cache").json()
+    
+    assert first["stats"] is not None and second["stats"] is not None
+    assert (after["hits"], after["misses"]) == (before["hits"], before["misses"])
+
+
+def test_generate_crossword_sheds_load_when_queue_is_full(monkeypatch):
+    from src import api
+    
+    async def saturated(*args, **kwargs):
+        raise api.PoolSaturated(retry_after=3)
+    
+    monkeypatch.setattr(api.generation_pool, "run", saturated)
+    response = client.post("/generate-crossword", json={"words": ["QUEUE", "FULL", "LOAD"], "seed": 503})
+    
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "3"
+    assert client.get("/generate-crossword/queue").json()["max_queue"] >= 0
+
+
+def test_generate_from_topic_uses_topic_cache(monkeypatch):
+    monkeypatch.setenv("LLM_PROVIDER", "mock")
+    topic = {"topic": "Basketball Legends"}
+    client.post("/generate-from-topic", json={**topic, "cache": "refresh"})
+    
+    cached = client.post("/generate-from-topic", json={"topic": "basketball   legends"}).json()
+    bypassed = client.post("/generate-from-topic", json={**topic, "cache": "bypass"}).json()
+    
+    assert cached["cached"] is True and cached["provider"] == "mock"
+    assert bypassed["cached"] is False
+    assert cached["words"] == bypassed["words"]
+    assert cached["crossword_id"] != bypassed["crossword_id"]
+
+
+def read_events(response):
+    events = []
+    for block in response.text.strip().split("\n\n"):
+        event, data = block.split("\n", 1)
+        events.append((event[len("event: "):], json.loads(data[len("data: "):])))
+    return events
+
+
+def test_stream_words_from_topic(monkeypatch):
+    monkeypatch.setenv("LLM_PROVIDER", "mock")
+    response = client.get("/generate-from-topic/stream",
+                          params={"topic": "basketball", "cache": "bypass", "crossword_after": 12})
+    events = read_events(response)
+    names = [name for name, _ in events]
+    
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert names.count("word") == 30 and names.count("crossword") == 1
+    assert names.index("crossword") > 11 and names[-1] == "done"
+    crossword = dict(events)["crossword"]
+    assert crossword["success"] is True
+    assert {p["word"] for p in crossword["word_placements"]} <= {data["word"] for name, data in events[:12]}
+    
+    done = events[-1][1]
+    assert done["provider"] == "mock" and len(done["words"]) == 30
+    clues = client.get(f"/clues/{done['crossword_id']}").json()["clues"]
+    assert clues["HOOP"] == "Target for scoring"
+
+
+def test_clues_report_expired_and_missing(monkeypatch):
+    from src import api
+    from src.clue_store import InMemoryClueStore
+    
+    now = [1000.0]
+    store = InMemoryClueStore(ttl_seconds=60, clock=lambda: now[0])
+    monkeypatch.setattr(api, "clue_storage", store)
+    store.put("abc", {"HOOP": "Target for scoring"})
+    
+    assert client.get("/clues/abc").json()["status"] == "ok"
+    now[0] += 61
+    expired = client.get("/clues/abc")
+    assert expired.status_code == 410 and expired.json()["status"] == "expired"
+    assert client.get("/clues/never-stored").status_code == 404
+    assert client.get("/clues/stats").json()["expirations"] == 1
+
+
+def test_generate_crossword_from_topic(monkeypatch):
+    monkeypatch.setenv("LLM_PROVIDER", "mock")
+    response = client.post("/generate-crossword-from-topic", json={"topic": "pixar", "placement_order": "connectivity"})
+    data = response.json()
+    
+    assert response.status_code == 200 and data["success"] is True
+    assert data["topic"] == "pixar" and data["provider"] == "mock"
+    assert len(data["word_placements"]) >= 10
+    assert all(placement["clue"] for placement in data["word_placements"])
+    woody = [p for p in data["word_placements"] if p["word"] == "WOODY"]
+    assert not woody or woody[0]["clue"] == "Cowboy toy in Toy Story"
+    
+    clues = client.get(f"/clues/{data['crossword_id']}").json()["clues"]
+    assert {p["word"]: p["clue"] for p in data["word_placements"]}.items() <= clues.items()
+    assert client.post("/generate-crossword-from-topic", json={"topic": "  "}).status_code == 400
+
+
+def test_topic_crossword_served_from_warm_pool(monkeypatch):
+    import time
+    from src import api
+    from src.puzzle_pool import PuzzlePool
+    
+    monkeypatch.setenv("LLM_PROVIDER", "mock")
+    monkeypatch.setattr(api, "puzzle_pool", PuzzlePool(["space"], depth=1))
+    
+    # The lifespan starts the warmer, which fills the pool through the mock provider
+    with TestClient(app) as warm_client:
+        for _ in range(100):
+            if warm_client.get("/generate-crossword-from-topic/pool").json()["ready"]["space"]:
+                break
+            time.sleep(0.05)
+        
+        pooled = warm_client.post("/generate-crossword-from-topic", json={"topic": "Space"}).json()
+        assert pooled["success"] is True and pooled["pooled"] is True
+        assert all(placement["clue"] for placement in pooled["word_placements"])
+        assert warm_client.get(f"/clues/{pooled['crossword_id']}").json()["success"] is True
+        
+        # Non-default settings are built on demand
+        custom = warm_client.post("/generate-crossword-from-topic", json={"topic": "space", "grid_size": 20}).json()
+        assert custom["pooled"] is False
+        
+        assert warm_client.get("/generate-crossword-from-topic/pool").json()["hits"] == 1
+
+
+def test_compact_wire_format_is_opt_in():
+    words = {"words": ["PYTHON", "CODE", "TEST", "GRID", "WORD", "PLACE", "CROSS"], "grid_size": 40}
+    plain = client.post("/generate-crossword", json=words)
+    by_query = client.post("/generate-crossword?format=compact", json=words)
+    by_accept = client.post("/generate-crossword", json=words,
+                            headers={"Accept": "application/vnd.crossword.compact+json"})
+    
+    assert plain.headers["content-type"] == "application/json"
+    assert by_query.headers["content-type"] == "application/vnd.crossword.compact+json"
+    assert by_query.json() == by_accept.json()
+    # httpx asks for gzip by default and a 40x40 grid is over the threshold
+    assert by_query.headers["content-encoding"] == "gzip"
+    assert int(by_query.headers["content-length"]) < len(plain.content) / 4
+    
+    expected, compact = plain.json(), by_query.json()
+    assert compact["grid"] == ["".join(cell or "." for cell in row) for row in expected["grid"]]
+    assert compact["word_placements"]["word"] == [p["word"] for p in expected["word_placements"]]
+    assert compact["word_placements"]["number"] == [p["number"] for p in expected["word_placements"]]
+
+
+def test_export_streams_ndjson_and_ipuz_in_order():
+    items = [{"words": ["PYTHON", "CODE", "TEST", "GRID"]}, {"words": ["ABC", "XYZ"]}, {"words": ["A1"]}] * 3
+    
+    with client.stream("POST", "/export/puzzles", json={"items": items}) as response:
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = [json.loads(line) for line in response.iter_lines() if line]
+    assert [line["index"] for line in lines] == list(range(9))
+    assert [line["success"] for line in lines[:3]] == [True, True, False]
+    assert lines[0]["crossword"]["success"] is True and lines[1]["crossword"]["success"] is False
+    
+    response = client.post("/export/puzzles", json={"items": items, "document": "ipuz", "title": "Puzzle {index}"})
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["success"] for line in lines[:3]] == [True, False, False]
+    ipuz = lines[3]["ipuz"]
+    assert ipuz["title"] == "Puzzle 3" and ipuz["version"] == "http://ipuz.org/v2"
+    # Same numbering as the /generate-crossword response for the same words
+    placements = client.post("/generate-crossword", json=items[0]).json()["word_placements"]
+    across = sorted(p["number"] for p in placements if p["direction"] == "horizontal")
+    assert [number for number, _ in ipuz["clues"]["Across"]] == across
+    for p in placements:
+        assert ipuz["puzzle"][p["start_row"]][p["start_col"]] == p["number"]
+
+
+def test_generate_crossword_anneal_engine():
+    words = ["PYTHON", "CODE", "TEST", "GRID", "WORD", "PLACE", "CROSS"]
+    greedy = client.post("/generate-crossword", json={"words": words}).json()
+    data = client.post("/generate-crossword", json={"words": words, "engine": "anneal", "time_budget_ms": 50}).json()
+    
+    assert data["success"] is True and data["search_nodes"] > 0
+    assert len(data["word_placements"]) >= len(greedy["word_placements"])
+    assert client.post("/generate-crossword", json={"words": words, "time_budget_ms": 0}).status_code == 422
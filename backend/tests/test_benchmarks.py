@@ -0,0 +1,21 @@
+from benchmarks.suite import compare, synthetic_words
+
+
+def test_synthetic_words_are_seeded_and_distinct():
+    words = synthetic_words(200)
+    assert words == synthetic_words(200)
+    assert len(set(words)) == 200
+    assert all(3 <= len(word) <= 10 and word.isalpha() for word in words)
+
+
+def test_compare_flags_regressions():
+    baseline = {"results": {
+        "can_place_word/x": {"p50_us": 1.0},
+        "generate_crossword/x": {"p50_us": 100.0, "placements_per_s": 1000.0},
+    }}
+    current = {"results": {
+        "can_place_word/x": {"p50_us": 1.05},
+        "generate_crossword/x": {"p50_us": 130.0, "placements_per_s": 800.0},
+    }}
+    assert compare(baseline, current, threshold=0.10) == ["generate_crossword/x"]
+    assert compare(baseline, current, threshold=0.50) == []
@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from src.clue_store import (
+    InMemoryClueStore, SqliteClueStore, CLUES_EXPIRED, CLUES_MISSING, CLUES_OK, clues_size, create_clue_store,
+    expire_periodically
+)
+
+CLUES = {"HOOP": "Target for scoring", "DUNK": "Forceful shot from above"}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_store(request, tmp_path):
+    """Both stores must behave the same; the SQLite one gets a fresh file per store"""
+    paths = iter(tmp_path / f"clues-{i}.sqlite3" for i in range(100))
+    
+    def make(**kwargs):
+        if request.param == "memory":
+            return InMemoryClueStore(**kwargs)
+        return SqliteClueStore(str(next(paths)), **kwargs)
+    
+    return make
+
+
+def test_entries_expire_after_ttl(make_store):
+    clock = FakeClock()
+    store = make_store(ttl_seconds=60, clock=clock)
+    store.put("a", CLUES)
+    assert store.get("a").status == CLUES_OK and store.get("a").clues == CLUES
+    assert store.get("b").status == CLUES_MISSING
+    
+    clock.now += 61
+    assert store.get("a").status == CLUES_EXPIRED
+    assert store.stats().expirations == 1 and store.stats().entries == 0
+
+
+def test_lru_caps_on_entries_and_bytes(make_store):
+    store = make_store(max_entries=2)
+    store.put("a", CLUES)
+    store.put("b", CLUES)
+    store.get("a")
+    store.put("c", CLUES)
+    assert store.get("b").status == CLUES_EXPIRED
+    assert store.get("a").status == CLUES_OK and store.get("c").status == CLUES_OK
+    
+    size = clues_size("a", CLUES)
+    store = make_store(max_bytes=2 * size)
+    for crossword_id in "abc":
+        store.put(crossword_id, CLUES)
+    stats = store.stats()
+    assert (stats.entries, stats.bytes, stats.evictions) == (2, 2 * size, 1)
+
+
+def test_background_expiry_sweeps_without_lookups(make_store):
+    clock = FakeClock()
+    store = make_store(ttl_seconds=60, clock=clock)
+    store.put("a", CLUES)
+    store.put("b", CLUES)
+    clock.now += 61
+    
+    async def main():
+        task = asyncio.ensure_future(expire_periodically(store, interval_seconds=0.001))
+        await asyncio.sleep(0.02)
+        task.cancel()
+    
+    asyncio.run(main())
+    assert store.stats().entries == 0 and store.stats().bytes == 0
+    assert store.get("a").status == CLUES_EXPIRED
+
+
+def test_sqlite_store_is_shared_between_workers(tmp_path, monkeypatch):
+    monkeypatch.setenv("CLUE_STORE_PATH", str(tmp_path / "clues.sqlite3"))
+    monkeypatch.setenv("CLUE_STORE_MAX_ENTRIES", "1")
+    # Each worker process opens its own connection to the same file
+    first, second = create_clue_store(), create_clue_store()
+    assert isinstance(first, SqliteClueStore)
+    
+    first.put("a", CLUES)
+    assert second.get("a").clues == CLUES
+    second.put("b", CLUES)
+    assert first.get("a").status == CLUES_EXPIRED
+    assert first.stats().entries == 1
+    first.close()
+    second.close()
+
+
+def test_sqlite_lookups_do_not_wait_for_writers(tmp_path):
+    import sqlite3
+    
+    path = str(tmp_path / "clues.sqlite3")
+    store = SqliteClueStore(path, max_entries=2)
+    store.put("a", CLUES)
+    store.put("b", CLUES)
+    # Another worker holds the write lock; reads still go through
+    writer = sqlite3.connect(path, isolation_level=None)
+    writer.execute("BEGIN IMMEDIATE")
+    assert store.get("a").clues == CLUES
+    writer.execute("ROLLBACK")
+    writer.close()
+    
+    # The read is applied as recency on the next write, so "b" is the one evicted
+    store.put("c", CLUES)
+    assert store.get("b").status == CLUES_EXPIRED and store.get("a").status == CLUES_OK
+    assert store.stats().entries == 2
+    store.close()
@@ -1,6 +1,44 @@
+import random
+import time
+
 import pytest
-from src.crossword_generator import CrosswordGenerator
-from src.models import Direction, WordPlacement, CrosswordGrid
+from src.crossword_generator import CrosswordGenerator, CrossChecks
+from src.models import Direction, WordPlacement, CrosswordGrid, LetterGrid
+
+def legacy_extract_perpendicular_words(generator, grid, word, start_row, start_col, direction):
+    """Reference copy of the original grid-copying perpendicular word extraction"""
+    perpendicular_words = []
+    test_grid = [row[:] for row in grid]
+    for i in range(len(word)):
+        if direction == Direction.HORIZONTAL:
+            test_grid[start_row][start_col + i] = word[i]
+        else:
+            test_grid[start_row + i][start_col] = word[i]
+    
+    for i in range(len(word)):
+        if direction == Direction.HORIZONTAL:
+            col = start_col + i
+            word_start_row = start_row
+            while word_start_row > 0 and test_grid[word_start_row - 1][col] is not None:
+                word_start_row -= 1
+            word_end_row = start_row
+            while word_end_row < generator.grid_size - 1 and test_grid[word_end_row + 1][col] is not None:
+                word_end_row += 1
+            if word_end_row > word_start_row:
+                perpendicular_words.append("".join(test_grid[row][col] for row in range(word_start_row, word_end_row + 1)))
+        else:
+            row = start_row + i
+            word_start_col = start_col
+            while word_start_col > 0 and test_grid[row][word_start_col - 1] is not None:
+                word_start_col -= 1
+            word_end_col = start_col
+            while word_end_col < generator.grid_size - 1 and test_grid[row][word_end_col + 1] is not None:
+                word_end_col += 1
+            if word_end_col > word_start_col:
+                perpendicular_words.append("".join(test_grid[row][col] for col in range(word_start_col, word_end_col + 1)))
+    
+    return perpendicular_words
+
 
 class TestCrosswordGenerator:
     
@@ -25,7 +63,7 @@ class TestCrosswordGenerator:
     
     def test_can_place_word_empty_grid(self, generator):
         """Test word placement on empty grid"""
-        empty_grid = [[None for _ in range(15)] for _ in range(15)]
+        empty_grid = LetterGrid(15, 15)
         
         # Should be able to place any word on empty grid
         assert generator.can_place_word(empty_grid, "PYTHON", 7, 4, Direction.HORIZONTAL)
@@ -33,7 +71,7 @@ class TestCrosswordGenerator:
     
     def test_place_word_success(self, generator):
         """Test successful word placement"""
-        empty_grid = [[None for _ in range(15)] for _ in range(15)]
+        empty_grid = LetterGrid(15, 15)
         
         success = generator.place_word(empty_grid, "PYTHON", 7, 4, Direction.HORIZONTAL)
         assert success == True
@@ -41,11 +79,11 @@ class TestCrosswordGenerator:
         # Check that letters are correctly placed
         expected_letters = list("PYTHON")
         for i, letter in enumerate(expected_letters):
-            assert empty_grid[7][4 + i] == letter
+            assert empty_grid.get(7, 4 + i) == letter
     
     def test_word_intersection_placement(self, generator):
         """Test placing intersecting words"""
-        grid = [[None for _ in range(15)] for _ in range(15)]
+        grid = LetterGrid(15, 15)
         
         # Place first word
         generator.place_word(grid, "PYTHON", 7, 4, Direction.HORIZONTAL)
@@ -55,7 +93,7 @@ class TestCrosswordGenerator:
         assert success == True
         
         # Verify intersection point has correct letter
-        assert grid[7][8] == "O"  # From both PYTHON and CODE
+        assert grid.get(7, 8) == "O"  # From both PYTHON and CODE
     
     def test_generate_crossword_basic(self, generator):
         """Test basic crossword generation"""
@@ -84,5 +122,259 @@ class TestCrosswordGenerator:
                 else:
                     row, col = placement.start_row + i, placement.start_col
                 
-                grid_letter = crossword.grid[row][col]
-                assert grid_letter == letter, f"Conflict at ({row}, {col}): expected {letter}, got {grid_letter}"
\ No newline at end of file
+                grid_letter = crossword.grid.get(row, col)
+                assert grid_letter == letter, f"Conflict at ({row}, {col}): expected {letter}, got {grid_letter}"
+
+    def test_candidate_anchors_match_intersection_scan(self, generator):
+        """Index-driven anchors come out in the same order as scanning placements with find_intersections"""
+        crossword = generator.generate_crossword()
+        letter_index = {}
+        for placement_idx, placement in enumerate(crossword.word_placements):
+            generator._index_placement(letter_index, placement_idx, placement.word)
+        
+        for word in generator.words:
+            expected = [
+                (placement_idx, word_idx, placed_idx)
+                for placement_idx, placement in enumerate(crossword.word_placements)
+                for word_idx, placed_idx in generator.find_intersections(word, placement.word)
+            ]
+            assert generator._candidate_anchors(word, letter_index) == expected
+    
+    def test_perpendicular_validation_matches_legacy(self):
+        """Copy-free validation accepts and rejects exactly what the grid-copying version did"""
+        rng = random.Random(42)
+        words = ["PYTHON", "CODE", "TEST", "GRID", "WORD", "PLACE", "CROSS", "TO", "ON", "DO"]
+        generator = CrosswordGenerator(words)
+        size = generator.grid_size
+        accepted = rejected = 0
+        
+        for _ in range(300):
+            grid = [[None for _ in range(size)] for _ in range(size)]
+            for _ in range(rng.randint(5, 60)):
+                grid[rng.randrange(size)][rng.randrange(size)] = rng.choice("CODESTONPY")
+            
+            word = rng.choice(words)
+            direction = rng.choice([Direction.HORIZONTAL, Direction.VERTICAL])
+            if direction == Direction.HORIZONTAL:
+                row, col = rng.randrange(size), rng.randrange(size - len(word) + 1)
+            else:
+                row, col = rng.randrange(size - len(word) + 1), rng.randrange(size)
+            
+            legacy_words = legacy_extract_perpendicular_words(generator, grid, word, row, col, direction)
+            flat_grid = LetterGrid.from_rows(grid)
+            assert generator._extract_perpendicular_words(flat_grid, word, row, col, direction) == legacy_words
+            
+            legacy_valid = all(w in generator.words for w in legacy_words)
+            assert generator._is_valid_perpendicular_placement(flat_grid, word, row, col, direction) == legacy_valid
+            if legacy_valid:
+                accepted += 1
+            else:
+                rejected += 1
+        
+        # Make sure both branches were actually exercised
+        assert accepted > 0 and rejected > 0
+    
+    def test_letter_grid_round_trip(self, generator):
+        """The flat grid converts to and from the nested-list API form without loss"""
+        crossword = generator.generate_crossword()
+        rows = crossword.grid.to_rows()
+        
+        assert len(rows) == 15 and all(len(row) == 15 for row in rows)
+        assert all(cell is None or (len(cell) == 1 and cell.isalpha()) for row in rows for cell in row)
+        assert LetterGrid.from_rows(rows) == crossword.grid
+        assert len(crossword.grid.cells) == 15 * 15
+    
+    def test_backtracking_places_all_words(self, generator):
+        """Backtracking recovers words the greedy pass drops"""
+        greedy = generator.generate_crossword()
+        crossword = generator.generate_crossword_backtracking()
+        
+        assert not greedy.all_words_placed
+        assert crossword.all_words_placed
+        assert crossword.unplaced_words == []
+        assert sorted(p.word for p in crossword.word_placements) == sorted(generator.words)
+        assert 0 < crossword.search_nodes <= 2000
+        
+        for placement in crossword.word_placements:
+            for i, letter in enumerate(placement.word):
+                if placement.direction == Direction.HORIZONTAL:
+                    row, col = placement.start_row, placement.start_col + i
+                else:
+                    row, col = placement.start_row + i, placement.start_col
+                assert crossword.grid.get(row, col) == letter
+    
+    def test_backtracking_respects_node_budget(self):
+        """An unplaceable word exhausts the budget and is reported instead of looping forever"""
+        generator = CrosswordGenerator(["PYTHON", "CODE", "TEST", "GRID", "WORD", "PLACE", "CROSS", "FUZZ"])
+        crossword = generator.generate_crossword_backtracking(node_budget=50)
+        
+        assert not crossword.all_words_placed
+        assert "FUZZ" in crossword.unplaced_words
+        assert crossword.search_nodes <= 50
+        assert len(crossword.word_placements) >= len(generator.generate_crossword().word_placements)
+    
+    def test_annealing_improves_on_greedy_within_budget(self, generator):
+        """The optimizer keeps a valid, connected layout that scores at least as well as greedy"""
+        greedy = generator.generate_crossword()
+        started = time.perf_counter()
+        crossword = generator.generate_crossword_annealed(time_budget_ms=100, seed=1)
+        elapsed = time.perf_counter() - started
+        
+        assert elapsed < 1.0 and crossword.search_nodes > 0
+        assert len(crossword.word_placements) >= len(greedy.word_placements)
+        assert (generator._layout_energy(crossword.grid, crossword.word_placements) >=
+                generator._layout_energy(greedy.grid, greedy.word_placements))
+        assert sorted(crossword.unplaced_words + [p.word for p in crossword.word_placements]) == sorted(generator.words)
+        
+        # Every letter run of two or more cells is an intended word, and letters match placements
+        rows = crossword.grid.rows()
+        lines = rows + ["".join(row[c] for row in rows) for c in range(len(rows))]
+        runs = [run for line in lines for run in line.split(".") if len(run) > 1]
+        assert set(runs) <= set(generator.words)
+        covered = set()
+        for placement in crossword.word_placements:
+            for i, letter in enumerate(placement.word):
+                if placement.direction == Direction.HORIZONTAL:
+                    row, col = placement.start_row, placement.start_col + i
+                else:
+                    row, col = placement.start_row + i, placement.start_col
+                assert crossword.grid.get(row, col) == letter
+                covered.add((row, col))
+        assert len(covered) == sum(cell != "." for row in rows for cell in row)
+    
+    def test_annealing_stops_early_when_no_move_exists(self):
+        """One placeable word and one that shares no letter: nothing to do, so no waiting out the budget"""
+        generator = CrosswordGenerator(["ABC", "XYZ"], grid_size=10)
+        started = time.perf_counter()
+        crossword = generator.generate_crossword_annealed(time_budget_ms=5000)
+        
+        assert time.perf_counter() - started < 1.0
+        assert crossword.search_nodes == 0 and crossword.unplaced_words == ["XYZ"]
+    
+    def test_annealing_budget_includes_greedy_pass_and_counts_anchors(self, test_words):
+        """A budget the greedy pass uses up leaves no moves; annealed anchors are counted like greedy ones"""
+        assert CrosswordGenerator(test_words).generate_crossword_annealed(time_budget_ms=0).search_nodes == 0
+        
+        generator = CrosswordGenerator(test_words, collect_stats=True)
+        crossword = generator.generate_crossword_annealed(time_budget_ms=50, seed=1)
+        stats = crossword.stats
+        assert crossword.search_nodes > 0
+        # Every anchor tried is either rejected or fits; each fit places a word
+        assert stats.anchors_tried >= sum(stats.rejections.values()) + stats.words_placed - 1
+
+    @pytest.mark.parametrize("words", [
+        ["PYTHON", "CODE", "TEST", "GRID", "WORD", "PLACE", "CROSS"],
+        # FUZZ never fits, so the search undoes placements until the budget runs out
+        ["PYTHON", "CODE", "TEST", "GRID", "WORD", "PLACE", "CROSS", "FUZZ"],
+    ])
+    def test_cross_checks_match_slow_path(self, words):
+        """Incrementally maintained masks agree with a full rebuild and with the string-building checks"""
+        generator = CrosswordGenerator(words)
+        generator.generate_crossword_backtracking(node_budget=300)
+        grid = generator.cross_checks.grid
+        view = generator.cross_checks.debug_view()
+        assert view == CrossChecks(grid.copy(), generator.word_set).debug_view()
+        
+        for row in range(grid.height):
+            for col in range(grid.width):
+                for direction, key in ((Direction.HORIZONTAL, 'horizontal'), (Direction.VERTICAL, 'vertical')):
+                    allowed = view[key][row][col]
+                    for letter in "ABCDEFGHIJKLMNOPQRSTUVWXYZ":
+                        cell = grid.get(row, col)
+                        run = generator._perpendicular_run(grid, letter, row, col, direction, 0)
+                        slow = (cell is None or cell == letter) and (run is None or run in generator.word_set)
+                        assert (allowed == '*' or letter in allowed) == slow, (row, col, key, letter)
+                
+                flags = view['blocked'][row][col]
+                assert ('S' in flags) == (col > 0 and grid.get(row, col - 1) is not None)
+                assert ('e' in flags) == (row < grid.height - 1 and grid.get(row + 1, col) is not None)
+    
+    def test_cross_checks_decisions_match_slow_path(self, generator):
+        """can_place_word gives the same answer with and without the cross-check fast path"""
+        crossword = generator.generate_crossword()
+        placements = crossword.word_placements
+        slow_grid = crossword.grid.copy()  # No cross-check state attached, so the slow path runs
+        
+        for word in generator.words:
+            for row in range(-2, 16):
+                for col in range(-2, 16):
+                    for direction in (Direction.HORIZONTAL, Direction.VERTICAL):
+                        fast = generator.can_place_word(crossword.grid, word, row, col, direction, placements)
+                        slow = generator.can_place_word(slow_grid, word, row, col, direction, placements)
+                        assert fast == slow, (word, row, col, direction)
+    
+    def test_sparse_canvas_crops_to_used_area(self, generator):
+        """Sparse mode is not limited by the 15x15 frame and returns a tightly cropped grid"""
+        words = ["PYTHON", "CODE", "TEST", "ABCDEFGHIJKLMNOPQ"]  # 17 letters, wider than the fixed grid
+        sparse_generator = CrosswordGenerator(words)
+        fixed = sparse_generator.generate_crossword()
+        crossword = sparse_generator.generate_crossword_sparse()
+        
+        assert "ABCDEFGHIJKLMNOPQ" not in [p.word for p in fixed.word_placements]
+        assert crossword.all_words_placed
+        assert (crossword.width, crossword.height) == (crossword.grid.width, crossword.grid.height)
+        assert max(crossword.width, crossword.height) >= 17
+        
+        rows = crossword.grid.rows()
+        assert rows[0].strip('.') and rows[-1].strip('.')
+        assert any(row[0] != '.' for row in rows) and any(row[-1] != '.' for row in rows)
+        for placement in crossword.word_placements:
+            for i, letter in enumerate(placement.word):
+                if placement.direction == Direction.HORIZONTAL:
+                    row, col = placement.start_row, placement.start_col + i
+                else:
+                    row, col = placement.start_row + i, placement.start_col
+                assert crossword.grid.get(row, col) == letter
+    
+    def test_sparse_canvas_respects_limits(self, generator):
+        """max_width and max_height cap the bounding box"""
+        crossword = generator.generate_crossword_sparse(max_width=6, max_height=5)
+        assert crossword.width <= 6 and crossword.height <= 5
+        assert len(crossword.word_placements) >= 2
+        
+        crossword = generator.generate_crossword_sparse(max_width=4)
+        assert crossword.word_placements == [] and crossword.unplaced_words[0] == "PYTHON"
+    
+    def test_generation_stats(self, test_words):
+        """Stats are off by default; when on, every anchor is either placed or rejected for one reason"""
+        assert CrosswordGenerator(test_words).generate_crossword().stats is None
+        
+        generator = CrosswordGenerator(test_words, collect_stats=True)
+        crossword = generator.generate_crossword()
+        stats = crossword.stats
+        
+        assert stats.words_placed == len(crossword.word_placements)
+        assert stats.words_dropped == len(crossword.unplaced_words) == len(test_words) - stats.words_placed
+        assert stats.anchors_tried == sum(stats.rejections.values()) + stats.words_placed - 1
+        assert set(stats.phase_seconds) == {"first_word", "placement"}
+        
+        # The string-building path classifies rejections the same way as the cross-check masks
+        generator.use_cross_checks = False
+        assert generator.generate_crossword().stats.rejections == stats.rejections
+    
+    def test_word_list_analysis(self):
+        """Pre-analysis finds isolated, duplicate, contained and oversized words"""
+        generator = CrosswordGenerator(["CAR", "CARS", "CAR", "XYZ", "BUS", "SUPERCALIFRAGILISTIC"], grid_size=15)
+        analysis = generator.analyze_words()
+        
+        assert analysis.isolated_words == ["XYZ"]
+        assert analysis.duplicate_words == ["CAR"]
+        assert ("CAR", "CARS") in analysis.contained_words
+        assert analysis.oversized_words == ["SUPERCALIFRAGILISTIC"]
+        assert analysis.largest_component == 5
+        assert analysis.degrees[generator.words.index("XYZ")] == 0
+        assert generator.has_possible_layout(15)
+        
+        assert not CrosswordGenerator(["ABC", "XYZ"]).has_possible_layout()
+        # Sharing a letter only with a word that cannot fit does not count
+        assert not CrosswordGenerator(["ABC", "ALPHABETICALLY"], grid_size=10).has_possible_layout(10)
+    
+    def test_connectivity_order(self, test_words):
+        """Connectivity order is a permutation that starts from the best-connected word"""
+        generator = CrosswordGenerator(test_words, placement_order="connectivity")
+        assert sorted(generator.words) == sorted(test_words)
+        degrees = CrosswordGenerator(test_words).analyze_words().degrees
+        assert generator.words[0] == test_words[degrees.index(max(degrees))]
+        
+        with pytest.raises(ValueError):
+            CrosswordGenerator(test_words, placement_order="alphabetical")
@@ -0,0 +1,45 @@
+import asyncio
+
+from src.export import ipuz_document, ordered_window
+from src.models import CrosswordGrid, Direction, LetterGrid, WordPlacement
+
+
+def test_ipuz_document_numbers_cells_and_clues():
+    grid = LetterGrid.from_rows([["C", "A", "T"], [None, None, "O"], [None, None, "P"]])
+    crossword = CrosswordGrid(grid, 3, 3, [
+        WordPlacement("CAT", 0, 0, Direction.HORIZONTAL, "Pet"),
+        WordPlacement("TOP", 0, 2, Direction.VERTICAL, "Summit"),
+    ])
+    document = ipuz_document(crossword, title="Tiny")
+    
+    assert document["kind"] == ["http://ipuz.org/crossword#1"] and document["title"] == "Tiny"
+    assert document["dimensions"] == {"width": 3, "height": 3}
+    assert document["puzzle"] == [[1, 0, 2], ["#", "#", 0], ["#", "#", 0]]
+    assert document["solution"] == [["C", "A", "T"], ["#", "#", "O"], ["#", "#", "P"]]
+    assert document["clues"] == {"Across": [[1, "Pet"]], "Down": [[2, "Summit"]]}
+
+
+def test_ordered_window_bounds_work_ahead_of_the_reader():
+    started = []
+    
+    def job(index):
+        async def run():
+            started.append(index)
+            await asyncio.sleep(0.001 * (5 - index % 5))  # Later jobs finish first
+            return index
+        return run
+    
+    async def main():
+        results = []
+        stream = ordered_window((job(index) for index in range(20)), window=3)
+        async for result in stream:
+            results.append(result)
+            # Nothing runs more than the window ahead of what has been read
+            assert len(started) <= len(results) + 3
+            if result == 9:
+                break
+        await stream.aclose()
+        return results
+    
+    assert asyncio.run(main()) == list(range(10))
+    assert len(started) <= 13
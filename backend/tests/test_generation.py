@@ -0,0 +1,52 @@
+import pytest
+
+from src.generation import (
+    GenerationOptions, clean_words, generate_batch, generate_puzzle, number_placements
+)
+from src.models import Direction, WordPlacement
+
+WORD_LISTS = [
+    ["PYTHON", "CODE", "TEST", "GRID", "WORD"],
+    ["ABC", "XYZ"],
+    ["CAT", "D0G"],
+    ["TOY", "STORY", "WOODY", "BUZZ", "PIXAR"],
+]
+
+
+def test_clean_words():
+    assert clean_words([" cat ", "Dog"]) == ["CAT", "DOG"]
+    for words in (["CAT"], ["CAT", "D0G"], ["CAT", "A"]):
+        with pytest.raises(ValueError):
+            clean_words(words)
+
+
+def test_number_placements_shares_start_cells():
+    placements = [
+        WordPlacement("CAT", 2, 0, Direction.HORIZONTAL),
+        WordPlacement("COT", 0, 1, Direction.VERTICAL),
+        WordPlacement("CAR", 0, 1, Direction.HORIZONTAL),
+    ]
+    assert number_placements(placements) == {(0, 1): 1, (2, 0): 2}
+
+
+def test_generate_batch_keeps_order_and_isolates_failures():
+    results = generate_batch(WORD_LISTS, max_workers=1)
+    
+    assert [item.index for item in results] == [0, 1, 2, 3]
+    assert results[0].success and len(results[0].result.crossword.word_placements) >= 2
+    # No shared letters: a result without a search, not an error
+    assert results[1].success and results[1].result.crossword is None
+    assert not results[2].success and "invalid characters" in results[2].error
+    assert results[3].success
+
+
+def test_generate_batch_pool_matches_in_process():
+    options = [GenerationOptions(), GenerationOptions(), GenerationOptions(),
+               GenerationOptions(engine="portfolio", attempts=4)]
+    sequential = generate_batch(WORD_LISTS, options, max_workers=1)
+    parallel = generate_batch(WORD_LISTS, options, max_workers=2)
+    assert parallel == sequential
+    assert parallel[3].result.crossword == generate_puzzle(clean_words(WORD_LISTS[3]), options[3], max_workers=1).crossword
+    
+    with pytest.raises(ValueError):
+        generate_batch(WORD_LISTS, options[:2])
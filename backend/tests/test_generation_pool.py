@@ -0,0 +1,71 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.generation_pool import GenerationPool, PoolSaturated
+
+
+def test_pool_runs_jobs_and_records_waits():
+    pool = GenerationPool(mode="thread", workers=2, max_queue=4)
+    
+    async def main():
+        return await asyncio.gather(*(pool.run(pow, n, 2) for n in range(6)))
+    
+    assert asyncio.run(main()) == [0, 1, 4, 9, 16, 25]
+    stats = pool.stats()
+    assert stats.completed == 6 and stats.in_flight == 0 and stats.rejected == 0
+    assert stats.p95_wait_seconds >= 0
+    pool.shutdown()
+
+
+def test_full_pool_rejects_immediately():
+    pool = GenerationPool(mode="thread", workers=1, max_queue=1)
+    release = threading.Event()
+    
+    async def main():
+        running = asyncio.ensure_future(pool.run(release.wait, 5))
+        queued = asyncio.ensure_future(pool.run(release.wait, 5))
+        await asyncio.sleep(0)
+        assert pool.stats().queue_depth == 1
+        with pytest.raises(PoolSaturated) as excinfo:
+            await pool.run(release.wait, 5)
+        assert excinfo.value.retry_after >= 1
+        release.set()
+        await asyncio.gather(running, queued)
+    
+    asyncio.run(main())
+    assert pool.stats().rejected == 1
+    pool.shutdown()
+
+
+def test_reservations_hold_slots_for_concurrent_bulk_jobs():
+    pool = GenerationPool(mode="thread", workers=1, max_queue=2)
+    first = pool.reserve(2)
+    # A second bulk job and an interactive request cannot both fit beside the first
+    with pytest.raises(PoolSaturated):
+        pool.reserve(2)
+    
+    async def main():
+        # Jobs under the reservation use its slots, leaving the last one for interactive work
+        assert await pool.run(pow, 2, 3, reserved=True) == 8
+        assert await pool.run(pow, 3, 2) == 9
+        with pytest.raises(PoolSaturated):
+            pool.admit(2)
+    
+    asyncio.run(main())
+    first.release()
+    first.release()
+    assert pool.stats().reserved == 0
+    assert pool.reserve(3).slots == 3
+    assert pool.stats().rejected == 2
+    pool.shutdown()
+
+
+def test_process_pool_runs_jobs():
+    pool = GenerationPool(mode="process", workers=1, max_queue=0)
+    assert asyncio.run(pool.run(pow, 3, 2)) == 9
+    pool.shutdown()
+    
+    with pytest.raises(ValueError):
+        GenerationPool(mode="fiber")
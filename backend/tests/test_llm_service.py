@@ -0,0 +1,155 @@
+import asyncio
+import json
+import random
+
+import httpx
+import pytest
+
+from src.llm_service import CSVPairParser, LLMService, TopicStream
+from src.topic_cache import TopicCache
+
+CSV_REPLY = "\n".join(f"{word},Clue for {word.lower()}" for word in [
+    "HOOP", "DUNK", "COURT", "SCORE", "TEAM", "COACH", "FOUL", "GUARD", "STEAL", "BLOCK", "SHOT"
+])
+
+
+def test_provider_calls_share_one_pooled_client(monkeypatch):
+    monkeypatch.setenv("LLM_HTTP_MAX_CONNECTIONS", "7")
+    monkeypatch.setenv("LLM_HTTP_CONNECT_TIMEOUT", "2.5")
+    requests = []
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"choices": [{"message": {"content": CSV_REPLY}}]})
+    
+    async def main():
+        await LLMService.startup(transport=httpx.MockTransport(handler))
+        client = LLMService.get_client("openai")
+        config = {"openai_key": "test-key"}
+        first = await LLMService._call_openai("basketball", config)
+        second = await LLMService._call_openai("basketball", config)
+        assert LLMService.get_client("openai") is client
+        assert client.timeout.connect == 2.5 and client.timeout.read == 30.0
+        assert LLMService.get_client("ollama").timeout.read == 60.0
+        await LLMService.shutdown()
+        assert client.is_closed and not LLMService._clients
+        return first, second
+    
+    first, second = asyncio.run(main())
+    assert first == second and first[0] == {"word": "HOOP", "clue": "Clue for hoop"}
+    assert [str(request.url) for request in requests] == ["https://api.openai.com/v1/chat/completions"] * 2
+    assert requests[0].headers["Authorization"] == "Bearer test-key"
+
+
+def split_at_random(text, seed):
+    rng = random.Random(seed)
+    chunks = []
+    while text:
+        size = rng.randint(1, 12)
+        chunks.append(text[:size])
+        text = text[size:]
+    return chunks
+
+
+def test_incremental_parser_matches_full_parse():
+    reply = "Here are your words:\nWORD,CLUE\n" + CSV_REPLY + '\n"LAYUP","Close-range shot, off the glass"\nX,too short'
+    expected = LLMService._parse_csv_content(reply)
+    for seed in range(5):
+        parser = CSVPairParser()
+        pairs = []
+        for chunk in split_at_random(reply, seed):
+            pairs.extend(parser.feed(chunk))
+        pairs.extend(parser.close())
+        assert pairs == expected
+    assert expected[-1] == {"word": "LAYUP", "clue": "Close-range shot, off the glass"}
+
+
+def stream_body(provider, text):
+    chunks = split_at_random(text, 0)
+    if provider == "openai":
+        lines = [f"data: {json.dumps({'choices': [{'delta': {'content': chunk}}]})}" for chunk in chunks]
+        return "\n\n".join(lines + ["data: [DONE]"]) + "\n\n"
+    if provider == "anthropic":
+        lines = [f"event: content_block_delta\ndata: {json.dumps({'type': 'content_block_delta', 'delta': {'type': 'text_delta', 'text': chunk}})}"
+                 for chunk in chunks]
+        return "\n\n".join(lines + ['event: message_stop\ndata: {"type": "message_stop"}']) + "\n\n"
+    return "\n".join(json.dumps({"response": chunk, "done": False}) for chunk in chunks) + '\n{"response": "", "done": true}\n'
+
+
+@pytest.mark.parametrize("provider", ["openai", "anthropic", "ollama"])
+def test_topic_stream_parses_provider_streams(monkeypatch, provider):
+    monkeypatch.setenv("LLM_PROVIDER", provider)
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    monkeypatch.setattr(LLMService, "_topic_cache", TopicCache())
+    calls = []
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(json.loads(request.content))
+        return httpx.Response(200, text=stream_body(provider, CSV_REPLY))
+    
+    async def collect(stream):
+        return [pair async for pair in stream]
+    
+    async def main():
+        await LLMService.startup(transport=httpx.MockTransport(handler))
+        first = TopicStream("Basketball")
+        pairs = await collect(first)
+        second = TopicStream("basketball")
+        cached_pairs = await collect(second)
+        await LLMService.shutdown()
+        return first, pairs, second, cached_pairs
+    
+    first, pairs, second, cached_pairs = asyncio.run(main())
+    assert pairs == LLMService._parse_csv_content(CSV_REPLY)
+    assert first.result.provider == provider and not first.result.cached
+    assert cached_pairs == pairs and second.result.cached
+    assert len(calls) == 1 and calls[0]["stream"] is True
+
+
+def test_concurrent_topic_requests_share_one_provider_call(monkeypatch):
+    monkeypatch.setenv("LLM_PROVIDER", "openai")
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(LLMService, "_topic_cache", TopicCache())
+    calls = []
+    
+    async def fake_openai(topic, config):
+        calls.append(topic)
+        await asyncio.sleep(0.01)
+        return LLMService._parse_csv_content(CSV_REPLY)
+    
+    monkeypatch.setattr(LLMService, "_call_openai", fake_openai)
+    
+    async def main():
+        return await asyncio.gather(*(
+            LLMService.generate_topic_result(topic, cache_mode="bypass")
+            for topic in ("Basketball", "basketball ", "BASKETBALL")
+        ))
+    
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert [result.coalesced for result in results] == [False, True, True]
+    assert all(result.word_clues == results[0].word_clues for result in results)
+
+
+def test_provider_chain_hedges_slow_primary(monkeypatch):
+    monkeypatch.setenv("LLM_PROVIDER_CHAIN", "openai,anthropic")
+    monkeypatch.setenv("LLM_HEDGE_DELAY_SECONDS", "0.01")
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    monkeypatch.setattr(LLMService, "_topic_cache", TopicCache())
+    
+    async def slow_openai(topic, config):
+        await asyncio.sleep(1)
+        return LLMService._parse_csv_content(CSV_REPLY)
+    
+    async def fast_anthropic(topic, config):
+        return LLMService._parse_csv_content(CSV_REPLY)
+    
+    monkeypatch.setattr(LLMService, "_call_openai", slow_openai)
+    monkeypatch.setattr(LLMService, "_call_anthropic", fast_anthropic)
+    result = asyncio.run(LLMService.generate_topic_result("hedging"))
+    
+    assert (result.provider, result.model) == ("anthropic", "claude-3-haiku-20240307")
+    assert LLMService.get_provider_chain().hedges == 1
+    assert LLMService.get_topic_cache().get("hedging").provider == "anthropic"
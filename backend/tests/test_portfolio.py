@@ -0,0 +1,52 @@
+import pytest
+from src.crossword_generator import CrosswordGenerator
+from src.portfolio import (
+    attempt_ordering, create_attempt_pool, generate_portfolio, run_attempt, score_layout, stop_flags
+)
+
+WORDS = ["PYTHON", "CODE", "TEST", "GRID", "WORD", "PLACE", "CROSS"]
+
+
+def test_attempt_ordering_is_seeded_permutation():
+    assert attempt_ordering(WORDS, seed=3, attempt=0) == WORDS
+    for attempt in range(1, 10):
+        ordering = attempt_ordering(WORDS, seed=3, attempt=attempt)
+        assert sorted(ordering) == sorted(WORDS)
+        assert ordering[0] == WORDS[(attempt - 1) % len(WORDS)]
+        assert ordering == attempt_ordering(WORDS, seed=3, attempt=attempt)
+
+
+def test_portfolio_never_worse_than_greedy():
+    greedy = CrosswordGenerator(WORDS).generate_crossword()
+    best = generate_portfolio(WORDS, attempts=12, seed=7, max_workers=1)
+    assert score_layout(best) >= score_layout(greedy)
+    assert len(best.word_placements) > len(greedy.word_placements)
+
+
+def test_portfolio_process_pool_matches_in_process():
+    """Without an early exit the parallel run picks the same winner as the in-process run"""
+    sequential = generate_portfolio(WORDS, attempts=6, seed=1, max_workers=1, target_words=len(WORDS) + 1)
+    parallel = generate_portfolio(WORDS, attempts=6, seed=1, max_workers=2, target_words=len(WORDS) + 1)
+    assert parallel.word_placements == sequential.word_placements
+
+
+def test_portfolio_rejects_zero_attempts():
+    with pytest.raises(ValueError):
+        generate_portfolio(WORDS, attempts=0, max_workers=1)
+
+
+def test_running_attempts_stop_once_their_flag_is_set():
+    flags = stop_flags()
+    slot = flags.claim()
+    flags.array[slot] = 1
+    pool = create_attempt_pool(max_workers=1)
+    try:
+        stopped = pool.submit(run_attempt, WORDS, 15, 0, 0, False, slot).result()
+        unstopped = pool.submit(run_attempt, WORDS, 15, 0, 0, False, None).result()
+    finally:
+        pool.shutdown()
+        flags.release(slot)
+    
+    # Only the centred first word is placed before the first poll
+    assert len(stopped.word_placements) == 1 and stopped.unplaced_words == WORDS[1:]
+    assert len(unstopped.word_placements) > 1
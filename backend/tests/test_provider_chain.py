@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from src.provider_chain import CircuitBreaker, ProviderChain, CLOSED, OPEN, HALF_OPEN
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+def make_call(behaviour):
+    """behaviour: provider -> (delay seconds, result or exception)"""
+    async def call(provider):
+        delay, outcome = behaviour[provider]
+        await asyncio.sleep(delay)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+    return call
+
+
+def test_slow_primary_is_hedged_and_loses_the_race():
+    chain = ProviderChain(["openai", "anthropic"], hedge_delay=0.01)
+    result = asyncio.run(chain.call(make_call({"openai": (1.0, "slow"), "anthropic": (0.01, "fast")})))
+    
+    stats = {item.provider: item for item in chain.stats()}
+    assert result == "fast" and chain.hedges == 1
+    assert stats["anthropic"].wins == 1 and stats["openai"].cancelled == 1
+    assert stats["openai"].failures == 0 and stats["openai"].state == CLOSED
+
+
+def test_failure_moves_on_without_waiting_for_the_hedge_delay():
+    chain = ProviderChain(["openai", "anthropic"], hedge_delay=30)
+    behaviour = {"openai": (0, ValueError("bad csv")), "anthropic": (0, "ok")}
+    assert asyncio.run(asyncio.wait_for(chain.call(make_call(behaviour)), timeout=1)) == "ok"
+    assert chain.hedges == 0
+    
+    behaviour["anthropic"] = (0, RuntimeError("down"))
+    with pytest.raises(RuntimeError, match="down"):
+        asyncio.run(chain.call(make_call(behaviour)))
+
+
+def test_breaker_skips_failing_provider_until_cooldown():
+    clock = FakeClock()
+    chain = ProviderChain(["openai", "anthropic"], hedge_delay=30, failure_threshold=2,
+                          cooldown_seconds=10, clock=clock)
+    behaviour = {"openai": (0, ValueError("bad")), "anthropic": (0, "ok")}
+    for _ in range(2):
+        asyncio.run(chain.call(make_call(behaviour)))
+    assert chain.stats()[0].state == OPEN
+    
+    asyncio.run(chain.call(make_call(behaviour)))
+    assert chain.stats()[0].skipped == 1 and chain.stats()[0].calls == 2
+    
+    clock.now = 11
+    assert chain.stats()[0].state == HALF_OPEN
+    behaviour["openai"] = (0, "recovered")
+    assert asyncio.run(chain.call(make_call(behaviour))) == "recovered"
+    assert chain.stats()[0].state == CLOSED
+
+
+def test_half_open_breaker_allows_a_single_trial():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, cooldown_seconds=5, clock=clock)
+    breaker.record_failure()
+    assert not breaker.allow()
+    clock.now = 5
+    assert breaker.allow() and not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+
+def test_every_finished_call_is_recorded_when_one_wins():
+    async def run():
+        gate = asyncio.Event()
+        asyncio.get_running_loop().call_later(0.05, gate.set)
+        
+        async def call(provider):
+            await gate.wait()
+            if provider == "openai":
+                raise ValueError("bad")
+            return "ok"
+        return await chain.call(call)
+    
+    chain = ProviderChain(["openai", "anthropic"], hedge_delay=0.01)
+    assert asyncio.run(run()) == "ok"
+    stats = {item.provider: item for item in chain.stats()}
+    assert stats["openai"].failures == 1 and stats["openai"].cancelled == 0
+    assert stats["anthropic"].successes == 1 and stats["anthropic"].wins == 1
+
+
+def test_abandoned_call_leaves_another_calls_trial_alone():
+    clock = FakeClock()
+    chain = ProviderChain(["openai", "anthropic"], hedge_delay=0.01, failure_threshold=1,
+                          cooldown_seconds=5, clock=clock)
+    breaker = chain.records["openai"].breaker
+    
+    async def call(provider):
+        if provider == "anthropic":
+            return "ok"
+        # While this closed-state call runs the breaker opens and another call takes the trial
+        breaker.record_failure(trial=False)
+        clock.now = 5
+        assert breaker.acquire() == HALF_OPEN
+        await asyncio.sleep(1)
+    
+    assert asyncio.run(chain.call(call)) == "ok"
+    assert chain.stats()[0].cancelled == 1
+    assert breaker.trial_running and not breaker.allow()
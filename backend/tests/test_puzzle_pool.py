@@ -0,0 +1,117 @@
+import asyncio
+import multiprocessing
+
+from src.generation import GenerationResult
+from src.puzzle_pool import PuzzlePool, WarmPuzzle
+from src.topic_cache import TopicResult
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def take_in_worker(store_path, lock_path):
+    """Run in a separate worker process that does not warm"""
+    pool = PuzzlePool(["space"], lock_path=lock_path, store_path=store_path)
+    assert pool.claim_warmer() is False
+    taken = [asyncio.run(pool.atake("space")) for _ in range(3)]
+    pool.close()
+    return [puzzle.topic_result.provider if puzzle else None for puzzle in taken]
+
+
+def make_builder(delay=0.01):
+    state = {"running": 0, "peak": 0, "built": []}
+
+    async def build(topic):
+        state["running"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        await asyncio.sleep(delay)
+        state["running"] -= 1
+        state["built"].append(topic)
+        return WarmPuzzle(TopicResult([], "mock", "mock"), GenerationResult([], None), {})
+
+    return build, state
+
+
+def test_fill_builds_depth_per_topic_within_concurrency():
+    pool = PuzzlePool(["Space", "space ", "Pixar"], depth=3, concurrency=2)
+    build, state = make_builder()
+
+    assert pool.topics == ["space", "pixar"]
+    assert asyncio.run(pool.fill(build)) == 6
+    assert state["peak"] == 2
+    assert pool.stats().ready == {"space": 3, "pixar": 3}
+    # Already full: nothing to do
+    assert asyncio.run(pool.fill(build)) == 0
+
+
+def test_take_serves_hot_topics_and_counts_misses():
+    pool = PuzzlePool(["space"], depth=1)
+    build, _ = make_builder(0)
+
+    assert pool.take("space") is None
+    asyncio.run(pool.fill(build))
+    assert pool.take("  SPACE") is not None
+    assert pool.take("space") is None
+    assert pool.take("cooking") is None  # Not a hot topic: not counted
+
+    stats = pool.stats()
+    assert (stats.hits, stats.misses, stats.builds) == (1, 2, 1)
+
+
+def test_old_puzzles_are_dropped_and_failures_counted():
+    clock = FakeClock()
+    pool = PuzzlePool(["space"], depth=1, max_age_seconds=60, clock=clock)
+    build, _ = make_builder(0)
+    asyncio.run(pool.fill(build))
+
+    clock.now += 61
+    assert pool.take("space") is None
+    assert pool.stats().expired == 1
+
+    async def broken(topic):
+        raise RuntimeError("provider down")
+
+    assert asyncio.run(pool.fill(broken)) == 0
+    assert pool.stats().failures == 1
+    assert pool.stats().ready == {"space": 0}
+
+
+def test_only_one_process_claims_the_warmer(tmp_path):
+    lock_path = str(tmp_path / "warmer.lock")
+    first = PuzzlePool(["space"], lock_path=lock_path)
+    second = PuzzlePool(["space"], lock_path=lock_path)
+
+    assert first.claim_warmer() is True
+    assert second.claim_warmer() is False
+    assert second.stats().warmer is False
+    first.release_warmer()
+    assert second.claim_warmer() is True
+    second.release_warmer()
+    # Without a lock path (one process) the pool always warms itself
+    assert PuzzlePool(["space"]).claim_warmer() is True
+
+
+def test_workers_take_what_the_single_warmer_built(tmp_path):
+    store_path, lock_path = str(tmp_path / "puzzles.sqlite3"), str(tmp_path / "warmer.lock")
+    warmer = PuzzlePool(["space"], depth=2, lock_path=lock_path, store_path=store_path)
+    assert warmer.claim_warmer() is True
+
+    async def build(topic):
+        return WarmPuzzle(TopicResult([{"word": "ORBIT", "clue": "Path"}], "warmed", "mock"),
+                          GenerationResult(["ORBIT"], None), {"ORBIT": "Path"})
+
+    assert asyncio.run(warmer.fill(build)) == 2
+    with multiprocessing.get_context("spawn").Pool(1) as worker:
+        taken = worker.apply(take_in_worker, (store_path, lock_path))
+
+    # Each puzzle is served once, across processes; the warmer sees the store drained
+    assert taken == ["warmed", "warmed", None]
+    assert warmer.stats().ready == {"space": 0} and warmer.stats().shared
+    assert asyncio.run(warmer.fill(build)) == 2
+    warmer.release_warmer()
+    warmer.close()
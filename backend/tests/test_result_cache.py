@@ -0,0 +1,81 @@
+from src.generation import GenerationOptions
+from src.result_cache import ResultCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self):
+        return self.now
+
+
+def test_key_ignores_word_order_but_not_options():
+    options = GenerationOptions()
+    key = ResultCache.make_key(["CAT", "DOG", "CAT"], options)
+    assert key == ResultCache.make_key(["DOG", "CAT", "CAT"], options)
+    assert key != ResultCache.make_key(["DOG", "CAT"], options)
+    assert key != ResultCache.make_key(["CAT", "DOG", "CAT"], GenerationOptions(seed=1))
+
+
+def test_lru_eviction_respects_memory_cap():
+    cache = ResultCache(max_bytes=25)
+    cache.put("a", b"x" * 9)
+    cache.put("b", b"x" * 9)
+    assert cache.get("a") is not None  # "b" is now least recently used
+    cache.put("c", b"x" * 9)
+    
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    cache.put("huge", b"x" * 100)
+    assert cache.get("huge") is None
+    
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions) == (3, 2, 1)
+    assert stats.entries == 2 and stats.bytes == 20
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = ResultCache(ttl_seconds=60, clock=clock)
+    cache.put("a", b"value")
+    clock.now += 59
+    assert cache.get("a") == b"value"
+    clock.now += 2
+    assert cache.get("a") is None
+    assert cache.stats().expirations == 1
+
+
+def test_disk_store_survives_restart(tmp_path):
+    clock = FakeClock()
+    path = str(tmp_path / "results.sqlite")
+    cache = ResultCache(ttl_seconds=60, path=path, clock=clock)
+    cache.put("a", b"value")
+    cache.close()
+    
+    reopened = ResultCache(ttl_seconds=60, path=path, clock=clock)
+    assert reopened.get("a") == b"value"
+    assert reopened.stats().disk_hits == 1
+    clock.now += 61
+    assert ResultCache(path=path, clock=clock).get("a") is None
+
+
+def test_locked_disk_store_never_fails_the_caller(tmp_path, monkeypatch):
+    import sqlite3
+    from src import result_cache
+    
+    monkeypatch.setattr(result_cache, "DISK_TIMEOUT_SECONDS", 0.05)
+    path = str(tmp_path / "cache.sqlite3")
+    cache = ResultCache(path=path)
+    # Another worker holds the write lock for longer than the timeout
+    writer = sqlite3.connect(path, isolation_level=None)
+    writer.execute("BEGIN IMMEDIATE")
+    cache.put("a", b"value")
+    writer.execute("ROLLBACK")
+    writer.close()
+    
+    assert cache.get("a") == b"value"
+    assert cache.stats().disk_errors == 1
+    cache.put("b", b"value")
+    assert cache.stats().disk_errors == 1
+    cache.close()
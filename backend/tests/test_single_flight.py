@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+
+from src.single_flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    flights = SingleFlight()
+    runs = []
+    
+    async def work():
+        runs.append(1)
+        await asyncio.sleep(0.01)
+        return ["HOOP"]
+    
+    async def main():
+        results = await asyncio.gather(*(flights.do("basketball", work) for _ in range(5)))
+        later = await flights.do("basketball", work)
+        return results, later
+    
+    results, later = asyncio.run(main())
+    assert len(runs) == 2
+    assert [coalesced for _, coalesced in results] == [False, True, True, True, True]
+    assert all(result is results[0][0] for result, _ in results)
+    assert later[1] is False
+    stats = flights.stats()
+    assert (stats.calls, stats.leaders, stats.coalesced, stats.in_flight) == (6, 2, 4, 0)
+
+
+def test_failures_reach_every_waiter_and_leader_cancel_does_not_abort():
+    flights = SingleFlight()
+    
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise ValueError("provider down")
+    
+    async def slow():
+        await asyncio.sleep(0.02)
+        return "done"
+    
+    async def main():
+        results = await asyncio.gather(flights.do("a", failing), flights.do("a", failing), return_exceptions=True)
+        assert all(isinstance(result, ValueError) for result in results)
+        
+        leader = asyncio.ensure_future(flights.do("b", slow))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flights.do("b", slow))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return await follower
+    
+    assert asyncio.run(main()) == ("done", True)
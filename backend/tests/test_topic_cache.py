@@ -0,0 +1,65 @@
+from src.topic_cache import TopicCache, TopicResult, normalize_topic
+
+WORD_CLUES = [{"word": "HOOP", "clue": "Target for scoring"}]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self):
+        return self.now
+
+
+def test_normalized_topics_share_an_entry():
+    assert normalize_topic("  The   Office ") == "the office"
+    cache = TopicCache()
+    assert cache.get("basketball") is None
+    cache.put("Basketball", TopicResult(WORD_CLUES, "openai", "gpt-3.5-turbo"))
+    
+    hit = cache.get(" BASKETBALL ")
+    assert hit.cached and hit.word_clues == WORD_CLUES
+    assert (hit.provider, hit.model) == ("openai", "gpt-3.5-turbo")
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.by_provider) == (1, 1, {"openai": 1})
+
+
+def test_entries_expire_and_lru_is_bounded():
+    clock = FakeClock()
+    cache = TopicCache(ttl_seconds=60, max_entries=2, clock=clock)
+    for topic in ("a", "b", "c"):
+        cache.put(topic, TopicResult(WORD_CLUES, "mock", "mock"))
+    assert cache.get("a") is None and cache.get("c") is not None
+    clock.now += 61
+    assert cache.get("c") is None
+
+
+def test_disk_store_survives_restart(tmp_path):
+    path = str(tmp_path / "topics.sqlite")
+    cache = TopicCache(path=path)
+    cache.put("pixar", TopicResult(WORD_CLUES, "anthropic", "claude-3-haiku-20240307"))
+    cache.close()
+    
+    reopened = TopicCache(path=path)
+    hit = reopened.get("Pixar")
+    assert hit.provider == "anthropic" and hit.word_clues == WORD_CLUES
+    assert reopened.stats().disk_hits == 1
+
+
+def test_locked_disk_store_is_used_off_the_loop_and_never_fails(tmp_path, monkeypatch):
+    import asyncio
+    import sqlite3
+    from src import topic_cache
+    
+    monkeypatch.setattr(topic_cache, "DISK_TIMEOUT_SECONDS", 0.05)
+    path = str(tmp_path / "topics.sqlite3")
+    cache = TopicCache(path=path)
+    writer = sqlite3.connect(path, isolation_level=None)
+    writer.execute("BEGIN IMMEDIATE")
+    asyncio.run(cache.aput("space", TopicResult(WORD_CLUES, "openai", "gpt-3.5-turbo")))
+    writer.execute("ROLLBACK")
+    writer.close()
+    
+    assert asyncio.run(cache.aget("Space")).word_clues == WORD_CLUES
+    assert cache.stats().disk_errors == 1
+    cache.close()
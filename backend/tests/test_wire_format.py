@@ -0,0 +1,58 @@
+from src.wire_format import (
+    BLANK, COMPACT_MEDIA_TYPE, accepts_gzip, compact_crossword, encode_compact, negotiate
+)
+
+RESPONSE = {
+    "grid": [["C", "A", "T"], [None, None, "O"], [None, None, "P"]],
+    "width": 3,
+    "height": 3,
+    "word_placements": [
+        {"word": "CAT", "start_row": 0, "start_col": 0, "direction": "horizontal", "number": 1, "clue": ""},
+        {"word": "TOP", "start_row": 0, "start_col": 2, "direction": "vertical", "number": 2, "clue": ""},
+    ],
+    "success": True,
+    "message": "ok",
+}
+
+
+def test_negotiation():
+    assert not negotiate(None, "gzip", None).compact
+    assert negotiate(f"{COMPACT_MEDIA_TYPE}, application/json", None, None).compact
+    assert not negotiate(COMPACT_MEDIA_TYPE, "gzip", "json").compact  # The query parameter wins
+    assert negotiate(None, "gzip, br", "compact").gzip
+    assert accepts_gzip("deflate, gzip;q=0.5") and accepts_gzip("*")
+    assert not accepts_gzip("gzip;q=0") and not accepts_gzip("br") and not accepts_gzip(None)
+
+
+def test_compact_crossword_is_columnar_with_row_strings():
+    compact = compact_crossword(RESPONSE)
+    
+    assert compact["grid"] == ["CAT", f"{BLANK}{BLANK}O", f"{BLANK}{BLANK}P"]
+    assert compact["word_placements"] == {
+        "word": ["CAT", "TOP"], "start_row": [0, 0], "start_col": [0, 2],
+        "direction": ["h", "v"], "number": [1, 2]
+    }
+    assert compact["format"] == "compact" and compact["message"] == "ok"
+    assert RESPONSE["grid"][1][0] is None  # The input is left alone
+
+
+def test_large_bodies_are_gzipped_only_when_accepted():
+    body, headers = encode_compact({"grid": ["A" * 2000]}, gzip_ok=True, gzip_min_bytes=1024)
+    assert headers["Content-Encoding"] == "gzip" and len(body) < 200
+    
+    body, headers = encode_compact({"grid": ["A" * 2000]}, gzip_ok=False, gzip_min_bytes=1024)
+    assert "Content-Encoding" not in headers and len(body) > 2000
+    
+    _, headers = encode_compact({"grid": ["AB"]}, gzip_ok=True, gzip_min_bytes=1024)
+    assert "Content-Encoding" not in headers
+
+
+def test_orjson_and_stdlib_encoders_agree(monkeypatch):
+    import pytest
+    from src import wire_format
+    
+    pytest.importorskip("orjson")
+    payload = compact_crossword({**RESPONSE, "message": "Crème brûlée"})
+    fast = wire_format.dumps(payload)
+    monkeypatch.setattr(wire_format, "orjson", None)
+    assert wire_format.dumps(payload) == fast
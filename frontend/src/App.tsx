@@ -128,6 +128,24 @@ const App: React.FC = () => {
     }
   };
 
+  const handleGenerateCrosswordFromTopic = async (topic: string) => {
+    setIsLoading(true);
+    setError('');
+
+    try {
+      const result = await CrosswordAPI.generateCrosswordFromTopic(topic);
+      console.log('Crossword generated from topic:', result.crossword.word_placements.length, 'words');
+      setCrossword(result.crossword);
+      setCurrentCrosswordId(result.crosswordId || null);
+      setClues(result.clues);
+    } catch (err) {
+      setError(err instanceof Error ? err.message : 'Failed to generate crossword from topic');
+      console.error('Topic crossword generation error:', err);
+    } finally {
+      setIsLoading(false);
+    }
+  };
+
   const handleLoadClues = async () => {
     if (!currentCrosswordId) {
       setError('No clues available. Please generate a crossword from a topic first.');
@@ -250,6 +268,7 @@ const App: React.FC = () => {
         <section style={{ marginBottom: theme.spacing['2xl'] }}>
           <WordInput 
             onGenerateCrossword={handleGenerateCrossword} 
+            onGenerateCrosswordFromTopic={handleGenerateCrosswordFromTopic}
             isLoading={isLoading}
             setIsLoading={setIsLoading}
             setError={setError}
@@ -1,7 +1,6 @@
 import React, { useState } from 'react';
 import TabContainer from './TabContainer';
 import TopicInput from './TopicInput';
-import { CrosswordAPI } from '../services/api';
 
 interface Theme {
   colors: any;
@@ -13,13 +12,14 @@ interface Theme {
 
 interface WordInputProps {
   onGenerateCrossword: (words: string[], crosswordId?: string) => void;
+  onGenerateCrosswordFromTopic: (topic: string) => Promise<void>;
   isLoading: boolean;
   setIsLoading: (loading: boolean) => void;
   setError: (error: string) => void;
   theme: Theme;
 }
 
-const WordInput: React.FC<WordInputProps> = ({ onGenerateCrossword, isLoading, setIsLoading, setError, theme }) => {
+const WordInput: React.FC<WordInputProps> = ({ onGenerateCrossword, onGenerateCrosswordFromTopic, isLoading, setIsLoading, setError, theme }) => {
   const [wordInput, setWordInput] = useState('');
   const [localError, setLocalError] = useState('');
 
@@ -62,17 +62,7 @@ const WordInput: React.FC<WordInputProps> = ({ onGenerateCrossword, isLoading, s
   };
 
   const handleTopicGeneration = async (topic: string) => {
-    setIsLoading(true);
-    setError('');
-    
-    try {
-      const result = await CrosswordAPI.generateWordsFromTopic(topic);
-      onGenerateCrossword(result.words, result.crosswordId);
-    } catch (err) {
-      setError(err instanceof Error ? err.message : 'Failed to generate words from topic');
-    } finally {
-      setIsLoading(false);
-    }
+    await onGenerateCrosswordFromTopic(topic);
   };
 
   const exampleWords = [
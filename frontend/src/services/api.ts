@@ -6,6 +6,7 @@ export interface WordPlacementAPI {
   start_col: number;
   direction: string;
   number: number;
+  clue?: string;
 }
 
 export interface CrosswordResponseAPI {
@@ -33,6 +34,11 @@ export interface TopicWordsResponse {
   crossword_id?: string;
 }
 
+export interface TopicCrosswordResponseAPI extends CrosswordResponseAPI {
+  topic: string;
+  crossword_id?: string;
+}
+
 export interface CluesResponse {
   clues: { [word: string]: string };
   crossword_id: string;
@@ -61,6 +67,20 @@ const getApiBaseUrl = (): string => {
 
 const API_BASE_URL = getApiBaseUrl();
 
+// Convert API response to frontend format
+const toCrosswordGrid = (data: CrosswordResponseAPI): CrosswordGrid => ({
+  grid: data.grid,
+  width: data.width,
+  height: data.height,
+  word_placements: data.word_placements.map(placement => ({
+    word: placement.word,
+    start_row: placement.start_row,
+    start_col: placement.start_col,
+    direction: placement.direction === 'horizontal' ? Direction.HORIZONTAL : Direction.VERTICAL,
+    number: placement.number
+  }))
+});
+
 export class CrosswordAPI {
   static async generateCrossword(words: string[]): Promise<CrosswordGrid> {
     const response = await fetch(`${API_BASE_URL}/generate-crossword`, {
@@ -73,7 +93,7 @@ export class CrosswordAPI {
 
     if (!response.ok) {
       const errorData = await response.json().catch(() => ({}));
-      throw new Error(errorData.detail || `HTTP error! status: ${response.status}`);
+      throw new Error(errorData.detail || errorData.message || `HTTP error! status: ${response.status}`);
     }
 
     const data: CrosswordResponseAPI = await response.json();
@@ -82,21 +102,42 @@ export class CrosswordAPI {
       throw new Error(data.message);
     }
 
-    // Convert API response to frontend format
-    const crosswordGrid: CrosswordGrid = {
-      grid: data.grid,
-      width: data.width,
-      height: data.height,
-      word_placements: data.word_placements.map(placement => ({
-        word: placement.word,
-        start_row: placement.start_row,
-        start_col: placement.start_col,
-        direction: placement.direction === 'horizontal' ? Direction.HORIZONTAL : Direction.VERTICAL,
-        number: placement.number
-      }))
-    };
+    return toCrosswordGrid(data);
+  }
+
+  // Topic to finished puzzle in one request; clues come back on the placements
+  static async generateCrosswordFromTopic(topic: string): Promise<{crossword: CrosswordGrid, clues: { [word: string]: string }, crosswordId?: string}> {
+    const response = await fetch(`${API_BASE_URL}/generate-crossword-from-topic`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify({ topic }),
+    });
 
-    return crosswordGrid;
+    if (!response.ok) {
+      const errorData = await response.json().catch(() => ({}));
+      throw new Error(errorData.detail || errorData.message || `HTTP error! status: ${response.status}`);
+    }
+
+    const data: TopicCrosswordResponseAPI = await response.json();
+
+    if (!data.success) {
+      throw new Error(data.message);
+    }
+
+    const clues: { [word: string]: string } = {};
+    data.word_placements.forEach(placement => {
+      if (placement.clue) {
+        clues[placement.word] = placement.clue;
+      }
+    });
+
+    return {
+      crossword: toCrosswordGrid(data),
+      clues,
+      crosswordId: data.crossword_id
+    };
   }
 
   static async generateWordsFromTopic(topic: string): Promise<{words: string[], crosswordId?: string}> {
@@ -110,7 +151,7 @@ export class CrosswordAPI {
 
     if (!response.ok) {
       const errorData = await response.json().catch(() => ({}));
-      throw new Error(errorData.detail || `HTTP error! status: ${response.status}`);
+      throw new Error(errorData.detail || errorData.message || `HTTP error! status: ${response.status}`);
     }
 
     const data: TopicWordsResponse = await response.json();
@@ -135,7 +176,7 @@ export class CrosswordAPI {
 
     if (!response.ok) {
       const errorData = await response.json().catch(() => ({}));
-      throw new Error(errorData.detail || `HTTP error! status: ${response.status}`);
+      throw new Error(errorData.detail || errorData.message || `HTTP error! status: ${response.status}`);
     }
 
     const data: CluesResponse = await response.json();